@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import file, process, convert, preview, vad, cache, profiling
+
+# input 폴더에서 처리할 확장자
+VIDEO_EXTS = (".mp4", ".mov", ".mkv", ".avi", ".webm")
+
+# 파일 하나 처리가 끝났다는 표시 (다시 돌릴 때 건너뛰는 기준)
+DONE_MARKER = ".done"
+
+
+def find_inputs(base_dir, manifest=None, exts=VIDEO_EXTS):
+    """
+    처리할 파일명 목록 (base_dir/input 기준 상대 경로)
+    - manifest 가 있으면 한 줄에 파일명 하나 (빈 줄, # 주석 무시)
+    - 없으면 input 폴더에서 exts 확장자 파일을 이름순으로
+    """
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    input_dir = os.path.join(base_dir, "input")
+    return sorted(
+        name for name in os.listdir(input_dir)
+        if name.lower().endswith(exts) and os.path.isfile(os.path.join(input_dir, name))
+    )
+
+
+def output_dir_for(base_dir, filename):
+    # 파일마다 output/<input 기준 상대 경로>/ 아래에 결과를 모음 (파일끼리 결과가 섞이지 않도록)
+    # 확장자까지 넣어야 x.mp4 / x.mov 처럼 이름만 같은 파일이 서로 덮어쓰거나 건너뛰지 않음
+    return os.path.join(base_dir, "output", os.path.normpath(filename))
+
+
+def is_done(base_dir, filename):
+    return os.path.exists(os.path.join(output_dir_for(base_dir, filename), DONE_MARKER))
+
+
+def process_file(base_dir, filename, stream=False, plot=False, keep_wav=False, archive=False, write_workers=None,
+                 vad_engine=None, cache_dir=None, cache_bytes=cache.DEFAULT_MAX_BYTES, profiler=None):
+    """
+    파일 하나에 대해 (convert ->) load -> wav_del_space -> save 를 실행
+    - vad_engine : vad.ENGINES 의 이름 ("adaptive" 등), 없으면 기존 top_db 규칙 (스트리밍 모드는 기존 규칙만)
+    - cache_dir : 주면 추출한 PCM / 구간 / 포락선을 단계 캐시에 저장하고 재사용 (스트리밍 모드 제외)
+    - profiler : profiling.Profiler 를 주면 단계별 시간/메모리를 기록
+    실패하면 예외를 그대로 던짐 (run_one 에서 잡아서 기록)
+    반환: 구간 수
+    """
+    prof = profiler or profiling.Profiler(filename)
+    output_dir = output_dir_for(base_dir, filename)
+    split_dir = os.path.join(output_dir, "split_files")
+    merged_path = os.path.join(output_dir, "merged_no_silence.wav")
+    image_path = os.path.join(output_dir, "waveform.png")
+    video_path = os.path.join(base_dir, "input", filename)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 스트리밍 모드는 WAV 파일을 두 번 훑으므로 먼저 변환 (convert 는 실패 시 None 을 돌려줌)
+    # 중간 WAV 는 이 파일의 출력 폴더 안에 두고, keep_wav 가 아니면 끝나고 지움
+    if stream:
+        wav_path = os.path.join(output_dir, "audio.wav")
+        try:
+            with prof.stage("convert", bytes_in=profiling.path_size(video_path)) as rec:
+                audio_path = convert.convert(base_dir, filename, output_path=wav_path)
+                rec["bytes_out"] = profiling.path_size(audio_path)
+            if not audio_path:
+                raise RuntimeError("변환 실패")
+
+            audio_bytes = profiling.path_size(audio_path)
+            with prof.stage("stats", bytes_in=audio_bytes):
+                stats = process.stream_stats(audio_path)
+            if stats["peak"] == 0:
+                return 0
+            with prof.stage("split", bytes_in=audio_bytes) as rec:
+                intervals = list(process.wav_del_space_stream(audio_path, stats=stats))
+                rec["bytes_out"] = len(intervals) * 16
+            with prof.stage("save", bytes_in=audio_bytes) as rec:
+                count = file.save_stream(audio_path, intervals, split_dir, merged_path, scale=1.0 / stats["peak"])
+                rec["bytes_out"] = profiling.path_size(split_dir) + profiling.path_size(merged_path)
+            if plot:
+                with prof.stage("plot", bytes_in=audio_bytes) as rec:
+                    preview.save_preview(image_path, audio_path=audio_path, intervals=intervals)
+                    rec["bytes_out"] = profiling.path_size(image_path)
+            return count
+        finally:
+            if not keep_wav and os.path.exists(wav_path):
+                os.remove(wav_path)
+
+    # 그 외에는 ffmpeg 파이프로 오디오만 바로 읽음 (중간 WAV 없음)
+    wav_path = os.path.join(output_dir, "audio.wav") if keep_wav else None
+    engine = vad.get_vad(vad_engine) if vad_engine else None
+    stage_cache = cache.StageCache(cache_dir, cache_bytes) if cache_dir else None
+
+    with prof.stage("load", bytes_in=profiling.path_size(video_path)) as rec:
+        if stage_cache:
+            pcm_key, y, sr = cache.cached_pcm(stage_cache, video_path, wav_path=wav_path)
+        else:
+            y, sr = convert.extract_pcm(video_path, wav_path=wav_path)
+        rec["bytes_out"] = y.nbytes
+
+    with prof.stage("split", bytes_in=y.nbytes) as rec:
+        if stage_cache:
+            _, segments = cache.cached_segments(stage_cache, pcm_key, y, sr, engine)
+        else:
+            segments = process.wav_del_space(y, sr, vad=engine)
+        rec["bytes_out"] = segments.intervals.nbytes
+
+    if plot:
+        with prof.stage("plot", bytes_in=y.nbytes) as rec:
+            if stage_cache:
+                mins, maxs = cache.cached_envelope(stage_cache, pcm_key, y)
+                preview.render_preview(mins, maxs, sr, y.shape[-1], segments.intervals).savefig(image_path)
+            else:
+                preview.save_preview(image_path, y=y, sr=sr, intervals=segments.intervals)
+            rec["bytes_out"] = profiling.path_size(image_path)
+    if segments:
+        with prof.stage("save", bytes_in=segments.total_samples() * segments.y.itemsize) as rec:
+            file.save(split_dir, segments, sr, workers=write_workers, archive=archive)
+            file.save_merged_intervals(merged_path, segments.y, segments.intervals, sr)
+            rec["bytes_out"] = profiling.path_size(split_dir) + profiling.path_size(merged_path)
+    return len(segments)
+
+
+def run_one(base_dir, filename, options=None):
+    """
+    process_file(**options) 을 실행하고 결과를 dict 로 돌려줌 (예외는 여기서 전부 잡음)
+    성공하면 .done 표시 파일을 남김
+    """
+    t0 = time.perf_counter()
+    record = {"file": filename}
+    prof = profiling.Profiler(filename)
+
+    try:
+        count = process_file(base_dir, filename, profiler=prof, **(options or {}))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}",
+                      traceback=traceback.format_exc(), seconds=time.perf_counter() - t0,
+                      profile=prof.to_dict())
+        return record
+
+    record.update(status="ok", segments=count, seconds=time.perf_counter() - t0, profile=prof.to_dict())
+
+    # 다 쓴 뒤에 표시 파일을 원자적으로 만듦 (중간에 죽으면 표시가 없으니 다음에 다시 처리)
+    marker = os.path.join(output_dir_for(base_dir, filename), DONE_MARKER)
+    tmp = marker + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp, marker)
+
+    return record
+
+
+def run_batch(base_dir, filenames, workers=None, force=False, **options):
+    """
+    여러 파일을 프로세스 풀로 나눠서 처리
+    (options 는 process_file 인자 그대로: stream, plot, keep_wav, archive, write_workers, vad_engine,
+     cache_dir, cache_bytes)
+    - 이미 .done 이 있는 파일은 건너뜀 (force=True 면 다시 처리)
+    - 파일 하나가 실패해도 나머지는 계속 진행
+    - 워커 프로세스가 통째로 죽으면(디코더 충돌 등) 풀을 새로 만들고, 결과를 못 받은 파일은 하나씩 따로 다시 돌림
+      (혼자 돌다 또 죽은 파일만 실패로 기록, 죽기 전에 .done 까지 쓴 파일은 그 기록을 그대로 씀)
+    - workers 가 1 이하면 현재 프로세스에서 차례로 처리
+    반환: 파일별 결과 dict 목록 (입력 순서)
+    """
+    results = {}
+    todo = []
+    for name in filenames:
+        if not force and is_done(base_dir, name):
+            results[name] = {"file": name, "status": "skipped"}
+        else:
+            todo.append(name)
+
+    print(f"전체 {len(filenames)}개 / 처리 {len(todo)}개 / 건너뜀 {len(filenames) - len(todo)}개")
+
+    def report(record):
+        results[record["file"]] = record
+        done = sum(1 for r in results.values() if r["status"] != "skipped")
+        mark = "OK" if record["status"] == "ok" else "실패"
+        print(f"[{done}/{len(todo)}] {mark} {record['file']}")
+
+    if workers is not None and workers <= 1:
+        for name in todo:
+            report(run_one(base_dir, name, options))
+        return [results[name] for name in filenames]
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    queue = list(reversed(todo))
+    # 워커가 죽을 때 같이 돌던 파일 (어느 쪽이 원인인지 모르므로 하나씩 따로 돌림)
+    suspects = deque()
+    since = time.time()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}
+
+    try:
+        while queue or pending or suspects:
+            if suspects:
+                if not pending:
+                    name = suspects.popleft()
+                    pending[executor.submit(run_one, base_dir, name, options)] = name
+            else:
+                # 진행 중인 작업 수를 제한 (수천 개를 한 번에 넣지 않음)
+                while queue and len(pending) < max_pending:
+                    name = queue.pop()
+                    pending[executor.submit(run_one, base_dir, name, options)] = name
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            if not any(isinstance(fut.exception(), BrokenProcessPool) for fut in finished):
+                for fut in finished:
+                    _collect(fut, pending.pop(fut), report)
+                continue
+
+            # 풀이 깨지면 남은 작업도 곧 전부 끝나므로 다 기다려서 결과가 있는 것은 살림
+            wait(pending)
+            lost = []
+            for fut, name in pending.items():
+                if not isinstance(fut.exception(), BrokenProcessPool):
+                    _collect(fut, name, report)
+                else:
+                    record = _done_record(base_dir, name, since)
+                    if record is not None:
+                        report(record)
+                    else:
+                        lost.append(name)
+            pending.clear()
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = ProcessPoolExecutor(max_workers=workers)
+
+            if len(lost) == 1:
+                report({"file": lost[0], "status": "error", "error": "워커 프로세스 종료"})
+            else:
+                suspects.extend(lost)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return [results[name] for name in filenames]
+
+
+def _collect(fut, name, report):
+    try:
+        report(fut.result())
+    except Exception as e:
+        report({"file": name, "status": "error", "error": f"{type(e).__name__}: {e}"})
+
+
+def _done_record(base_dir, name, since):
+    # 워커가 죽기 전에 끝까지 처리해서 since 이후에 남긴 .done 기록 (없거나 예전 것이거나 깨졌으면 None)
+    marker = os.path.join(output_dir_for(base_dir, name), DONE_MARKER)
+    try:
+        if os.path.getmtime(marker) < since:
+            return None
+        with open(marker, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def summarize(records, elapsed=None) -> dict:
+    ok = [r for r in records if r["status"] == "ok"]
+    summary = {
+        "total": len(records),
+        "ok": len(ok),
+        "skipped": sum(1 for r in records if r["status"] == "skipped"),
+        "error": sum(1 for r in records if r["status"] == "error"),
+        "segments": sum(r.get("segments", 0) for r in ok),
+        "errors": [{"file": r["file"], "error": r["error"]} for r in records if r["status"] == "error"],
+        # 단계별 합계 (어느 단계를 늘려야 하는지 보는 용도, 건너뛴 파일은 제외)
+        "stages": profiling.aggregate(r.get("profile") for r in records),
+        "files": records,
+    }
+    if elapsed is not None:
+        summary["elapsed_sec"] = elapsed
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="input 폴더의 비디오를 한 번에 무음 제거/분할")
+    parser.add_argument("base_dir", nargs="?", default="audio/data", help="input/output 폴더가 있는 경로")
+    parser.add_argument("--manifest", default=None, help="처리할 파일명 목록 (한 줄에 하나)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수, 1 이면 순차 처리)")
+    parser.add_argument("--stream", action="store_true", help="블록 단위 스트리밍 모드로 처리")
+    parser.add_argument("--plot", action="store_true", help="파일마다 파형 그림도 저장")
+    parser.add_argument("--force", action="store_true", help="이미 끝난 파일도 다시 처리")
+    parser.add_argument("--keep-wav", action="store_true", help="추출한 오디오를 WAV 로도 저장")
+    parser.add_argument("--archive", action="store_true",
+                        help="구간을 개별 WAV 대신 segments.pcm + segments.json 하나로 저장")
+    parser.add_argument("--write-workers", type=int, default=None, help="파일마다 구간 저장에 쓸 스레드 수")
+    parser.add_argument("--vad", choices=sorted(vad.ENGINES), default=None,
+                        help="음성 구간 검출 엔진 (기본: 기존 top_db 규칙)")
+    parser.add_argument("--cache", default=None, help="단계 캐시 폴더 (같은 영상/파라미터면 추출과 구간 계산을 건너뜀)")
+    parser.add_argument("--cache-gb", type=float, default=2.0, help="단계 캐시 최대 용량 (GB)")
+    parser.add_argument("--summary", default=None, help="요약 JSON 경로 (기본: output/batch_summary.json)")
+    args = parser.parse_args(argv)
+
+    filenames = find_inputs(args.base_dir, args.manifest)
+
+    t0 = time.perf_counter()
+    records = run_batch(args.base_dir, filenames, args.workers, args.force,
+                        stream=args.stream, plot=args.plot, keep_wav=args.keep_wav,
+                        archive=args.archive, write_workers=args.write_workers,
+                        vad_engine=args.vad, cache_dir=args.cache, cache_bytes=int(args.cache_gb * (1 << 30)))
+    summary = summarize(records, time.perf_counter() - t0)
+
+    summary_path = args.summary or os.path.join(args.base_dir, "output", "batch_summary.json")
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"완료 {summary['ok']}개 / 건너뜀 {summary['skipped']}개 / 실패 {summary['error']}개 "
+          f"/ 구간 {summary['segments']}개 ({summary['elapsed_sec']:.1f}초)")
+    for name, agg in sorted(summary["stages"].items(), key=lambda item: -item[1]["wall_sec"]):
+        print(f"  {name:<8} {agg['wall_sec']:8.1f}초 ({agg['share']:.0%}) cpu/wall {agg['cpu_ratio']:.2f}")
+    for err in summary["errors"]:
+        print(f"  실패: {err['file']} - {err['error']}")
+    print(f"요약 저장: {summary_path}")
+
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
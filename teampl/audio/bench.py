@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+import file, process, vad
+
+# 합성 소리 구간 종류
+# - tone : 사인파 하나
+# - harmonic : 기본음 + 배음 + 약한 잡음, 음높이가 천천히 흔들림 (말소리와 비슷한 스펙트럼)
+# - noise : 백색 잡음 덩어리 (AdaptiveVAD 는 잡음으로 보고 버리는 게 정상)
+KINDS = ("tone", "harmonic", "noise")
+
+# 측정할 엔진
+# - default : process.wav_del_space (top_db=20)
+# - adaptive : vad.AdaptiveVAD
+# - stream : process.wav_del_space_stream + file.save_stream (파일을 통째로 읽지 않음)
+ENGINES = ("default", "adaptive", "stream")
+
+
+def _burst(kind, n, sr, rng):
+    t = np.arange(n) / sr
+    amp = rng.uniform(0.2, 0.9)
+    if kind == "tone":
+        y = np.sin(2 * np.pi * rng.uniform(150, 1000) * t)
+    elif kind == "harmonic":
+        f0 = rng.uniform(90, 260) * (1 + 0.03 * np.sin(2 * np.pi * rng.uniform(2, 6) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / sr
+        y = sum(np.sin(k * phase) / k for k in range(1, 8)) + rng.normal(0, 0.05, n)
+        y /= np.abs(y).max()
+    elif kind == "noise":
+        y = rng.uniform(-1, 1, n)
+    else:
+        raise ValueError(f"[_burst] unknown kind {kind!r}, choose from {KINDS}")
+
+    # 앞뒤 5ms 페이드 (클릭 방지)
+    fade = min(n // 2, int(0.005 * sr))
+    if fade:
+        ramp = np.linspace(0, 1, fade)
+        y[:fade] *= ramp
+        y[-fade:] *= ramp[::-1]
+    return (amp * y).astype(np.float32)
+
+
+def make_fixture(path, seconds, sr=16000, seed=0, kinds=("tone", "harmonic"),
+                 burst_sec=(0.3, 3.0), gap_sec=(0.3, 5.0), floor_db=-60.0, block_sec=60.0):
+    """
+    소리 덩어리와 무음(아주 작은 잡음)을 번갈아 이어 붙인 합성 WAV (FLOAT)
+    - 몇 시간짜리도 만들 수 있게 block_sec 단위로 나눠서 파일에 바로 씀
+    - floor_db : 무음 구간 잡음 크기 (전체 스케일 기준 dB)
+    반환: 정답 소리 구간 (N, 2) int64 [start, end) 샘플 위치
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sr)
+    floor = 10 ** (floor_db / 20)
+    block = max(1, int(block_sec * sr))
+
+    # 1) 구간 배치만 먼저 정함 (정답)
+    truth = []
+    pos = int(rng.uniform(*gap_sec) * sr)
+    while True:
+        n = int(rng.uniform(*burst_sec) * sr)
+        if pos + n > total:
+            break
+        truth.append((pos, pos + n, kinds[rng.integers(len(kinds))]))
+        pos += n + int(rng.uniform(*gap_sec) * sr)
+
+    # 2) 블록 단위로 잡음 바닥 + 소리 덩어리를 채워서 씀
+    with sf.SoundFile(path, "w", samplerate=sr, channels=1, subtype="FLOAT") as f:
+        i = 0
+        pending = None  # 블록 경계에 걸쳐서 아직 다 못 쓴 구간의 샘플
+        for start in range(0, total, block):
+            end = min(start + block, total)
+            buf = rng.normal(0, floor, end - start).astype(np.float32)
+            while i < len(truth) and truth[i][0] < end:
+                s, e, kind = truth[i]
+                if pending is None:
+                    pending = _burst(kind, e - s, sr, rng)
+                lo, hi = max(s, start), min(e, end)
+                buf[lo - start:hi - start] += pending[lo - s:hi - s]
+                if e > end:
+                    break
+                pending = None
+                i += 1
+            f.write(buf)
+
+    if not truth:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.array([(s, e) for s, e, _ in truth], dtype=np.int64)
+
+
+def _overlap(a, b):
+    # 정렬된 두 구간 목록의 겹치는 샘플 수 (두 포인터)
+    i = j = 0
+    total = 0
+    while i < len(a) and j < len(b):
+        lo = max(a[i][0], b[j][0])
+        hi = min(a[i][1], b[j][1])
+        if hi > lo:
+            total += hi - lo
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def boundary_accuracy(pred, truth, sr, tolerance_sec=0.05):
+    """
+    찾은 구간(pred) 과 정답(truth) 비교
+    - precision / recall / f1 : 샘플 단위로 겹친 길이 기준
+    - onset / offset 오차 : 정답 경계마다 가장 가까운 찾은 경계까지 거리 (중앙값, p95, ms)
+    - boundary_hit : 시작/끝 경계가 둘 다 tolerance_sec 안에 들어온 정답 구간 비율
+    """
+    pred = np.asarray(pred, dtype=np.int64).reshape(-1, 2)
+    pred = vad.merge_intervals(pred[np.argsort(pred[:, 0], kind="stable")])
+    truth = np.asarray(truth, dtype=np.int64).reshape(-1, 2)
+    inter = _overlap(pred.tolist(), truth.tolist())
+    pred_len = int((pred[:, 1] - pred[:, 0]).sum()) if len(pred) else 0
+    truth_len = int((truth[:, 1] - truth[:, 0]).sum()) if len(truth) else 0
+
+    precision = inter / pred_len if pred_len else 0.0
+    recall = inter / truth_len if truth_len else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    result = {"precision": precision, "recall": recall, "f1": f1,
+              "segments": int(len(pred)), "truth_segments": int(len(truth))}
+    if not len(pred) or not len(truth):
+        result.update(onset_ms_p50=None, onset_ms_p95=None, offset_ms_p50=None,
+                      offset_ms_p95=None, boundary_hit=0.0)
+        return result
+
+    errors = {}
+    for name, col in (("onset", 0), ("offset", 1)):
+        edges = np.sort(pred[:, col])
+        idx = np.clip(np.searchsorted(edges, truth[:, col]), 1, len(edges) - 1) if len(edges) > 1 else None
+        if idx is None:
+            dist = np.abs(truth[:, col] - edges[0])
+        else:
+            dist = np.minimum(np.abs(truth[:, col] - edges[idx - 1]), np.abs(truth[:, col] - edges[idx]))
+        errors[name] = dist / sr
+        result[f"{name}_ms_p50"] = float(np.median(dist) / sr * 1000)
+        result[f"{name}_ms_p95"] = float(np.percentile(dist, 95) / sr * 1000)
+
+    hit = (errors["onset"] <= tolerance_sec) & (errors["offset"] <= tolerance_sec)
+    result["boundary_hit"] = float(hit.mean())
+    return result
+
+
+def _measure(func):
+    """
+    func() 한 번의 실제 시간 / CPU 시간 / 최대 메모리(tracemalloc, numpy 배열 포함)
+    반환: (func 반환값, 측정 dict)
+    """
+    tracemalloc.start()
+    t0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        value = func()
+        wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, {"wall_sec": wall, "cpu_sec": cpu, "peak_bytes": peak}
+
+
+def _stage(audio_sec, stats):
+    # 처리량 = 1 실제 초 동안 처리한 오디오 초 (실시간 배수)
+    stats["audio_sec_per_sec"] = audio_sec / stats["wall_sec"] if stats["wall_sec"] > 0 else 0.0
+    return stats
+
+
+def bench_engine(path, truth, sr, engine, workdir, tolerance_sec=0.05):
+    """
+    fixture 하나에 대해 load / split / save 단계를 측정하고 정답과 비교
+    """
+    audio_sec = sf.info(path).frames / sr
+    out = os.path.join(workdir, engine)
+    row = {"engine": engine}
+
+    if engine == "stream":
+        def split():
+            stats = process.stream_stats(path)
+            return stats, list(process.wav_del_space_stream(path, stats=stats))
+
+        (stats, intervals), row["split"] = _measure(split)
+        intervals = np.array(intervals, dtype=np.int64).reshape(-1, 2)
+        _, row["save"] = _measure(lambda: file.save_stream(
+            path, intervals, os.path.join(out, "split"), os.path.join(out, "merged.wav"),
+            scale=1.0 / stats["peak"]))
+    else:
+        (y, _), row["load"] = _measure(lambda: file.load(path))
+        engine_obj = vad.get_vad("adaptive") if engine == "adaptive" else None
+        segments, row["split"] = _measure(lambda: process.wav_del_space(y, sr, vad=engine_obj))
+        intervals = segments.intervals
+
+        def save():
+            file.save(os.path.join(out, "split"), segments, sr, workers=4)
+            file.save_merged_intervals(os.path.join(out, "merged.wav"), segments.y, segments.intervals, sr)
+
+        _, row["save"] = _measure(save)
+        del y, segments
+
+    for name in ("load", "split", "save"):
+        if name in row:
+            _stage(audio_sec, row[name])
+    row["accuracy"] = boundary_accuracy(intervals, truth, sr, tolerance_sec)
+    return row
+
+
+def bench_pipeline(durations=(60, 600), sr=16000, engines=ENGINES, seed=0, kinds=("tone", "harmonic"),
+                   fixture_dir=None, tolerance_sec=0.05):
+    """
+    길이별로 합성 WAV 를 만들고 (fixture_dir 를 주면 거기에 남겨서 재사용) 엔진별로 측정
+    반환: 결과 dict 목록 (길이 x 엔진)
+    """
+    # librosa(numba) 첫 호출의 컴파일 시간이 첫 측정에 섞이지 않도록 미리 데워 둠
+    warm = np.random.default_rng(seed).normal(0, 0.1, sr).astype(np.float32)
+    process.wav_del_space(warm, sr)
+    process.wav_del_space(warm, sr, vad=vad.get_vad("adaptive"))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        folder = fixture_dir or tmpdir
+        os.makedirs(folder, exist_ok=True)
+
+        for seconds in durations:
+            name = f"fixture_{int(seconds)}s_{sr}hz_seed{seed}_{'-'.join(kinds)}"
+            path = os.path.join(folder, name + ".wav")
+            truth_path = os.path.join(folder, name + ".truth.npy")
+            if os.path.exists(path) and os.path.exists(truth_path):
+                truth = np.load(truth_path)
+            else:
+                truth = make_fixture(path, seconds, sr, seed, kinds)
+                np.save(truth_path, truth)
+
+            for engine in engines:
+                with tempfile.TemporaryDirectory(dir=tmpdir) as workdir:
+                    row = bench_engine(path, truth, sr, engine, workdir, tolerance_sec)
+                row.update(seconds=seconds, sr=sr, seed=seed, kinds=list(kinds))
+                results.append(row)
+
+    return results
+
+
+def compare_results(baseline, current, tolerance=0.2) -> list:
+    """
+    이전 결과와 비교해서 처리량이 tolerance 비율 넘게 떨어졌거나 f1 이 0.02 넘게 떨어진 항목
+    반환: [(seconds, engine, 항목, 이전 값, 지금 값), ...]
+    """
+    before = {(r["seconds"], r["sr"], r["engine"]): r for r in baseline}
+    regressions = []
+
+    for r in current:
+        old = before.get((r["seconds"], r["sr"], r["engine"]))
+        if old is None:
+            continue
+        for name in ("load", "split", "save"):
+            if name in r and name in old:
+                was = old[name]["audio_sec_per_sec"]
+                now = r[name]["audio_sec_per_sec"]
+                if now < was * (1 - tolerance):
+                    regressions.append((r["seconds"], r["engine"], name, was, now))
+        was, now = old["accuracy"]["f1"], r["accuracy"]["f1"]
+        if now < was - 0.02:
+            regressions.append((r["seconds"], r["engine"], "f1", was, now))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="teampl.audio 벤치마크 (합성 WAV, 처리량 / 메모리 / 경계 정확도)")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10], help="fixture 길이 (분)")
+    parser.add_argument("--sr", type=int, default=16000)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=["tone", "harmonic"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", default=None, help="fixture 를 남겨 두고 재사용할 폴더")
+    parser.add_argument("--tolerance-ms", type=float, default=50, help="경계가 맞았다고 보는 오차 (ms)")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON (나빠지면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 처리량 감소 비율")
+    args = parser.parse_args(argv)
+
+    results = bench_pipeline([m * 60 for m in args.minutes], args.sr, args.engines, args.seed,
+                             args.kinds, args.fixtures, args.tolerance_ms / 1000)
+
+    print(f"{'sec':>7} {'engine':>9} {'stage':>6} {'x realtime':>11} {'wall(s)':>8} {'peak(MB)':>9}")
+    for r in results:
+        for name in ("load", "split", "save"):
+            if name in r:
+                m = r[name]
+                print(f"{r['seconds']:>7.0f} {r['engine']:>9} {name:>6} {m['audio_sec_per_sec']:>11.0f} "
+                      f"{m['wall_sec']:>8.2f} {m['peak_bytes'] / 2**20:>9.1f}")
+        a = r["accuracy"]
+        print(f"{'':>7} {'':>9} f1 {a['f1']:.3f} (p {a['precision']:.3f} / r {a['recall']:.3f}), "
+              f"경계 일치 {a['boundary_hit']:.1%}, 구간 {a['segments']}/{a['truth_segments']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare_results(baseline, results, args.tolerance)
+        for seconds, engine, name, was, now in regressions:
+            print(f"[regression] {seconds:.0f}s {engine} {name}: {was:.3f} -> {now:.3f}")
+        if regressions:
+            return 1
+        print("기준 대비 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
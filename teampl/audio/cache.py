@@ -0,0 +1,235 @@
+import os
+import json
+import hashlib
+import numpy as np
+import soundfile as sf
+import librosa
+
+import convert, preview, process
+
+# 저장 형식이나 단계 계산 방식이 바뀌면 올려서 예전 캐시를 무시
+CACHE_VERSION = 1
+
+# 기본 캐시 용량 (넘으면 가장 오래 안 쓴 항목부터 지움)
+DEFAULT_MAX_BYTES = 2 << 30
+
+
+def file_hash(path, memo_dir=None, chunk_size=1 << 20):
+    """
+    파일 내용의 blake2b 해시 (16진수 문자열)
+    - memo_dir 를 주면 (경로, 크기, 수정 시각) 이 같을 때 이전 결과를 재사용 (큰 영상을 매번 다시 읽지 않음)
+    """
+    st = os.stat(path)
+    memo = None
+    if memo_dir:
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest() + ".json"
+        memo = os.path.join(memo_dir, name)
+        try:
+            with open(memo, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["size"] == st.st_size and saved["mtime_ns"] == st.st_mtime_ns:
+                return saved["hash"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    if memo:
+        os.makedirs(memo_dir, exist_ok=True)
+        tmp = f"{memo}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": digest}, f)
+        os.replace(tmp, memo)
+    return digest
+
+
+class StageCache:
+    """
+    단계별 결과(numpy 배열 묶음)를 디스크에 저장하는 캐시
+    - 키 : 단계 이름 + 입력 키(파일 해시나 앞 단계 키) + 파라미터 -> sha256
+      (앞 단계 키를 입력으로 넘기면 파라미터를 바꾼 단계부터 뒤쪽만 다시 계산됨)
+    - 항목 하나 = root/<stage>/<key>.npz, 임시 파일에 쓰고 os.replace (여러 프로세스가 같이 써도 안전)
+    - 용량 : 전체가 max_bytes 를 넘으면 마지막 사용 시각(mtime) 이 오래된 것부터 삭제 (LRU)
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    # ------------------- 공개 API -------------------
+
+    def key(self, stage, inputs=(), params=None):
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "stage": stage, "inputs": list(inputs), "params": params or {}},
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def file_key(self, path):
+        # 입력 파일은 내용 해시로 (이름이 바뀌어도, 내용이 같으면 같은 키)
+        return file_hash(path, os.path.join(self.root, "_hashes"))
+
+    def get(self, stage, key):
+        """
+        저장된 배열 dict, 없거나 깨졌으면 None
+        """
+        path = self._path(stage, key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[StageCache.get] 캐시를 읽지 못해 다시 계산합니다: {e}")
+            self._remove(path)
+            return None
+
+        # 사용 시각 갱신 (LRU 기준)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return arrays
+
+    def put(self, stage, key, **arrays):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+        self.evict()
+
+    def run(self, stage, inputs, params, compute):
+        """
+        캐시에 있으면 읽고, 없으면 compute() (배열 dict 반환) 를 실행해서 저장
+        반환: (key, 배열 dict)
+        """
+        key = self.key(stage, inputs, params)
+        arrays = self.get(stage, key)
+        if arrays is not None:
+            self.hits += 1
+            return key, arrays
+
+        self.misses += 1
+        arrays = compute()
+        self.put(stage, key, **arrays)
+        return key, arrays
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes=None):
+        """
+        용량을 넘으면 오래 안 쓴 항목부터 지움, 지운 개수를 돌려줌
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= limit:
+                break
+            if self._remove(path):
+                removed += 1
+            total -= size
+        return removed
+
+    def clear(self):
+        return self.evict(0)
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _path(self, stage, key):
+        return os.path.join(self.root, stage, key + ".npz")
+
+    def _entries(self):
+        # (경로, 크기, 마지막 사용 시각) 목록, 다른 프로세스가 지우는 중인 파일은 건너뜀
+        entries = []
+        for folder in os.scandir(self.root):
+            if not folder.is_dir() or folder.name.startswith("_"):
+                continue
+            for entry in os.scandir(folder.path):
+                if not entry.name.endswith(".npz") or ".tmp" in entry.name:
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, st.st_size, st.st_mtime_ns))
+        return entries
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+# ------------------- 파이프라인 단계 -------------------
+
+def vad_params(vad):
+    # 엔진 종류 + 설정값 (last_stats 같은 실행 결과는 제외)
+    if vad is None:
+        return {"engine": "wav_del_space"}
+    params = {k: v for k, v in vars(vad).items() if not k.startswith("last_")}
+    params["engine"] = type(vad).__name__
+    return params
+
+
+def cached_pcm(cache, video_path, sr=None, mono=True, wav_path=None):
+    """
+    convert.extract_pcm 의 캐시 버전
+    반환: (key, y, sr)  key 는 뒤 단계의 입력으로 넘김
+    """
+    def compute():
+        y, out_sr = convert.extract_pcm(video_path, sr, mono, wav_path)
+        return {"y": y, "sr": np.int64(out_sr)}
+
+    key, arrays = cache.run("pcm", [cache.file_key(video_path)], {"sr": sr, "mono": mono}, compute)
+    y, out_sr = arrays["y"], int(arrays["sr"])
+
+    # 캐시에서 읽은 경우에도 keep_wav 결과물은 남겨 줌
+    if wav_path and not os.path.exists(wav_path):
+        os.makedirs(os.path.dirname(wav_path) or ".", exist_ok=True)
+        sf.write(wav_path, y.T if y.ndim == 2 else y, out_sr, subtype="PCM_16")
+    return key, y, out_sr
+
+
+def cached_segments(cache, pcm_key, y, sr, vad=None):
+    """
+    process.wav_del_space 의 캐시 버전 (구간 위치만 저장, 정규화는 다시 함)
+    반환: (key, Segments)
+    """
+    computed = []
+
+    def compute():
+        computed.append(process.wav_del_space(y, sr, vad=vad))
+        return {"intervals": computed[0].intervals}
+
+    key, arrays = cache.run("intervals", [pcm_key], vad_params(vad), compute)
+    if computed:
+        return key, computed[0]
+    # 캐시에서 읽었으면 정규화만 다시 (wav_del_space 와 같은 버퍼 위의 뷰)
+    return key, process.Segments(librosa.util.normalize(y) if len(y) else y, arrays["intervals"])
+
+
+def cached_envelope(cache, pcm_key, y, width=1500):
+    """
+    preview.envelope 의 캐시 버전
+    반환: (mins, maxs)
+    """
+    def compute():
+        mins, maxs = preview.envelope(y, width)
+        return {"mins": mins, "maxs": maxs}
+
+    _, arrays = cache.run("envelope", [pcm_key], {"width": width}, compute)
+    return arrays["mins"], arrays["maxs"]
@@ -1,32 +1,201 @@
 import os
-from moviepy import VideoFileClip
+import re
+import subprocess
+import numpy as np
+import soundfile as sf
 
-def convert(base_dir, filename):
-    # 경로 설정
+# ffmpeg -i 출력에서 첫 번째 오디오 스트림 정보 (예: "Audio: aac (LC) ..., 44100 Hz, stereo, fltp")
+_AUDIO_STREAM = re.compile(r"Stream #\d+:\d+.*?: Audio: [^\n]*?(\d+) Hz, ([^,\n]+)")
+
+# 컨테이너 전체 길이 (예: "Duration: 00:01:02.35", 모르면 "Duration: N/A")
+_DURATION = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# 채널 배치 이름 -> 채널 수
+_LAYOUTS = {"mono": 1, "stereo": 2, "2.1": 3, "3.0": 3, "quad": 4, "4.0": 4,
+            "5.0": 5, "5.1": 6, "6.0": 6, "6.1": 7, "7.0": 7, "7.1": 8}
+
+def convert(base_dir, filename, output_path=None):
+    # 경로 설정 (output_path 를 주면 그 경로에 저장, 없으면 output/<이름>.wav)
     input_dir = os.path.join(base_dir, "input")
-    output_dir = os.path.join(base_dir, "output")
+    output_dir = os.path.dirname(output_path) if output_path else os.path.join(base_dir, "output")
     
     if not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
     video_path = os.path.join(input_dir, filename)
-    audio_filename = os.path.splitext(filename)[0] + ".wav"
-    output_path = os.path.join(output_dir, audio_filename)
+    if output_path is None:
+        audio_filename = os.path.splitext(filename)[0] + ".wav"
+        output_path = os.path.join(output_dir, audio_filename)
 
     try:
-        # 비디오 로드 및 오디오 추출
-        video = VideoFileClip(video_path)
-        
-        if video.audio is None:
+        # 오디오 트랙 확인 (비디오는 디코딩하지 않음)
+        probe = probe_audio(video_path)
+
+        if probe is None:
             print("Error: 오디오 트랙이 없는 비디오입니다.")
             return None
-            
-        # 오디오 저장 (로그 출력 최소화)
-        video.audio.write_audiofile(output_path, codec='pcm_s16le', logger=None)
-        video.close()
-        
+
+        # 오디오 스트림만 pcm_s16le WAV 로 바로 저장
+        extract_wav(video_path, output_path)
+
         return output_path
         
     except Exception as e:
         print(f"변환 실패: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# ------------------- ffmpeg 파이프로 오디오만 추출 -------------------
+
+def ffmpeg_exe():
+    # moviepy 가 쓰는 imageio_ffmpeg 바이너리를 그대로 사용 (없으면 PATH 의 ffmpeg)
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def probe_audio(video_path, with_duration=False):
+    """
+    ffmpeg -i 의 stderr 를 읽어서 첫 오디오 스트림의 (샘플레이트, 채널 수)
+    - with_duration=True 면 (샘플레이트, 채널 수, 길이(초)) (길이를 모르면 None)
+    오디오 트랙이 없으면 None
+    """
+    result = subprocess.run(
+        [ffmpeg_exe(), "-hide_banner", "-nostdin", "-i", video_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    text = result.stderr.decode("utf-8", "replace")
+
+    if "No such file" in text or "Invalid data" in text:
+        raise RuntimeError(f"[probe_audio] 파일을 열 수 없습니다: {video_path}")
+
+    m = _AUDIO_STREAM.search(text)
+    if m is None:
+        return None
+
+    layout = m.group(2).strip()
+    channels = _LAYOUTS.get(layout.split("(")[0])
+    if channels is None:
+        n = re.match(r"(\d+) channels", layout)
+        channels = int(n.group(1)) if n else 2
+
+    if not with_duration:
+        return int(m.group(1)), channels
+
+    d = _DURATION.search(text)
+    duration = int(d.group(1)) * 3600 + int(d.group(2)) * 60 + float(d.group(3)) if d else None
+    return int(m.group(1)), channels, duration
+
+def extract_wav(video_path, wav_path):
+    """
+    ffmpeg 로 첫 오디오 스트림만 꺼내서 pcm_s16le WAV 로 저장 (VideoFileClip 없이, 원본 샘플레이트 그대로)
+    """
+    result = subprocess.run(
+        [ffmpeg_exe(), "-nostdin", "-v", "error", "-y",
+         "-i", video_path,
+         "-map", "0:a:0", "-vn", "-sn", "-dn",
+         "-acodec", "pcm_s16le", wav_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        err = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"[extract_wav] ffmpeg 실패: {err}")
+    return wav_path
+
+def _pcm_command(video_path, sr, channels):
+    # 비디오/자막 스트림은 열지 않고 첫 오디오 스트림만 float32 PCM 으로 stdout 에 씀
+    return [
+        ffmpeg_exe(), "-nostdin", "-v", "error",
+        "-i", video_path,
+        "-map", "0:a:0", "-vn", "-sn", "-dn",
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(channels), "-ar", str(sr),
+        "pipe:1",
+    ]
+
+def iter_pcm_blocks(video_path, block_size=65536, sr=None, mono=True, probe=None):
+    """
+    ffmpeg 파이프에서 block_size 샘플씩 float32 블록을 차례로 돌려줌 (디스크에 WAV 를 쓰지 않음)
+    - sr : 목표 샘플레이트 (None 이면 원본 그대로)
+    - mono=True 면 (samples,) / False 면 (samples, channels)
+    - probe : 이미 구한 probe_audio 결과가 있으면 넘겨서 ffmpeg 를 한 번 덜 띄움
+    process.iter_frame_mse 에 바로 넘길 수 있음
+    """
+    if probe is None:
+        probe = probe_audio(video_path)
+    if probe is None:
+        raise RuntimeError(f"[iter_pcm_blocks] 오디오 트랙이 없습니다: {video_path}")
+
+    native_sr, native_channels = probe
+    channels = 1 if mono else native_channels
+    frame_bytes = 4 * channels
+    block_bytes = block_size * frame_bytes
+
+    proc = subprocess.Popen(
+        _pcm_command(video_path, sr or native_sr, channels),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    try:
+        rest = b""
+        while True:
+            chunk = proc.stdout.read(block_bytes)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            usable = len(chunk) - len(chunk) % frame_bytes
+            rest = chunk[usable:]
+            block = np.frombuffer(chunk[:usable], dtype="<f4")
+            yield block if mono else block.reshape(-1, channels)
+
+        err = proc.stderr.read().decode("utf-8", "replace").strip()
+        if proc.wait() != 0:
+            raise RuntimeError(f"[iter_pcm_blocks] ffmpeg 실패: {err}")
+    finally:
+        # 중간에 그만 읽어도 ffmpeg 프로세스가 남지 않도록 정리
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+def extract_pcm(video_path, sr=None, mono=True, wav_path=None, block_size=1 << 20):
+    """
+    비디오에서 오디오만 바로 뽑아서 (y, sr) 로 돌려줌 (file.load 와 같은 형식)
+    VideoFileClip 을 열지 않고, 중간 WAV 를 쓰고 다시 읽는 과정도 없음
+    - wav_path 를 주면 같은 데이터를 pcm_s16le WAV 로도 저장 (convert 결과와 같은 형식)
+    - 오디오 트랙이 없으면 RuntimeError
+    probe 로 구한 길이만큼 배열을 미리 잡아 두고 블록이 오는 대로 채움
+    (블록 목록 + concatenate 처럼 최대 메모리가 2배가 되지 않음, 길이를 넘으면 그때만 늘림)
+    """
+    probe = probe_audio(video_path, with_duration=True)
+    if probe is None:
+        raise RuntimeError(f"[extract_pcm] 오디오 트랙이 없습니다: {video_path}")
+
+    native_sr, channels, duration = probe
+    out_sr = sr or native_sr
+    shape = () if mono else (channels,)
+
+    # 길이 표기는 10ms 단위로 반올림되므로 조금 여유를 둠
+    capacity = int(duration * out_sr) + out_sr // 10 if duration else block_size
+    y = np.empty((capacity,) + shape, dtype=np.float32)
+    n = 0
+
+    for block in iter_pcm_blocks(video_path, block_size, sr, mono, (native_sr, channels)):
+        end = n + len(block)
+        if end > len(y):
+            grown = np.empty((max(end, len(y) * 2),) + shape, dtype=np.float32)
+            grown[:n] = y[:n]
+            y = grown
+        y[n:end] = block
+        n = end
+    y = y[:n]
+
+    if wav_path:
+        folder = os.path.dirname(wav_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        sf.write(wav_path, y, out_sr, subtype="PCM_16")
+
+    # librosa 와 같게 다채널은 (channels, samples) (전치 뷰라서 복사하지 않음)
+    return (y if mono else y.T), out_sr
@@ -1,20 +1,160 @@
 import soundfile as sf
 import librosa
+import numpy as np
 import os
+import json
+import struct
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
-def save(base_path, segments, sr):
-    # 여러 오디오 조각을 개별 파일로 저장
+# mmap 으로 바로 읽을 수 있는 WAV 샘플 형식: (format tag, bits) -> dtype
+# 1 = PCM 정수, 3 = IEEE float
+_MMAP_FORMATS = {
+    (1, 16): np.int16,
+    (1, 32): np.int32,
+    (3, 32): np.float32,
+}
+
+# 아카이브 모드에서 쓰는 파일 이름 (PCM 묶음 + 위치 색인)
+ARCHIVE_PCM = "segments.pcm"
+ARCHIVE_INDEX = "segments.json"
+ARCHIVE_VERSION = 1
+
+def save(base_path, segments, sr, workers=None, max_pending=64, archive=False):
+    """
+    여러 오디오 조각을 개별 파일로 저장
+    - workers=N : N 개의 스레드가 동시에 파일을 씀 (파일 열기/헤더/닫기 비용이 겹쳐짐)
+      대기 중인 쓰기는 max_pending 개까지만 (segments 가 지연 뷰면 그만큼만 메모리에 잡힘)
+    - archive=True : 파일 수천 개 대신 segments.pcm 하나 + segments.json 색인으로 저장
+      (load_archive 로 memmap 해서 id 로 읽음)
+    """
     if not os.path.exists(base_path):
         os.makedirs(base_path, exist_ok=True)
 
     if not segments:
         return
 
-    for i, segment in enumerate(segments):
+    if archive:
+        save_archive(base_path, segments, sr)
+        return
+
+    def write(i, segment):
         file_name = f"segment_{i+1:03d}.wav"
         full_path = os.path.join(base_path, file_name)
         sf.write(full_path, segment, sr)
 
+    if not workers or workers <= 1:
+        for i, segment in enumerate(segments):
+            write(i, segment)
+        return
+
+    # 진행 중인 쓰기만 들고 있다가 max_pending 개가 차면 하나라도 끝날 때까지 기다림 (bounded queue)
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i, segment in enumerate(segments):
+            if len(pending) >= max_pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # 먼저 실패한 쓰기가 있으면 바로 멈춤
+                for fut in finished:
+                    fut.result()
+            pending.add(executor.submit(write, i, segment))
+
+    # 남은 쓰기 중 예외가 있으면 다시 던짐
+    for fut in pending:
+        fut.result()
+
+def save_archive(base_path, segments, sr, dtype="int16"):
+    """
+    모든 구간을 PCM 파일 하나에 이어서 쓰고, 구간별 위치를 JSON 색인으로 저장
+    - segments.pcm : 헤더 없는 샘플 (dtype 은 int16 또는 float32, 리틀 엔디언)
+    - segments.json : {"version", "sr", "dtype", "channels", "offsets"}
+      offsets 는 길이 N+1 인 누적 샘플 위치 (i 번째 구간 = offsets[i]:offsets[i+1])
+    반환값: 저장한 구간 수
+    """
+    if dtype not in ("int16", "float32"):
+        raise ValueError(f"[save_archive] dtype must be 'int16' or 'float32', got {dtype!r}")
+
+    pcm_path = os.path.join(base_path, ARCHIVE_PCM)
+    index_path = os.path.join(base_path, ARCHIVE_INDEX)
+    out_dtype = np.dtype(dtype).newbyteorder("<")
+
+    offsets = [0]
+    channels = None
+    with open(pcm_path + ".tmp", "wb") as f:
+        for segment in segments:
+            segment = np.asarray(segment)
+            if channels is None:
+                channels = 1 if segment.ndim == 1 else segment.shape[1]
+
+            if out_dtype.kind == "i":
+                # sf.write 의 PCM_16 과 같은 변환 (x * 32768 내림, 범위를 넘는 값은 잘라냄)
+                data = np.clip(np.floor(segment * np.float32(32768.0)), -32768, 32767).astype(out_dtype)
+            else:
+                data = segment.astype(out_dtype, copy=False)
+
+            f.write(np.ascontiguousarray(data).tobytes())
+            offsets.append(offsets[-1] + len(segment))
+
+    index = {
+        "version": ARCHIVE_VERSION,
+        "sr": sr,
+        "dtype": dtype,
+        "channels": channels or 1,
+        "offsets": offsets,
+    }
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+    # 색인을 마지막에 교체 -> 읽는 쪽이 짝이 안 맞는 pcm/색인을 보지 않음
+    os.replace(pcm_path + ".tmp", pcm_path)
+    os.replace(index_path + ".tmp", index_path)
+    return len(offsets) - 1
+
+class SegmentArchive:
+    """
+    save_archive 로 만든 묶음을 memmap 으로 열어서 구간 id 로 읽는 객체
+    - archive[i] : i 번째 구간의 원본 샘플 (memmap 뷰, 복사 없음)
+    - archive.read(i) : float32 [-1, 1) 로 변환한 배열
+    """
+
+    def __init__(self, base_path):
+        with open(os.path.join(base_path, ARCHIVE_INDEX), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"[SegmentArchive] 지원하지 않는 아카이브 버전입니다: {index.get('version')}")
+
+        self.sr = index["sr"]
+        self.channels = index["channels"]
+        self.dtype = np.dtype(index["dtype"]).newbyteorder("<")
+        self.offsets = np.asarray(index["offsets"], dtype=np.int64)
+
+        total = int(self.offsets[-1])
+        shape = (total,) if self.channels == 1 else (total, self.channels)
+        pcm_path = os.path.join(base_path, ARCHIVE_PCM)
+        if total == 0:
+            self.data = np.zeros(shape, dtype=self.dtype)
+        else:
+            self.data = np.memmap(pcm_path, dtype=self.dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        if not -len(self) <= idx < len(self):
+            raise IndexError(f"[SegmentArchive] segment id out of range: {idx}")
+        idx %= len(self)
+        return self.data[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def read(self, idx):
+        raw = self[idx]
+        if self.dtype.kind == "i":
+            return raw.astype(np.float32) / np.float32(32768.0)
+        return np.array(raw, dtype=np.float32)
+
+def load_archive(base_path):
+    # save(..., archive=True) 로 저장한 폴더 열기
+    return SegmentArchive(base_path)
+
 def save_merged(file_path, data, sr):
     # 합쳐진 오디오 데이터를 하나의 파일로 저장
     folder = os.path.dirname(file_path)
@@ -23,7 +163,204 @@ def save_merged(file_path, data, sr):
         
     sf.write(file_path, data, sr)
 
-def load(input_path): 
-    # 오디오 파일 읽기
-    y, sr = librosa.load(input_path)
-    return y, sr
\ No newline at end of file
+def save_merged_intervals(file_path, y, intervals, sr, block_size=65536):
+    """
+    y 의 [start, end) 구간들을 이어 붙인 합본을 np.concatenate 없이 바로 파일로 씀
+    짧은 구간은 block_size 샘플 정도씩 모아서 한 번에 쓰고 (쓰기 호출 횟수 줄이기),
+    긴 구간은 뷰를 그대로 씀 (복사 없음)
+    반환값: 쓴 샘플 수
+    """
+    folder = os.path.dirname(file_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    channels = 1 if y.ndim == 1 else y.shape[1]
+    written = 0
+    pending = []
+    pending_size = 0
+
+    with sf.SoundFile(file_path, "w", samplerate=sr, channels=channels) as out:
+        for start, end in np.asarray(intervals).tolist():
+            view = y[start:end]
+            if len(view) >= block_size:
+                if pending:
+                    out.write(np.concatenate(pending))
+                    pending, pending_size = [], 0
+                out.write(view)
+            else:
+                pending.append(view)
+                pending_size += len(view)
+                if pending_size >= block_size:
+                    out.write(np.concatenate(pending))
+                    pending, pending_size = [], 0
+            written += len(view)
+
+        if pending:
+            out.write(np.concatenate(pending))
+
+    return written
+
+def load(input_path, sr=None, mono=True, mmap=False, res_type="soxr_hq"):
+    """
+    오디오 파일 읽기 (기본은 원본 샘플레이트 그대로, 리샘플링 없음)
+    - sr : 목표 샘플레이트, 주면 그때만 librosa.resample 로 변환
+      (예전 동작과 같게 하려면 sr=22050)
+    - res_type : 리샘플러 종류 ("soxr_hq" 기본, 더 빠르게는 "soxr_qq", "polyphase" 등)
+    - mmap=True : PCM16/32, float32 WAV 는 디코딩 없이 파일을 메모리 맵으로 읽음
+      (지원하지 않는 형식이면 soundfile 로 읽음)
+    반환: (y, sr) / y 는 float32, mono=False 면 (channels, samples) 모양 (librosa 와 동일)
+      채널이 하나인 파일은 mono=False 여도 (samples,) 1차원 (librosa 와 동일)
+    """
+    y = None
+    if mmap:
+        try:
+            data, native_sr = load_mmap(input_path)
+        except ValueError:
+            data = None
+        if data is not None:
+            y = _mmap_to_float(data, mono)
+
+    if y is None:
+        data, native_sr = sf.read(input_path, dtype="float32", always_2d=True)
+        y = _to_mono(data) if mono else np.ascontiguousarray(data.T)
+
+    if y.ndim == 2 and (mono or y.shape[0] == 1):
+        y = y[0]
+
+    if sr is not None and sr != native_sr:
+        y = librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type=res_type)
+        return y, sr
+
+    return y, native_sr
+
+def load_mmap(path):
+    """
+    WAV 의 data 청크를 np.memmap 으로 바로 연결 (복사/디코딩 없음)
+    반환: (memmap (samples, channels), sr)
+    지원하지 않는 형식이면 ValueError
+    """
+    fmt = None
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"[load_mmap] WAV 파일이 아닙니다: {path}")
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"[load_mmap] data 청크가 없습니다: {path}")
+            chunk_id, size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                tag, channels, sr, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == 0xFFFE and size >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE: 실제 형식은 SubFormat GUID 앞 2바이트
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, bits, channels, sr)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size, os.SEEK_CUR)
+
+            if size % 2:
+                f.seek(1, os.SEEK_CUR)  # 청크는 2바이트 단위로 정렬됨
+
+    if fmt is None:
+        raise ValueError(f"[load_mmap] fmt 청크가 없습니다: {path}")
+
+    tag, bits, channels, sr = fmt
+    if (tag, bits) not in _MMAP_FORMATS:
+        raise ValueError(f"[load_mmap] 지원하지 않는 샘플 형식입니다: tag={tag}, bits={bits}")
+
+    dtype = _MMAP_FORMATS[(tag, bits)]
+    itemsize = np.dtype(dtype).itemsize
+    # 기록 도중 끊긴 파일은 size 가 실제보다 클 수 있으므로 파일 크기로 자름
+    available = os.path.getsize(path) - offset
+    frames = min(size, available) // (itemsize * channels)
+    if frames == 0:
+        return np.zeros((0, channels), dtype=dtype), sr
+
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return data, sr
+
+def _mmap_to_float(data, mono):
+    # memmap 샘플 -> float32 [-1, 1) (채널 평균은 변환과 같이 처리해서 복사 1번)
+    if np.issubdtype(data.dtype, np.integer):
+        scale = 1.0 / -np.iinfo(data.dtype).min
+    else:
+        scale = 1.0
+
+    if mono:
+        if data.shape[1] == 1:
+            y = data[:, 0].astype(np.float32)
+        else:
+            y = data.mean(axis=1, dtype=np.float32)
+    else:
+        y = data.T.astype(np.float32)
+
+    if scale != 1.0:
+        y *= np.float32(scale)
+    return y
+
+def info(path):
+    # 파일 전체를 읽지 않고 샘플레이트/길이 등만 확인
+    return sf.info(path)
+
+def _to_mono(block):
+    # (frames, channels) -> (frames,) 채널 평균 (librosa.load 의 mono=True 와 같은 방식)
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return block.mean(axis=1)
+
+def iter_blocks(path, block_size=65536):
+    # 파일을 block_size 샘플씩 모노 float32 로 읽어서 차례로 돌려줌
+    for block in sf.blocks(path, blocksize=block_size, dtype="float32", always_2d=True):
+        yield _to_mono(block)
+
+def save_stream(audio_path, intervals, base_path, merged_path=None, scale=1.0, block_size=65536):
+    """
+    (start, end) 구간이 들어오는 대로 원본 파일에서 해당 부분만 블록 단위로 읽어
+    - base_path/segment_XXX.wav 로 하나씩 저장하고
+    - merged_path 가 있으면 합본 파일 뒤에 이어서 씀
+    구간 하나도 통째로 메모리에 올리지 않음 (긴 녹음도 일정한 메모리로 처리)
+    반환값: 저장한 구간 수
+    """
+    if not os.path.exists(base_path):
+        os.makedirs(base_path, exist_ok=True)
+
+    count = 0
+    merged = None
+
+    with sf.SoundFile(audio_path) as src:
+        sr = src.samplerate
+
+        if merged_path:
+            folder = os.path.dirname(merged_path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder, exist_ok=True)
+            merged = sf.SoundFile(merged_path, "w", samplerate=sr, channels=1)
+
+        try:
+            for start, end in intervals:
+                count += 1
+                full_path = os.path.join(base_path, f"segment_{count:03d}.wav")
+
+                src.seek(start)
+                remaining = end - start
+                with sf.SoundFile(full_path, "w", samplerate=sr, channels=1) as out:
+                    while remaining > 0:
+                        block = src.read(min(block_size, remaining), dtype="float32", always_2d=True)
+                        if not len(block):
+                            break
+                        data = _to_mono(block) * np.float32(scale)
+                        out.write(data)
+                        if merged is not None:
+                            merged.write(data)
+                        remaining -= len(block)
+        finally:
+            if merged is not None:
+                merged.close()
+
+    return count
@@ -1,8 +1,7 @@
 import os
-import numpy as np
-import file, process, convert
+import file, process, convert, preview, cache, profiling
 
-def main():
+def main(stream=False, keep_wav=False, use_cache=True):
     # 경로 설정
     base_dir = "audio/data"
     output_dir = os.path.join(base_dir, "output")
@@ -11,40 +10,111 @@ def main():
     # 처리할 비디오 파일명 (audio/data/input 폴더 안에 있어야 함)
     target_video = "video4.mp4" 
 
-    # 1. 변환 (MP4 -> WAV)
-    audio_path = convert.convert(base_dir, target_video)
-    
-    if not audio_path:
-        return # 변환 실패 시 종료
+    # 단계별 시간/CPU/입출력 크기/최대 메모리 기록 (끝나면 output/profile.json 으로 저장)
+    prof = profiling.Profiler(target_video)
+    profile_path = os.path.join(output_dir, "profile.json")
+
+    # 긴 녹음은 stream=True 로 (파일을 통째로 읽지 않고 블록 단위로 두 번 훑음)
+    if stream:
+        video_path = os.path.join(base_dir, "input", target_video)
+        # 1. 변환 (MP4 -> WAV)
+        with prof.stage("convert", bytes_in=profiling.path_size(video_path)) as rec:
+            audio_path = convert.convert(base_dir, target_video)
+            rec["bytes_out"] = profiling.path_size(audio_path)
+        if not audio_path:
+            return # 변환 실패 시 종료
+        run_stream(audio_path, output_dir, split_dir, prof)
+        prof.report()
+        prof.save(profile_path)
+        return
 
-    # 2. 로드
+    # 1~2. 변환 + 로드 (ffmpeg 로 오디오 스트림만 바로 읽음, 중간 WAV 는 keep_wav=True 일 때만)
+    video_path = os.path.join(base_dir, "input", target_video)
+    wav_path = os.path.join(output_dir, os.path.splitext(target_video)[0] + ".wav") if keep_wav else None
+    # use_cache=True 면 영상 내용 해시 + 파라미터로 단계 결과를 audio/data/cache 에 저장해 두고
+    # 같은 영상/파라미터로 다시 돌릴 때는 추출/구간 계산/포락선을 건너뜀
+    stage_cache = cache.StageCache(os.path.join(base_dir, "cache")) if use_cache else None
     try:
-        y, sr = file.load(audio_path)
+        with prof.stage("load", bytes_in=profiling.path_size(video_path)) as rec:
+            if stage_cache:
+                pcm_key, y, sr = cache.cached_pcm(stage_cache, video_path, wav_path=wav_path)
+            else:
+                y, sr = convert.extract_pcm(video_path, wav_path=wav_path)
+            rec["bytes_out"] = y.nbytes
     except Exception as e:
-        print(f"Error... 파일 오류")
+        print(f"Error... 파일 오류: {e}")
         return
 
-    # 3. 파형 시각화
-    wav_graph = process.show_wav(y, sr)
-    wav_graph.savefig(os.path.join(output_dir, "waveform.png"))
-    wav_graph.close()
+    # 3. 무음 제거 및 구간 분할
+    with prof.stage("split", bytes_in=y.nbytes) as rec:
+        if stage_cache:
+            _, segments = cache.cached_segments(stage_cache, pcm_key, y, sr)
+        else:
+            segments = process.wav_del_space(y, sr)
+        rec["bytes_out"] = segments.intervals.nbytes
 
-    # 4. 무음 제거 및 구간 분할
-    segments = process.wav_del_space(y, sr)
+    # 4. 파형 시각화 (픽셀 열마다 최소/최대만 그리므로 길이와 상관없이 빠름, 소리 구간 표시)
+    image_path = os.path.join(output_dir, "waveform.png")
+    with prof.stage("plot", bytes_in=y.nbytes) as rec:
+        if stage_cache:
+            mins, maxs = cache.cached_envelope(stage_cache, pcm_key, y)
+            preview.render_preview(mins, maxs, sr, y.shape[-1], segments.intervals).savefig(image_path)
+        else:
+            preview.save_preview(image_path, y=y, sr=sr, intervals=segments.intervals)
+        rec["bytes_out"] = profiling.path_size(image_path)
 
     # 5. 저장
     if segments:
-        # 분할 파일 저장
-        file.save(split_dir, segments, sr)
-
-        # 합본 파일 저장
-        merged_y = np.concatenate(segments)
-        merged_path = os.path.join(output_dir, "merged_no_silence.wav")
-        file.save_merged(merged_path, merged_y, sr)
-        
+        with prof.stage("save", bytes_in=segments.total_samples() * segments.y.itemsize) as rec:
+            # 분할 파일 저장 (파일 수가 많으면 스레드 여러 개로 동시에 씀)
+            file.save(split_dir, segments, sr, workers=4)
+
+            # 합본 파일 저장 (구간을 합친 배열을 만들지 않고 바로 파일에 이어 씀)
+            merged_path = os.path.join(output_dir, "merged_no_silence.wav")
+            file.save_merged_intervals(merged_path, segments.y, segments.intervals, sr)
+            rec["bytes_out"] = profiling.path_size(split_dir) + profiling.path_size(merged_path)
+
         print(f"{len(segments)}개 저장")
     else:
         print("Error... 오디오 구간 오류")
 
+    prof.report()
+    prof.save(profile_path)
+
+def run_stream(audio_path, output_dir, split_dir, prof=None):
+    # 스트리밍 모드: 무음 제거 결과를 바로 디스크에 쓰고, 파형은 파일에서 블록 단위로 그림
+    prof = prof or profiling.Profiler(audio_path)
+    audio_bytes = profiling.path_size(audio_path)
+    try:
+        with prof.stage("stats", bytes_in=audio_bytes):
+            stats = process.stream_stats(audio_path)
+    except Exception as e:
+        print(f"Error... 파일 오류")
+        return
+
+    if stats["peak"] == 0:
+        print("Error... 오디오 구간 오류")
+        return
+
+    # 구간 위치는 구간당 정수 2개뿐이라 목록으로 받아 둠 (미리보기에도 사용)
+    with prof.stage("split", bytes_in=audio_bytes) as rec:
+        intervals = list(process.wav_del_space_stream(audio_path, stats=stats))
+        rec["bytes_out"] = len(intervals) * 16
+    merged_path = os.path.join(output_dir, "merged_no_silence.wav")
+
+    # wav_del_space 와 같이 최대 진폭 1.0 으로 정규화해서 저장
+    with prof.stage("save", bytes_in=audio_bytes) as rec:
+        count = file.save_stream(audio_path, intervals, split_dir, merged_path, scale=1.0 / stats["peak"])
+        rec["bytes_out"] = profiling.path_size(split_dir) + profiling.path_size(merged_path)
+
+    if count:
+        image_path = os.path.join(output_dir, "waveform.png")
+        with prof.stage("plot", bytes_in=audio_bytes) as rec:
+            preview.save_preview(image_path, audio_path=audio_path, intervals=intervals)
+            rec["bytes_out"] = profiling.path_size(image_path)
+        print(f"{count}개 저장")
+    else:
+        print("Error... 오디오 구간 오류")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
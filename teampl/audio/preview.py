@@ -0,0 +1,166 @@
+import os
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import file
+
+# 캐시 파일 형식이 바뀌면 올려서 예전 캐시를 무시
+ENVELOPE_VERSION = 1
+
+
+def envelope(y, width=1500):
+    """
+    픽셀 열마다 (최소, 최대) 진폭을 구한 포락선
+    - 열 경계는 (i * n) // width, np.minimum/maximum.reduceat 으로 한 번에 계산 (복사 없음)
+    - 오디오가 아무리 길어도 결과 크기는 width 로 고정
+    반환: (mins, maxs) float32 배열
+    """
+    if y.ndim == 2:
+        y = y.mean(axis=0)  # librosa 형식 (channels, samples) -> 모노
+
+    n = len(y)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+    width = min(width, n)
+    starts = (np.arange(width, dtype=np.int64) * n) // width
+    mins = np.minimum.reduceat(y, starts).astype(np.float32, copy=False)
+    maxs = np.maximum.reduceat(y, starts).astype(np.float32, copy=False)
+    return mins, maxs
+
+
+def envelope_from_file(path, width=1500, block_size=1 << 20):
+    """
+    파일을 블록 단위로 읽으면서 포락선 계산 (전체를 메모리에 올리지 않음)
+    반환: (mins, maxs, sr, samples)
+    """
+    info = file.info(path)
+    n = info.frames
+    width = max(1, min(width, n))
+
+    mins = np.full(width, np.inf, dtype=np.float32)
+    maxs = np.full(width, -np.inf, dtype=np.float32)
+    # 열 경계 (envelope 과 같은 방식)
+    bounds = (np.arange(width, dtype=np.int64) * n) // width
+
+    pos = 0
+    for block in file.iter_blocks(path, block_size):
+        if not len(block):
+            continue
+
+        # 이 블록의 샘플이 걸쳐 있는 열 범위
+        first = np.searchsorted(bounds, pos, side="right") - 1
+        last = np.searchsorted(bounds, pos + len(block) - 1, side="right") - 1
+        starts = np.maximum(bounds[first:last + 1] - pos, 0)
+
+        # 블록 경계에 걸친 열은 이전 블록 값과 합침
+        mins[first:last + 1] = np.minimum(mins[first:last + 1], np.minimum.reduceat(block, starts))
+        maxs[first:last + 1] = np.maximum(maxs[first:last + 1], np.maximum.reduceat(block, starts))
+        pos += len(block)
+
+    if n == 0:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32), info.samplerate, 0
+    return mins, maxs, info.samplerate, n
+
+
+def _signature(path):
+    st = os.stat(path)
+    return np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+
+
+def load_envelope(path, width=1500, cache_path=None):
+    """
+    포락선을 .npz 캐시에서 읽고, 없거나 원본이 바뀌었으면 다시 계산해서 저장
+    (캐시 키: 원본 파일의 수정 시각/크기 + width)
+    반환: (mins, maxs, sr, samples)
+    """
+    if cache_path is None:
+        cache_path = os.path.splitext(path)[0] + f".envelope{width}.npz"
+
+    signature = _signature(path)
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cached:
+                if (int(cached["version"]) == ENVELOPE_VERSION
+                        and np.array_equal(cached["signature"], signature)):
+                    return cached["mins"], cached["maxs"], int(cached["sr"]), int(cached["samples"])
+        except Exception as e:
+            print(f"[load_envelope] 캐시를 읽지 못해 다시 계산합니다: {e}")
+
+    mins, maxs, sr, samples = envelope_from_file(path, width)
+
+    tmp = cache_path + ".tmp.npz"
+    np.savez(tmp, version=ENVELOPE_VERSION, signature=signature,
+             mins=mins, maxs=maxs, sr=sr, samples=samples)
+    os.replace(tmp, cache_path)
+
+    return mins, maxs, sr, samples
+
+
+def interval_columns(intervals, samples, width):
+    """
+    (N, 2) 샘플 구간 배열 -> 길이 width 의 bool 배열 (그 열에 소리 구간이 조금이라도 걸치면 True)
+    """
+    intervals = np.asarray(intervals, dtype=np.int64)
+    bounds = (np.arange(width, dtype=np.int64) * samples) // width
+    first = np.searchsorted(bounds, intervals[:, 0], side="right") - 1
+    last = np.searchsorted(bounds, np.maximum(intervals[:, 1] - 1, intervals[:, 0]), side="right") - 1
+
+    # 차분 배열 + 누적합으로 구간 개수와 상관없이 한 번에 표시
+    diff = np.zeros(width + 1, dtype=np.int64)
+    np.add.at(diff, first, 1)
+    np.add.at(diff, last + 1, -1)
+    return np.cumsum(diff[:-1]) > 0
+
+
+def render_preview(mins, maxs, sr, samples, intervals=None, width=1500, height=400, title="Waveform"):
+    """
+    포락선을 고정 크기 그림으로 그림 (pyplot 을 쓰지 않으므로 GUI 없는 서버에서도 동작)
+    - intervals : (N, 2) 샘플 위치 배열이 있으면 소리 구간을 색으로 표시
+    반환: matplotlib Figure (savefig 로 저장)
+    """
+    dpi = 100
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+
+    duration = samples / sr if sr else 0.0
+    if len(mins):
+        x = (np.arange(len(mins)) + 0.5) * (duration / len(mins))
+        ax.fill_between(x, mins, maxs, color="tab:blue", linewidth=0)
+
+    if intervals is not None and len(intervals) and len(mins):
+        # 구간을 픽셀 열 단위 표시로 바꿔서 한 번에 그림 (구간이 수만 개여도 그리기 비용은 width 에 비례)
+        covered = interval_columns(intervals, samples, len(mins))
+        ax.fill_between(x, -1.05, 1.05, where=covered, step="mid",
+                        color="tab:orange", alpha=0.25, linewidth=0)
+
+    ax.set_xlim(0, duration)
+    ax.set_ylim(-1.05, 1.05)
+    ax.set_title(title)
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Amplitude")
+    fig.tight_layout()
+    return fig
+
+
+def save_preview(image_path, y=None, sr=None, audio_path=None, intervals=None,
+                 width=1500, height=400, cache=True):
+    """
+    파형 미리보기 PNG 저장
+    - y, sr 을 주면 메모리의 배열로, audio_path 를 주면 파일에서 (cache=True 면 .npz 캐시 사용)
+    """
+    if audio_path is not None:
+        if cache:
+            mins, maxs, sr, samples = load_envelope(audio_path, width)
+        else:
+            mins, maxs, sr, samples = envelope_from_file(audio_path, width)
+    elif y is not None:
+        mins, maxs = envelope(y, width)
+        samples = y.shape[-1]
+    else:
+        raise ValueError("[save_preview] y 또는 audio_path 중 하나는 있어야 합니다.")
+
+    fig = render_preview(mins, maxs, sr, samples, intervals, width, height)
+    fig.savefig(image_path)
+    return image_path
@@ -1,31 +1,75 @@
+import numpy as np
 import librosa
 import librosa.display
 import matplotlib.pyplot as plt
+import file
 
-def wav_del_space(y, sr):
+# librosa.power_to_db 의 amin 과 같은 값 (완전 무음에서 log 0 방지)
+AMIN = 1e-10
+
+class Segments:
+    """
+    무음 제거 결과 구간들을 원본 버퍼 위의 뷰로 보여주는 가벼운 시퀀스
+    - intervals : (N, 2) int64 배열, 각 행은 [start, end) 샘플 위치
+    - segments[i] 는 y[start:end] 뷰 (복사 없음), 꺼낼 때 만들어짐
+    - 예전 list 결과처럼 len / for / 인덱싱 / np.concatenate 모두 그대로 사용 가능
+    """
+
+    def __init__(self, y, intervals):
+        self.y = y
+        self.intervals = intervals
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return Segments(self.y, self.intervals[idx])
+        start, end = self.intervals[idx]
+        return self.y[start:end]
+
+    def __iter__(self):
+        y = self.y
+        for start, end in self.intervals.tolist():
+            yield y[start:end]
+
+    def total_samples(self) -> int:
+        # 합본 길이 (합치지 않고 계산)
+        return int((self.intervals[:, 1] - self.intervals[:, 0]).sum())
+
+def wav_intervals(y, sr, top_db=20, frame_length=1024, hop_length=256, min_sec=0.1):
+    """
+    소리가 있는 구간의 [start, end) 샘플 위치를 (N, 2) int64 배열로 반환
+    min_sec 이하 길이의 구간은 배열 연산 한 번으로 걸러냄
+    """
+    if len(y) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    intervals = librosa.effects.split(
+        y,
+        top_db=top_db,
+        frame_length=frame_length,
+        hop_length=hop_length
+    ).astype(np.int64, copy=False)
+
+    lengths = intervals[:, 1] - intervals[:, 0]
+    return intervals[lengths > sr * min_sec]
+
+def wav_del_space(y, sr, vad=None):
     # 데이터 유효성 검사
     if len(y) == 0: 
-        return []
+        return Segments(y, np.empty((0, 2), dtype=np.int64))
 
     # 정규화
     y = librosa.util.normalize(y)
 
-    # 무음 구간 감지 (top_db 조절로 민감도 설정 가능)
-    intervals = librosa.effects.split(
-        y, 
-        top_db=20,         
-        frame_length=1024, 
-        hop_length=256
-    )
- 
-    segments_list = []
+    # 음성 구간 검출 엔진을 주면 그걸로 판정 (vad.get_vad("adaptive") 등)
+    if vad is not None:
+        return Segments(y, vad.detect(y, sr))
 
-    # 0.1초 미만의 노이즈 구간 제외하고 리스트에 추가
-    for start, end in intervals:
-        if (end - start) > sr * 0.1:
-            segments_list.append(y[start:end])
-
-    return segments_list
+    # 무음 구간 감지 (top_db 조절로 민감도 설정 가능)
+    # 0.1초 미만의 노이즈 구간은 제외, 구간은 정규화된 버퍼 위의 뷰로 돌려줌
+    return Segments(y, wav_intervals(y, sr, top_db=20, frame_length=1024, hop_length=256, min_sec=0.1))
 
 def show_wav(y, sr):
     plt.figure(figsize=(15, 10))
@@ -35,4 +79,120 @@ def show_wav(y, sr):
     plt.ylabel("Amplitude")
     
     # plt 객체를 반환하여 main에서 저장하도록 함
-    return plt
\ No newline at end of file
+    return plt
+
+# ------------------- 스트리밍 무음 제거 -------------------
+
+def iter_frame_mse(blocks, frame_length=1024, hop_length=256):
+    """
+    블록 단위로 들어오는 샘플에서 프레임별 평균 제곱값(= rms ** 2)을 차례로 계산
+    librosa.feature.rms(center=True) 와 같은 프레임 배치 (앞뒤 frame_length // 2 만큼 0 패딩)
+    블록 경계에 걸친 프레임은 다음 블록이 올 때까지 carry 에 남겨 둠
+
+    yield (block, mse) : 방금 읽은 블록, 그 블록까지 읽고 새로 확정된 프레임들의 mse
+    (마지막에는 뒤쪽 패딩으로 확정되는 프레임들을 block=None 으로 한 번 더 돌려줌)
+    """
+    pad = frame_length // 2
+    carry = np.zeros(pad)  # 제곱값을 보관 (앞쪽 패딩 포함)
+
+    def take_frames(buf):
+        if len(buf) < frame_length:
+            return np.empty(0), buf
+        count = 1 + (len(buf) - frame_length) // hop_length
+        cs = np.concatenate(([0.0], np.cumsum(buf)))
+        starts = np.arange(count) * hop_length
+        mse = (cs[starts + frame_length] - cs[starts]) / frame_length
+        return mse, buf[count * hop_length:]
+
+    for block in blocks:
+        buf = np.concatenate((carry, np.square(block, dtype=np.float64)))
+        mse, carry = take_frames(buf)
+        yield block, mse
+
+    mse, _ = take_frames(np.concatenate((carry, np.zeros(pad))))
+    yield None, mse
+
+
+def stream_stats(path, frame_length=1024, hop_length=256, block_size=65536):
+    """
+    1차 패스: 파일 전체를 블록 단위로 훑어서 정규화/임계값에 필요한 값만 모음
+    반환: {"sr", "samples", "frames", "peak", "max_mse"}
+    """
+    peak = 0.0
+    max_mse = 0.0
+    samples = 0
+    frames = 0
+
+    blocks = file.iter_blocks(path, block_size)
+    for block, mse in iter_frame_mse(blocks, frame_length, hop_length):
+        if block is not None and len(block):
+            samples += len(block)
+            peak = max(peak, float(np.max(np.abs(block))))
+        if len(mse):
+            frames += len(mse)
+            max_mse = max(max_mse, float(mse.max()))
+
+    return {
+        "sr": file.info(path).samplerate,
+        "samples": samples,
+        "frames": frames,
+        "peak": peak,
+        "max_mse": max_mse,
+    }
+
+
+def wav_del_space_stream(path, top_db=20, frame_length=1024, hop_length=256,
+                         min_sec=0.1, block_size=65536, stats=None):
+    """
+    wav_del_space 의 스트리밍 버전 (파일 전체를 메모리에 올리지 않음)
+    - 1차 패스(stream_stats)로 최대 에너지를 구하고
+    - 2차 패스에서 프레임을 다시 계산하면서 구간이 닫히는 즉시 (start, end) 샘플 위치를 yield
+    판정 규칙은 librosa.effects.split(top_db, ref=np.max) 와 같음
+    (정규화는 전체에 같은 배율을 곱하는 것이라 판정에는 영향 없음, 저장할 때 stats["peak"] 로 나눔)
+
+    주의: librosa.load 와 달리 22050Hz 로 리샘플링하지 않고 원본 샘플레이트 그대로 처리
+    """
+    if stats is None:
+        stats = stream_stats(path, frame_length, hop_length, block_size)
+
+    samples = stats["samples"]
+    if samples == 0:
+        return
+
+    min_len = stats["sr"] * min_sec
+    threshold = max(stats["max_mse"], AMIN) * 10.0 ** (-top_db / 10.0)
+
+    def close(start_frame, end_frame):
+        start = start_frame * hop_length
+        end = min(end_frame * hop_length, samples)
+        if end - start > min_len:
+            return start, end
+        return None
+
+    frame = 0          # 이번 mse 배열의 첫 프레임 번호
+    opened = None      # 열려 있는 구간의 시작 프레임 (없으면 None)
+
+    blocks = file.iter_blocks(path, block_size)
+    for _, mse in iter_frame_mse(blocks, frame_length, hop_length):
+        if not len(mse):
+            continue
+
+        loud = np.maximum(mse, AMIN) > threshold
+
+        # 상태가 바뀌는 프레임만 골라서 처리 (블록당 몇 개 안 됨)
+        prev = np.array([opened is not None])
+        for k in np.flatnonzero(np.diff(np.concatenate((prev, loud)).astype(np.int8))):
+            if loud[k]:
+                opened = frame + k
+            else:
+                interval = close(opened, frame + k)
+                opened = None
+                if interval is not None:
+                    yield interval
+
+        frame += len(mse)
+
+    if opened is not None:
+        interval = close(opened, frame)
+        if interval is not None:
+            yield interval
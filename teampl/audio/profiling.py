@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import functools
+from contextlib import contextmanager
+
+try:
+    import resource  # 리눅스/맥만 있음 (윈도우에서는 최대 메모리를 기록하지 않음)
+except ImportError:
+    resource = None
+
+
+def peak_rss_bytes():
+    """
+    이 프로세스의 지금까지 최대 메모리 사용량 (bytes), 알 수 없으면 None
+    (줄어들지 않는 값이라 한 프로세스에서 파일 여러 개를 처리하면 앞 파일 몫까지 들어감)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, 맥은 bytes 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes():
+    """
+    지금 이 순간 이 프로세스가 쓰는 메모리 (bytes), /proc 이 없으면 (리눅스 외) None
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident * os.sysconf("SC_PAGE_SIZE")
+
+
+def cpu_seconds():
+    """
+    (이 프로세스 CPU 시간, 끝난 자식 프로세스 CPU 시간)
+    자식 쪽은 ffmpeg 처럼 subprocess 로 돌리고 기다린 프로세스들 (윈도우에서는 항상 0)
+    """
+    t = os.times()
+    return time.process_time(), t.children_user + t.children_system
+
+
+def path_size(path):
+    """
+    파일 크기, 폴더면 안에 있는 파일 크기 합 (없으면 0)
+    """
+    if not path or not os.path.exists(path):
+        return 0
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class Profiler:
+    """
+    단계별 시간/메모리 기록기
+    - with prof.stage("load", bytes_in=...) as rec: ... rec["bytes_out"] = ...
+    - @prof.timed("save") 로 함수에 붙여도 됨
+    - 단계마다 wall(실제 시간), cpu(프로세스 CPU 시간, 스레드 + 그 단계에서 끝난 자식 프로세스 포함),
+      child_cpu(그중 ffmpeg 등 자식 프로세스 몫), bytes_in/out,
+      rss_start/rss_end/rss_delta(단계 앞뒤의 현재 메모리, 리눅스만),
+      process_peak_rss(그 단계가 끝났을 때까지 프로세스 전체의 최대 메모리, 앞 단계/앞 파일 몫도 포함)
+    - to_dict() / save(path) 로 실행 하나의 JSON, aggregate() 로 여러 실행을 단계별로 합침
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.stages = []
+        self._t0 = time.perf_counter()
+        self._cpu0 = sum(cpu_seconds())
+
+    # ------------------- 공개 API -------------------
+
+    @contextmanager
+    def stage(self, name, bytes_in=0):
+        rec = {"stage": name, "bytes_in": int(bytes_in), "bytes_out": 0}
+        rss0 = current_rss_bytes()
+        t0 = time.perf_counter()
+        cpu0, child0 = cpu_seconds()
+        try:
+            yield rec
+        except BaseException:
+            rec["error"] = True
+            raise
+        finally:
+            rec["wall_sec"] = time.perf_counter() - t0
+            cpu1, child1 = cpu_seconds()
+            rec["child_cpu_sec"] = child1 - child0
+            rec["cpu_sec"] = (cpu1 - cpu0) + rec["child_cpu_sec"]
+            rss1 = current_rss_bytes()
+            rec["rss_start"] = rss0
+            rec["rss_end"] = rss1
+            rec["rss_delta"] = None if rss0 is None or rss1 is None else rss1 - rss0
+            rec["process_peak_rss"] = peak_rss_bytes()
+            rec["bytes_in"] = int(rec["bytes_in"])
+            rec["bytes_out"] = int(rec["bytes_out"])
+            self.stages.append(rec)
+
+    def timed(self, name=None):
+        """
+        함수 실행 전체를 한 단계로 기록하는 데코레이터
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "wall_sec": time.perf_counter() - self._t0,
+            "cpu_sec": sum(cpu_seconds()) - self._cpu0,
+            "rss": current_rss_bytes(),
+            "process_peak_rss": peak_rss_bytes(),
+            "stages": list(self.stages),
+        }
+
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def report(self):
+        # 단계별 한 줄씩 출력 (시간이 긴 순서)
+        for rec in sorted(self.stages, key=lambda r: -r["wall_sec"]):
+            rss = "-" if rec["rss_delta"] is None else f"{rec['rss_delta'] / 2**20:+.0f}MB"
+            print(f"  {rec['stage']:<10} {rec['wall_sec']:8.3f}s  cpu {rec['cpu_sec']:8.3f}s  "
+                  f"(자식 {rec['child_cpu_sec']:.3f}s)  in {rec['bytes_in'] / 2**20:8.1f}MB  "
+                  f"out {rec['bytes_out'] / 2**20:8.1f}MB  rss {rss}")
+
+
+def aggregate(runs) -> dict:
+    """
+    Profiler.to_dict() 결과 여러 개 -> 단계 이름별 합계/평균/최댓값
+    (배치 실행에서 어느 단계에 시간이 가장 많이 쓰였는지 보는 용도)
+    """
+    stages = {}
+    for run in runs:
+        if not run:
+            continue
+        for rec in run["stages"]:
+            agg = stages.setdefault(rec["stage"], {
+                "count": 0, "wall_sec": 0.0, "cpu_sec": 0.0, "max_wall_sec": 0.0,
+                "child_cpu_sec": 0.0, "bytes_in": 0, "bytes_out": 0,
+                "max_rss_end": None, "max_rss_delta": None, "max_process_peak_rss": None,
+            })
+            agg["count"] += 1
+            agg["wall_sec"] += rec["wall_sec"]
+            agg["cpu_sec"] += rec["cpu_sec"]
+            agg["child_cpu_sec"] += rec.get("child_cpu_sec", 0.0)
+            agg["max_wall_sec"] = max(agg["max_wall_sec"], rec["wall_sec"])
+            agg["bytes_in"] += rec["bytes_in"]
+            agg["bytes_out"] += rec["bytes_out"]
+            for key, src in (("max_rss_end", "rss_end"), ("max_rss_delta", "rss_delta"),
+                             ("max_process_peak_rss", "process_peak_rss")):
+                if rec.get(src) is not None:
+                    agg[key] = rec[src] if agg[key] is None else max(agg[key], rec[src])
+
+    total = sum(agg["wall_sec"] for agg in stages.values()) or 1.0
+    for agg in stages.values():
+        agg["mean_wall_sec"] = agg["wall_sec"] / agg["count"]
+        agg["share"] = agg["wall_sec"] / total
+        # CPU / wall 이 1 보다 작으면 I/O 대기, 1 보다 크면 여러 스레드가 일함
+        agg["cpu_ratio"] = agg["cpu_sec"] / agg["wall_sec"] if agg["wall_sec"] else 0.0
+    return stages
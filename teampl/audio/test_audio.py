@@ -0,0 +1,479 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+import librosa
+
+import batch, bench, cache, convert, file, preview, process, profiling, vad
+
+
+def make_wav(path, sr=16000, seed=0, count=10):
+    # 작은 잡음(무음 구간)과 사인파(소리 구간)를 번갈아 이어 붙인 테스트용 wav
+    rng = np.random.default_rng(seed)
+    parts = []
+    for _ in range(count):
+        parts.append(rng.normal(0, 0.001, rng.integers(1000, 20000)))
+        parts.append(np.sin(np.arange(rng.integers(500, 30000)) * 0.05) * rng.uniform(0.2, 0.9))
+    y = np.concatenate(parts).astype(np.float32)
+    sf.write(path, y, sr, subtype="FLOAT")
+    return y, sr
+
+
+#   Streaming Silence Removal Tests
+
+class TestStreamSilence(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "a.wav")
+        self.y, self.sr = make_wav(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected_intervals(self):
+        y = librosa.util.normalize(self.y)
+        intervals = librosa.effects.split(y, top_db=20, frame_length=1024, hop_length=256)
+        return [(int(s), int(e)) for s, e in intervals if (e - s) > self.sr * 0.1]
+
+    def test_same_intervals_as_librosa(self):
+        """블록 크기와 상관없이 librosa.effects.split 과 같은 구간이 나와야 함"""
+        expected = self.expected_intervals()
+        for block_size in (1000, 4096, 65536):
+            got = list(process.wav_del_space_stream(self.path, block_size=block_size))
+            self.assertEqual(got, expected, block_size)
+
+    def test_save_stream_matches_concatenate(self):
+        """디스크로 바로 쓴 합본이 np.concatenate 결과와 같아야 함"""
+        stats = process.stream_stats(self.path)
+        intervals = process.wav_del_space_stream(self.path, stats=stats)
+        merged_path = os.path.join(self.tmp.name, "merged.wav")
+
+        count = file.save_stream(self.path, intervals, os.path.join(self.tmp.name, "split"),
+                                 merged_path, scale=1.0 / stats["peak"], block_size=777)
+
+        y = librosa.util.normalize(self.y)
+        expected = np.concatenate([y[s:e] for s, e in self.expected_intervals()])
+        merged, _ = sf.read(merged_path)
+
+        self.assertEqual(count, len(self.expected_intervals()))
+        self.assertEqual(len(merged), len(expected))
+        self.assertLess(np.abs(merged - expected).max(), 1e-3)
+
+
+#   Segment View Tests
+
+class TestSegments(unittest.TestCase):
+    def test_views_match_old_list(self):
+        """구간 뷰가 예전 y[start:end] 리스트와 같고, 복사 없이 원본을 가리켜야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            y, sr = make_wav(os.path.join(tmpdir, "a.wav"))
+
+        segments = process.wav_del_space(y, sr)
+        yn = librosa.util.normalize(y)
+        expected = [yn[s:e] for s, e in librosa.effects.split(yn, top_db=20, frame_length=1024, hop_length=256)
+                    if (e - s) > sr * 0.1]
+
+        self.assertEqual(len(segments), len(expected))
+        for got, exp in zip(segments, expected):
+            np.testing.assert_array_equal(got, exp)
+        self.assertTrue(np.shares_memory(segments[0], segments.y))
+        self.assertEqual(segments.total_samples(), sum(len(e) for e in expected))
+
+    def test_merged_writer_matches_concatenate(self):
+        y = np.linspace(-1, 1, 50000, dtype=np.float32)
+        intervals = np.array([[0, 10], [100, 30000], [30010, 30020], [40000, 50000]])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "merged.wav")
+            written = file.save_merged_intervals(path, y, intervals, 16000, block_size=1000)
+            merged, _ = sf.read(path, dtype="float32")
+
+        expected = np.concatenate([y[s:e] for s, e in intervals])
+        self.assertEqual(written, len(expected))
+        np.testing.assert_allclose(merged, expected, atol=1e-4)
+
+
+#   Segment Writer Tests
+
+class TestSegmentWriter(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.segments = [rng.uniform(-1, 1, rng.integers(100, 2000)).astype(np.float32) for _ in range(50)]
+
+    def test_threaded_save_matches_serial(self):
+        """스레드로 저장해도 파일 이름/내용이 순차 저장과 같아야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file.save(os.path.join(tmpdir, "serial"), self.segments, 16000)
+            file.save(os.path.join(tmpdir, "threads"), self.segments, 16000, workers=4, max_pending=3)
+
+            names = sorted(os.listdir(os.path.join(tmpdir, "serial")))
+            self.assertEqual(names, sorted(os.listdir(os.path.join(tmpdir, "threads"))))
+            for name in names:
+                a, _ = sf.read(os.path.join(tmpdir, "serial", name))
+                b, _ = sf.read(os.path.join(tmpdir, "threads", name))
+                np.testing.assert_array_equal(a, b)
+
+    def test_archive_roundtrip(self):
+        """아카이브에서 id 로 읽은 구간이 개별 WAV 로 저장한 것과 같아야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file.save(os.path.join(tmpdir, "wav"), self.segments, 16000)
+            file.save(os.path.join(tmpdir, "arc"), self.segments, 16000, archive=True)
+            archive = file.load_archive(os.path.join(tmpdir, "arc"))
+
+            self.assertEqual(len(archive), len(self.segments))
+            self.assertEqual(archive.sr, 16000)
+            for i in (0, 17, len(self.segments) - 1):
+                expected, _ = sf.read(os.path.join(tmpdir, "wav", f"segment_{i+1:03d}.wav"), dtype="float32")
+                np.testing.assert_array_equal(archive.read(i), expected)
+            del archive
+
+
+#   Preview Tests
+
+class TestPreview(unittest.TestCase):
+    def test_envelope_from_file_matches_memory(self):
+        """블록 크기와 상관없이 파일에서 구한 포락선이 메모리 버전과 같아야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.wav")
+            y, sr = make_wav(path)
+            expected = preview.envelope(y, 300)
+
+            for block_size in (997, 65536):
+                mins, maxs, got_sr, samples = preview.envelope_from_file(path, 300, block_size)
+                np.testing.assert_array_equal(mins, expected[0])
+                np.testing.assert_array_equal(maxs, expected[1])
+            self.assertEqual((got_sr, samples), (sr, len(y)))
+
+    def test_cache_and_render(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.wav")
+            y, sr = make_wav(path)
+            cache = os.path.join(tmpdir, "env.npz")
+
+            first = preview.load_envelope(path, 200, cache)
+            self.assertTrue(os.path.exists(cache))
+            second = preview.load_envelope(path, 200, cache)
+            np.testing.assert_array_equal(first[0], second[0])
+
+            image = os.path.join(tmpdir, "wave.png")
+            intervals = process.wav_del_space(y, sr).intervals
+            preview.save_preview(image, audio_path=path, intervals=intervals, width=200, height=100)
+            self.assertGreater(os.path.getsize(image), 0)
+
+    def test_interval_columns(self):
+        covered = preview.interval_columns(np.array([[0, 10], [55, 56]]), 100, 10)
+        self.assertEqual(covered.tolist(), [True] + [False] * 4 + [True] + [False] * 4)
+
+
+#   VAD Tests
+
+class TestVAD(unittest.TestCase):
+    def test_merge_and_postprocess(self):
+        merged = vad.merge_intervals(np.array([[0, 10], [12, 20], [30, 40], [35, 38]]), gap=2)
+        self.assertEqual(merged.tolist(), [[0, 20], [30, 40]])
+
+        got = vad.postprocess(np.array([[100, 200], [250, 1000]]), sr=1000, samples=1000,
+                              pad_sec=0.02, merge_gap_sec=0.01, min_sec=0.2, max_sec=0.5)
+        self.assertEqual(got.tolist(), [[80, 540], [540, 1000]])
+
+    def test_threshold_matches_wav_del_space(self):
+        """기본 엔진은 기존 wav_del_space 와 같은 구간을 돌려줘야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            y, sr = make_wav(os.path.join(tmpdir, "a.wav"))
+
+        expected = process.wav_del_space(y, sr).intervals
+        got = process.wav_del_space(y, sr, vad=vad.get_vad("threshold")).intervals
+        np.testing.assert_array_equal(got, expected)
+
+    def test_adaptive_follows_noise_floor(self):
+        """배경 소음이 중간에 커져도 톤 구간만 찾고, 조용한 부분은 세밀 분석을 건너뛰어야 함"""
+        sr = 16000
+        rng = np.random.default_rng(3)
+        y = rng.normal(0, 0.002, sr * 40).astype(np.float32)
+        y[sr * 20:] += rng.normal(0, 0.05, sr * 20).astype(np.float32)  # 20초부터 소음이 커짐
+
+        truth = [(2, 3), (10, 11), (25, 26), (33, 34)]
+        t = np.arange(sr) / sr
+        for a, _ in truth:
+            y[a * sr:(a + 1) * sr] += (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+        engine = vad.get_vad("adaptive")
+        intervals = process.wav_del_space(y, sr, vad=engine).intervals
+
+        self.assertEqual(len(intervals), len(truth))
+        for (start, end), (a, b) in zip(intervals / sr, truth):
+            self.assertAlmostEqual(start, a, delta=0.15)
+            self.assertAlmostEqual(end, b, delta=0.15)
+        self.assertLess(engine.last_stats["candidate_ratio"], 0.3)
+
+    def test_get_vad(self):
+        with self.assertRaises(ValueError):
+            vad.get_vad("nope")
+        engine = vad.ThresholdVAD()
+        self.assertIs(vad.get_vad(engine), engine)
+
+
+#   Load Tests
+
+class TestLoad(unittest.TestCase):
+    def test_native_rate_and_mmap_match_librosa(self):
+        """리샘플링 없이 읽은 결과가 librosa.load(sr=None) 과 같아야 함 (mmap 포함)"""
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-0.9, 0.9, (8000, 2)).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for subtype in ("PCM_16", "FLOAT", "PCM_24"):
+                path = os.path.join(tmpdir, subtype + ".wav")
+                sf.write(path, x, 44100, subtype=subtype)
+                expected, _ = librosa.load(path, sr=None)
+
+                for mmap in (False, True):
+                    y, sr = file.load(path, mmap=mmap)
+                    self.assertEqual(sr, 44100)
+                    np.testing.assert_allclose(y, expected, atol=1e-6)
+
+    def test_resample_only_when_asked(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.wav")
+            sf.write(path, np.zeros(44100, dtype=np.float32), 44100)
+            y, sr = file.load(path, sr=22050)
+
+        self.assertEqual(sr, 22050)
+        self.assertEqual(len(y), 22050)
+
+    def test_mono_false_shapes_match_librosa(self):
+        """mono=False 여도 채널이 하나면 1차원, 둘이면 (channels, samples)"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for channels in (1, 2):
+                path = os.path.join(tmpdir, f"{channels}.wav")
+                sf.write(path, np.zeros((1000, channels), dtype=np.float32), 8000)
+                expected, _ = librosa.load(path, sr=None, mono=False)
+                for mmap in (False, True):
+                    y, _ = file.load(path, mono=False, mmap=mmap)
+                    self.assertEqual(y.shape, expected.shape)
+
+
+#   Convert Tests
+
+class TestExtractPCM(unittest.TestCase):
+    def test_pipe_matches_source(self):
+        """영상 컨테이너 안의 무손실 오디오를 파이프로 뽑으면 원본과 같아야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wav = os.path.join(tmpdir, "src.wav")
+            video = os.path.join(tmpdir, "v.mkv")
+            y, sr = make_wav(wav, count=2)
+
+            # 검은 화면 + 원본 오디오(float 그대로)로 된 작은 영상
+            subprocess.run(
+                [convert.ffmpeg_exe(), "-v", "error", "-y",
+                 "-f", "lavfi", "-i", "color=c=black:s=32x32:d=1", "-i", wav,
+                 "-map", "0:v", "-map", "1:a", "-c:a", "pcm_f32le", video],
+                check=True,
+            )
+
+            self.assertEqual(convert.probe_audio(video), (sr, 1))
+            got, got_sr = convert.extract_pcm(video, wav_path=os.path.join(tmpdir, "out.wav"))
+            saved, _ = sf.read(os.path.join(tmpdir, "out.wav"), dtype="float32")
+
+        self.assertEqual(got_sr, sr)
+        np.testing.assert_array_equal(got, y)
+        np.testing.assert_allclose(saved, y, atol=1e-4)
+
+    def test_stereo_grows_past_probed_duration(self):
+        """길이를 짧게 잘못 읽어도 늘려 가며 끝까지 채우고, 다채널은 (channels, samples) 여야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wav = os.path.join(tmpdir, "src.wav")
+            video = os.path.join(tmpdir, "v.mkv")
+            y = np.random.default_rng(0).uniform(-0.5, 0.5, (20000, 2)).astype(np.float32)
+            sf.write(wav, y, 16000, subtype="FLOAT")
+            subprocess.run(
+                [convert.ffmpeg_exe(), "-v", "error", "-y", "-i", wav, "-c:a", "pcm_f32le", video],
+                check=True,
+            )
+
+            real_probe = convert.probe_audio
+            with mock.patch.object(convert, "probe_audio",
+                                   lambda path, with_duration=False: real_probe(path)[:2] + (0.01,)):
+                got, got_sr = convert.extract_pcm(video, mono=False, block_size=4096)
+
+        self.assertEqual(got_sr, 16000)
+        np.testing.assert_array_equal(got, y.T)
+
+
+#   Batch Tests
+
+class TestBatch(unittest.TestCase):
+    def test_same_stem_and_stream_intermediate(self):
+        """이름만 같은 x.mkv / x.mov 는 결과 폴더가 따로고, 스트리밍 모드의 중간 WAV 는 남지 않아야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "input"))
+            wav = os.path.join(tmpdir, "src.wav")
+            make_wav(wav, count=3)
+            for name in ("x.mkv", "x.mov"):
+                subprocess.run(
+                    [convert.ffmpeg_exe(), "-v", "error", "-y",
+                     "-f", "lavfi", "-i", "color=c=black:s=32x32:d=1", "-i", wav,
+                     "-map", "0:v", "-map", "1:a", "-c:a", "pcm_s16le",
+                     os.path.join(tmpdir, "input", name)],
+                    check=True,
+                )
+
+            for name in ("x.mkv", "x.mov"):
+                self.assertGreater(batch.process_file(tmpdir, name, stream=True), 0)
+                out = batch.output_dir_for(tmpdir, name)
+                self.assertTrue(os.path.exists(os.path.join(out, "merged_no_silence.wav")))
+                self.assertFalse(os.path.exists(os.path.join(out, "audio.wav")))
+
+            self.assertNotEqual(batch.output_dir_for(tmpdir, "x.mkv"), batch.output_dir_for(tmpdir, "x.mov"))
+            self.assertEqual(sorted(os.listdir(os.path.join(tmpdir, "output"))), ["x.mkv", "x.mov"])
+
+    def test_worker_crash_only_fails_bad_file(self):
+        """워커가 죽어도 같이 돌던 파일은 다시 처리하고, 죽게 만든 파일 하나만 실패로 남아야 함"""
+        def fake_process(base_dir, filename, **kwargs):
+            if filename == "crash.mp4":
+                time.sleep(0.1)  # 다른 파일들이 돌고 있을 때 죽도록
+                os._exit(1)  # 디코더 segfault 흉내
+            os.makedirs(batch.output_dir_for(base_dir, filename), exist_ok=True)
+            time.sleep(0.2)
+            return 1
+
+        names = ["crash.mp4"] + [f"{i:02d}.mp4" for i in range(9)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # 워커는 fork 로 뜨므로 바꿔 둔 함수를 그대로 씀
+            with mock.patch.object(batch, "process_file", fake_process):
+                records = batch.run_batch(tmpdir, names, workers=3)
+
+        status = {r["file"]: r["status"] for r in records}
+        self.assertEqual(status.pop("crash.mp4"), "error")
+        self.assertEqual(set(status.values()), {"ok"})
+
+
+#   Stage Cache Tests
+
+class TestStageCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """용량을 넘으면 가장 오래 안 쓴 항목부터 지워져야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = cache.StageCache(tmpdir, max_bytes=10 ** 9)
+            data = np.zeros(10000, dtype=np.float32)
+            for i, name in enumerate(("a", "b", "c")):
+                store.put("s", name, x=data)
+                os.utime(store._path("s", name), ns=(i * 10 ** 9, i * 10 ** 9))
+
+            self.assertIsNotNone(store.get("s", "a"))  # a 를 사용 -> 가장 최근
+            one = os.path.getsize(store._path("s", "a"))
+            store.evict(one * 2)
+
+            self.assertIsNotNone(store.get("s", "a"))
+            self.assertIsNone(store.get("s", "b"))
+            self.assertIsNotNone(store.get("s", "c"))
+
+    def test_rerun_skips_upstream_stages(self):
+        """같은 영상이면 추출을 건너뛰고, VAD 설정만 바꾸면 구간 단계만 다시 계산해야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wav = os.path.join(tmpdir, "src.wav")
+            video = os.path.join(tmpdir, "v.mkv")
+            y, sr = make_wav(wav, count=3)
+            subprocess.run(
+                [convert.ffmpeg_exe(), "-v", "error", "-y", "-i", wav, "-c:a", "pcm_f32le", video],
+                check=True,
+            )
+
+            store = cache.StageCache(os.path.join(tmpdir, "cache"))
+            key, got, got_sr = cache.cached_pcm(store, video)
+            _, first = cache.cached_segments(store, key, got, got_sr)
+            self.assertEqual((store.hits, store.misses), (0, 2))
+
+            key2, again, _ = cache.cached_pcm(store, video)
+            _, second = cache.cached_segments(store, key2, again, got_sr)
+            self.assertEqual((store.hits, store.misses), (2, 2))
+            np.testing.assert_array_equal(again, got)
+            np.testing.assert_array_equal(second.intervals, first.intervals)
+            np.testing.assert_array_equal(second[0], first[0])
+
+            cache.cached_segments(store, key2, again, got_sr, vad.ThresholdVAD(top_db=30))
+            self.assertEqual((store.hits, store.misses), (2, 3))
+
+
+#   Profiling Tests
+
+class TestProfiling(unittest.TestCase):
+    def test_stage_records_and_aggregate(self):
+        prof = profiling.Profiler("a")
+        with prof.stage("load", bytes_in=100) as rec:
+            data = np.ones(1 << 20)
+            rec["bytes_out"] = data.nbytes
+        with self.assertRaises(ValueError):
+            with prof.stage("split"):
+                raise ValueError("x")
+
+        with prof.stage("convert") as rec:
+            # 자식 프로세스 CPU 시간도 그 단계 몫으로 들어가야 함
+            subprocess.run([sys.executable, "-c", "sum(range(3_000_000))"], check=True)
+
+        load, split, convert_rec = prof.stages
+        self.assertGreater(convert_rec["child_cpu_sec"], 0)
+        self.assertGreaterEqual(convert_rec["cpu_sec"], convert_rec["child_cpu_sec"])
+        if load["rss_delta"] is not None:
+            self.assertEqual(load["rss_delta"], load["rss_end"] - load["rss_start"])
+        self.assertEqual((load["stage"], load["bytes_in"], load["bytes_out"]), ("load", 100, data.nbytes))
+        self.assertGreaterEqual(load["wall_sec"], 0)
+        self.assertTrue(split["error"])
+
+        timed = prof.timed("save")(lambda x: x * 2)
+        self.assertEqual(timed(3), 6)
+
+        runs = [prof.to_dict(), prof.to_dict(), None]
+        stages = profiling.aggregate(runs)
+        self.assertEqual(set(stages), {"load", "split", "save", "convert"})
+        self.assertEqual(stages["load"]["count"], 2)
+        self.assertEqual(stages["load"]["bytes_out"], 2 * data.nbytes)
+        self.assertAlmostEqual(sum(a["share"] for a in stages.values()), 1.0)
+
+
+#   Bench Tests
+
+class TestBench(unittest.TestCase):
+    def test_fixture_matches_truth(self):
+        """블록 단위로 써도 같은 seed 면 같은 파일, 정답 구간 밖은 잡음 바닥만 있어야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a, b = os.path.join(tmpdir, "a.wav"), os.path.join(tmpdir, "b.wav")
+            truth = bench.make_fixture(a, 20, sr=8000, seed=4, block_sec=3.3)
+            again = bench.make_fixture(b, 20, sr=8000, seed=4, block_sec=3.3)
+            y, _ = sf.read(a, dtype="float32")
+
+        np.testing.assert_array_equal(truth, again)
+        self.assertEqual(len(y), 20 * 8000)
+        mask = np.zeros(len(y), dtype=bool)
+        for s, e in truth:
+            mask[s:e] = True
+        self.assertLess(np.abs(y[~mask]).max(), 0.01)
+        self.assertGreater(np.abs(y[mask]).mean(), 0.05)
+
+    def test_boundary_accuracy(self):
+        truth = np.array([[1000, 2000], [5000, 6000]])
+        perfect = bench.boundary_accuracy(truth, truth, 1000)
+        self.assertEqual((perfect["f1"], perfect["boundary_hit"]), (1.0, 1.0))
+
+        shifted = bench.boundary_accuracy(truth + 100, truth, 1000, tolerance_sec=0.05)
+        self.assertAlmostEqual(shifted["precision"], 0.9)
+        self.assertEqual(shifted["boundary_hit"], 0.0)
+        self.assertAlmostEqual(shifted["onset_ms_p50"], 100.0)
+
+    def test_compare_results(self):
+        def row(rate, f1):
+            return {"seconds": 60, "sr": 16000, "engine": "default", "split": {"audio_sec_per_sec": rate},
+                    "accuracy": {"f1": f1}}
+
+        self.assertEqual(bench.compare_results([row(100, 0.9)], [row(90, 0.89)]), [])
+        self.assertEqual(len(bench.compare_results([row(100, 0.9)], [row(50, 0.8)])), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,275 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import librosa
+
+# 로그 계산용 아주 작은 값 (완전 무음에서 log 0 방지, process.AMIN 과 같은 값)
+AMIN = 1e-10
+
+
+def _db(power):
+    return 10.0 * np.log10(np.maximum(power, AMIN))
+
+
+def _runs(mask):
+    """
+    bool 배열에서 True 가 이어지는 구간들의 [start, end) 인덱스, (N, 2) int64
+    """
+    if not len(mask):
+        return np.empty((0, 2), dtype=np.int64)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return edges.reshape(-1, 2).astype(np.int64)
+
+
+def merge_intervals(intervals, gap=0):
+    """
+    정렬된 (N, 2) 구간들 중 사이 간격이 gap 샘플 이하인 것끼리 합침 (겹치는 구간 포함)
+    """
+    intervals = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    if len(intervals) <= 1:
+        return intervals
+
+    # 지금까지의 최대 끝 위치보다 gap 이상 떨어져서 시작하면 새 구간
+    ends = np.maximum.accumulate(intervals[:, 1])
+    new = np.concatenate(([True], intervals[1:, 0] - ends[:-1] > gap))
+
+    starts = intervals[new, 0]
+    stops = np.maximum.reduceat(intervals[:, 1], np.flatnonzero(new))
+    return np.stack([starts, stops], axis=1)
+
+
+def postprocess(intervals, sr, samples, pad_sec=0.0, merge_gap_sec=0.0, min_sec=0.0, max_sec=None):
+    """
+    구간 다듬기 (전부 배열 연산)
+    - pad_sec : 앞뒤로 늘릴 길이 (말 끝이 잘리지 않도록)
+    - merge_gap_sec : 이 길이 이하로 떨어진 구간은 하나로 합침
+    - min_sec : 이 길이 이하인 구간은 버림 (wav_del_space 의 0.1초 규칙)
+    - max_sec : 주면 이보다 긴 구간을 같은 길이로 나눔
+    """
+    intervals = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    if not len(intervals):
+        return intervals
+
+    pad = int(round(pad_sec * sr))
+    if pad:
+        intervals = np.stack([np.maximum(intervals[:, 0] - pad, 0),
+                              np.minimum(intervals[:, 1] + pad, samples)], axis=1)
+
+    intervals = merge_intervals(intervals, int(round(merge_gap_sec * sr)))
+    intervals = intervals[(intervals[:, 1] - intervals[:, 0]) > sr * min_sec]
+
+    if max_sec and len(intervals):
+        limit = int(max_sec * sr)
+        pieces = []
+        for start, end in intervals.tolist():
+            count = -(-(end - start) // limit)
+            bounds = np.linspace(start, end, count + 1).astype(np.int64)
+            pieces.append(np.stack([bounds[:-1], bounds[1:]], axis=1))
+        intervals = np.concatenate(pieces)
+
+    return intervals
+
+
+class ThresholdVAD:
+    """
+    전역 임계값 하나로 판정하는 기본 엔진 (wav_del_space 의 기존 규칙과 동일)
+    - 최대 에너지 프레임 기준 top_db 아래면 무음
+    """
+
+    def __init__(self, top_db=20, frame_length=1024, hop_length=256,
+                 pad_sec=0.0, merge_gap_sec=0.0, min_sec=0.1, max_sec=None):
+        self.top_db = top_db
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.pad_sec = pad_sec
+        self.merge_gap_sec = merge_gap_sec
+        self.min_sec = min_sec
+        self.max_sec = max_sec
+
+    def detect(self, y, sr):
+        """
+        소리 구간의 [start, end) 샘플 위치, (N, 2) int64
+        """
+        if len(y) == 0:
+            return np.empty((0, 2), dtype=np.int64)
+
+        intervals = librosa.effects.split(
+            y,
+            top_db=self.top_db,
+            frame_length=self.frame_length,
+            hop_length=self.hop_length
+        )
+        return postprocess(intervals, sr, len(y), self.pad_sec, self.merge_gap_sec,
+                           self.min_sec, self.max_sec)
+
+
+class AdaptiveVAD:
+    """
+    2단계 음성 구간 검출 엔진
+
+    1) 거친 패스 : coarse_sec 길이 블록의 평균 에너지만 계산 (reshape 한 번, 매우 쌈)
+       - 잡음 바닥(noise floor)은 floor_window_sec 마다 하위 floor_percentile 백분위수로 따로 잡음
+         (에어컨이 켜졌다 꺼지는 녹음처럼 배경 소음이 바뀌어도 따라감)
+       - 바닥보다 coarse_margin_db 이상 큰 블록과 그 이웃만 후보 구간
+    2) 세밀한 패스 : 후보 구간에서만 frame_length / hop_length 프레임으로
+       - 에너지 : 그 위치 잡음 바닥보다 snr_db 이상 커야 함
+       - 스펙트럼 평탄도(flatness) + 영교차율(ZCR) : 둘 다 높으면 잡음(바람, 치찰 노이즈)으로 보고 제외
+    3) pad / merge / min / max 규칙으로 구간 정리 (postprocess)
+
+    - 무음이 많은 녹음일수록 세밀한 패스를 건너뛰는 구간이 많아져서 빨라짐
+    - pad_sec 를 주면 그만큼 경계가 넓어짐 (말 끝 잘림이 더 신경 쓰일 때만)
+    - ThresholdVAD 와의 속도 / 경계 정확도 비교는 bench.py (--engines default adaptive) 로 확인
+
+    self.last_stats 에 마지막 detect 의 후보 비율 등이 남음 (튜닝용)
+    """
+
+    def __init__(self, frame_length=1024, hop_length=256, coarse_sec=0.1,
+                 floor_window_sec=5.0, floor_percentile=10, coarse_margin_db=3.0,
+                 snr_db=6.0, flatness_max=0.4, zcr_max=0.3,
+                 pad_sec=0.0, merge_gap_sec=0.2, min_sec=0.1, max_sec=None,
+                 chunk_frames=4096):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.coarse_sec = coarse_sec
+        self.floor_window_sec = floor_window_sec
+        self.floor_percentile = floor_percentile
+        self.coarse_margin_db = coarse_margin_db
+        self.snr_db = snr_db
+        self.flatness_max = flatness_max
+        self.zcr_max = zcr_max
+        self.pad_sec = pad_sec
+        self.merge_gap_sec = merge_gap_sec
+        self.min_sec = min_sec
+        self.max_sec = max_sec
+        self.chunk_frames = chunk_frames
+        self.last_stats = {}
+
+    # ------------------- 공개 API -------------------
+
+    def detect(self, y, sr):
+        """
+        소리 구간의 [start, end) 샘플 위치, (N, 2) int64
+        """
+        n = len(y)
+        if n == 0:
+            self.last_stats = {"frames": 0, "analyzed_frames": 0, "candidate_ratio": 0.0}
+            return np.empty((0, 2), dtype=np.int64)
+
+        block = max(self.hop_length, int(self.coarse_sec * sr))
+        coarse_db, floor_db = self._coarse(y, sr, block)
+
+        # 후보 블록 + 앞뒤 한 블록 (말 시작/끝이 블록 경계에 걸리는 경우)
+        candidate = coarse_db > floor_db + self.coarse_margin_db
+        candidate[1:] |= candidate[:-1].copy()
+        candidate[:-1] |= candidate[1:].copy()
+
+        total_frames = max(1, 1 + (n - self.frame_length) // self.hop_length)
+        analyzed = 0
+        found = []
+
+        for b0, b1 in _runs(candidate).tolist():
+            start = b0 * block
+            end = min(b1 * block + self.frame_length, n)
+            voiced, frames = self._fine(y[start:end], sr, floor_db, start, block)
+            analyzed += frames
+
+            runs = _runs(voiced)
+            if len(runs):
+                # 프레임 k 는 [k*hop, k*hop + frame_length) 를 봄 (hop 격자에 맞춘 경계)
+                # - 켜질 때: 소리가 프레임의 마지막 hop 칸에 막 들어온 때 -> k*hop + frame_length - hop
+                # - 꺼질 때: 마지막으로 켜진 프레임의 첫 hop 칸까지 소리 -> k*hop + hop
+                # (프레임 중심으로 잡으면 양쪽 경계가 (frame_length - hop)/2 만큼 넓어짐)
+                hop = self.hop_length
+                onset = np.minimum(start + runs[:, 0] * hop + self.frame_length - hop, n)
+                offset = np.minimum(start + (runs[:, 1] - 1) * hop + hop, n)
+                # 프레임 1~2 개짜리 짧은 구간은 길이 0 (postprocess 의 min_sec 에서 버려짐)
+                found.append(np.stack([onset, np.maximum(offset, onset)], axis=1))
+
+        intervals = np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+
+        self.last_stats = {
+            "frames": total_frames,
+            "analyzed_frames": analyzed,
+            "candidate_ratio": analyzed / total_frames,
+        }
+        return postprocess(intervals, sr, n, self.pad_sec, self.merge_gap_sec, self.min_sec, self.max_sec)
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _coarse(self, y, sr, block):
+        """
+        블록별 평균 에너지(dB)와 그 위치의 잡음 바닥(dB)
+        """
+        count = len(y) // block
+        body = y[:count * block].reshape(count, block) if count else np.empty((0, block), dtype=y.dtype)
+        power = np.einsum("ij,ij->i", body, body) / block
+        if len(y) > count * block:
+            tail = y[count * block:]
+            power = np.append(power, np.dot(tail, tail) / len(tail))
+        coarse_db = _db(power)
+
+        # floor_window 마다 하위 백분위수 -> 블록마다 자기 창의 바닥 값
+        window = max(1, int(self.floor_window_sec * sr) // block)
+        # (마지막 창이 모자라면 끝 값을 반복해서 채움)
+        pad = (-len(coarse_db)) % window
+        padded = np.pad(coarse_db, (0, pad), mode="edge")
+        floors = np.percentile(padded.reshape(-1, window), self.floor_percentile, axis=1)
+        floor_db = np.repeat(floors, window)[:len(coarse_db)]
+
+        return coarse_db, floor_db
+
+    def _fine(self, region, sr, floor_db, offset, block):
+        """
+        후보 구간 안의 프레임별 음성 여부 (bool 배열), 분석한 프레임 수
+        """
+        fl, hop = self.frame_length, self.hop_length
+        if len(region) < fl:
+            region = np.pad(region, (0, fl - len(region)))
+
+        frames = sliding_window_view(region, fl)[::hop]  # 복사 없는 뷰
+        count = len(frames)
+        window = np.hanning(fl).astype(np.float32)
+        voiced = np.zeros(count, dtype=bool)
+
+        # 프레임 위치 -> 그 위치의 잡음 바닥
+        frame_blocks = np.minimum((offset + np.arange(count) * hop + fl // 2) // block, len(floor_db) - 1)
+        floor = floor_db[frame_blocks]
+
+        for c0 in range(0, count, self.chunk_frames):
+            chunk = frames[c0:c0 + self.chunk_frames]
+
+            energy_db = _db(np.einsum("ij,ij->i", chunk, chunk) / fl)
+            loud = energy_db > floor[c0:c0 + len(chunk)] + self.snr_db
+            if not loud.any():
+                continue
+
+            # 큰 프레임만 스펙트럼 계산 (여기가 가장 비싼 부분)
+            idx = np.flatnonzero(loud)
+            sel = chunk[idx]
+            spec = np.abs(np.fft.rfft(sel * window, axis=1)) ** 2 + AMIN
+            flatness = np.exp(np.mean(np.log(spec), axis=1)) / np.mean(spec, axis=1)
+            zcr = np.mean(np.signbit(sel[:, 1:]) != np.signbit(sel[:, :-1]), axis=1)
+
+            noisy = (flatness >= self.flatness_max) & (zcr >= self.zcr_max)
+            voiced[c0 + idx[~noisy]] = True
+
+        return voiced, count
+
+
+# 이름으로 고를 수 있는 엔진 목록 (직접 만든 엔진은 detect(y, sr) 만 있으면 됨)
+ENGINES = {
+    "threshold": ThresholdVAD,
+    "adaptive": AdaptiveVAD,
+}
+
+
+def get_vad(engine="threshold", **kwargs):
+    """
+    엔진 이름(ENGINES) 이나 detect(y, sr) 를 가진 객체를 받아서 엔진 객체를 돌려줌
+    """
+    if isinstance(engine, str):
+        if engine not in ENGINES:
+            raise ValueError(f"[get_vad] unknown engine {engine!r}, choose from {sorted(ENGINES)}")
+        return ENGINES[engine](**kwargs)
+    if not hasattr(engine, "detect"):
+        raise TypeError("[get_vad] engine must have a detect(y, sr) method")
+    return engine
@@ -0,0 +1,315 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image
+
+from src.load_image import load_image
+from src.save_image import save_image
+from src.blur import blur
+from src.flip_horizontal import flip_horizontal
+from src.flip_vertical import flip_vertical
+from src.crop import crop_image
+
+# 입력으로 찾을 확장자
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp", ".tif", ".tiff")
+
+# 출력 형식 -> (PIL 형식 이름, 확장자)
+FORMATS = {
+    "jpg": ("JPEG", ".jpg"),
+    "jpeg": ("JPEG", ".jpg"),
+    "png": ("PNG", ".png"),
+    "webp": ("WEBP", ".webp"),
+    "bmp": ("BMP", ".bmp"),
+}
+
+# 작업 이름 -> (함수, 인자 개수 목록)
+# 인자는 정수만 (예: blur:5, crop:10,10,200,200)
+OPS = {
+    "blur": (lambda img, ksize=5: blur(img, ksize=ksize), (0, 1)),
+    "crop": (lambda img, x1, y1, x2, y2: crop_image(img, (x1, y1, x2, y2)), (4,)),
+    "flip_h": (flip_horizontal, (0,)),
+    "flip_v": (flip_vertical, (0,)),
+}
+
+
+def parse_ops(specs):
+    """
+    "이름" 또는 "이름:인자,인자" 문자열 목록 -> [(이름, (인자, ...)), ...]
+    예: ["flip_h", "blur:5", "crop:0,0,800,600"]
+    """
+    ops = []
+    for spec in specs:
+        name, _, args = spec.strip().partition(":")
+        if name not in OPS:
+            raise ValueError(f"[parse_ops] unknown op {name!r}, choose from {sorted(OPS)}")
+        try:
+            values = tuple(int(v) for v in args.split(",")) if args else ()
+        except ValueError:
+            raise ValueError(f"[parse_ops] op arguments must be integers: {spec!r}")
+        if len(values) not in OPS[name][1]:
+            raise ValueError(f"[parse_ops] {name} takes {' or '.join(map(str, OPS[name][1]))} arguments: {spec!r}")
+        ops.append((name, values))
+    return ops
+
+
+def apply_ops(img, ops):
+    for name, args in ops:
+        img = OPS[name][0](img, *args)
+    return img
+
+
+def find_inputs(source, exts=IMAGE_EXTS):
+    """
+    폴더(하위 폴더 포함) 또는 glob 패턴 -> (기준 폴더, [상대 경로, ...])
+    출력 폴더에는 기준 폴더 아래의 폴더 구조를 그대로 만듦
+    """
+    if os.path.isdir(source):
+        root = source
+        paths = []
+        for folder, _, names in os.walk(source):
+            paths.extend(os.path.join(folder, n) for n in names if n.lower().endswith(exts))
+    else:
+        paths = [p for p in glob.glob(source, recursive=True)
+                 if p.lower().endswith(exts) and os.path.isfile(p)]
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else "."
+        paths = [os.path.abspath(p) for p in paths]
+
+    return root, sorted(os.path.relpath(p, root) for p in paths)
+
+
+def output_path_for(output_dir, rel_path, fmt="same"):
+    base, ext = os.path.splitext(rel_path)
+    if fmt != "same":
+        ext = FORMATS[fmt][1]
+    return os.path.join(output_dir, base + ext)
+
+
+def is_done(src, dst):
+    # 결과 파일이 있고 원본보다 나중에 만들어졌으면 끝난 것으로 봄 (원본이 바뀌면 다시 처리)
+    try:
+        return os.path.getmtime(dst) >= os.path.getmtime(src)
+    except OSError:
+        return False
+
+
+def process_one(src, dst, ops, fmt="same", quality=90):
+    """
+    이미지 하나: load -> ops -> 저장 (임시 파일에 쓰고 이름 바꿈, 중간에 죽어도 반쪽 파일이 안 남음)
+    반환: (읽은 bytes, 쓴 bytes)
+    """
+    img = apply_ops(load_image(src), ops)
+
+    options = {}
+    if fmt != "same":
+        options["format"] = FORMATS[fmt][0]
+    else:
+        # 임시 파일 이름으로는 형식을 알 수 없어서 원래 확장자로 정함
+        options["format"] = Image.registered_extensions().get(os.path.splitext(dst)[1].lower(), "PNG")
+    if options["format"] in ("JPEG", "WEBP"):
+        options["quality"] = quality
+
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        save_image(img, tmp, verbose=False, **options)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return os.path.getsize(src), os.path.getsize(dst)
+
+
+def process_chunk(input_dir, output_dir, rel_paths, ops, fmt="same", quality=90, force=False, since=None):
+    """
+    파일 여러 개를 한 번에 처리 (프로세스 간 주고받는 횟수를 줄이려고 묶어서 보냄)
+    파일 하나가 실패해도 나머지는 계속, 결과는 개수/크기 합과 실패 목록만 돌려줌
+    - since : 이 시각 이후에 만들어진 결과는 이번 실행에서 처리한 것으로 셈
+      (워커가 죽어서 다시 돌리는 묶음에서, 죽기 전에 끝낸 파일을 건너뜀 대신 완료로)
+    """
+    stats = {"ok": 0, "skipped": 0, "error": 0, "bytes_in": 0, "bytes_out": 0, "errors": []}
+    for rel in rel_paths:
+        src = os.path.join(input_dir, rel)
+        dst = output_path_for(output_dir, rel, fmt)
+        if since is not None and is_done(src, dst) and os.path.getmtime(dst) >= since:
+            stats["ok"] += 1
+            stats["bytes_in"] += os.path.getsize(src)
+            stats["bytes_out"] += os.path.getsize(dst)
+            continue
+        if not force and is_done(src, dst):
+            stats["skipped"] += 1
+            continue
+        try:
+            read, written = process_one(src, dst, ops, fmt, quality)
+        except Exception as e:
+            stats["error"] += 1
+            stats["errors"].append({"file": rel, "error": f"{type(e).__name__}: {e}"})
+            continue
+        stats["ok"] += 1
+        stats["bytes_in"] += read
+        stats["bytes_out"] += written
+    return stats
+
+
+def _merge(total, stats):
+    for key in ("ok", "skipped", "error", "bytes_in", "bytes_out"):
+        total[key] += stats[key]
+    total["errors"].extend(stats["errors"])
+
+
+def run_batch(input_dir, output_dir, rel_paths, ops, fmt="same", quality=90, force=False,
+              workers=None, chunk_size=64, progress_every=5.0):
+    """
+    여러 이미지를 프로세스 풀로 나눠서 처리 (audio/batch.py 와 같은 방식)
+    - chunk_size 개씩 묶어서 작업 하나로, 진행 중인 묶음은 workers * 2 개까지만
+    - 워커 프로세스가 통째로 죽으면(이상한 파일 하나로 segfault / OOM 등) 풀을 새로 만들고
+      결과를 못 받은 묶음은 하나씩 따로 다시 돌림, 혼자 돌다 또 죽은 묶음은 반으로 나눠서 다시
+      -> 결국 죽게 만든 파일 하나만 실패로 기록됨
+    - workers 가 1 이하면 현재 프로세스에서 차례로 처리
+    - progress_every 초마다 처리량 출력
+    반환: 요약 dict
+    """
+    total = {"total": len(rel_paths), "ok": 0, "skipped": 0, "error": 0,
+             "bytes_in": 0, "bytes_out": 0, "errors": []}
+    chunks = [rel_paths[i:i + chunk_size] for i in range(0, len(rel_paths), chunk_size)]
+    t0 = time.perf_counter()
+    last = [t0]
+
+    def report(stats):
+        _merge(total, stats)
+        now = time.perf_counter()
+        if now - last[0] >= progress_every:
+            last[0] = now
+            _print_progress(total, now - t0)
+
+    args = (ops, fmt, quality, force)
+
+    if workers is not None and workers <= 1:
+        for chunk in chunks:
+            report(process_chunk(input_dir, output_dir, chunk, *args))
+    else:
+        workers = workers or os.cpu_count() or 1
+        max_pending = workers * 2
+        queue = list(reversed(chunks))
+        # 워커가 죽을 때 같이 돌던 묶음 (어느 쪽이 원인인지 모르므로 하나씩 따로 돌림)
+        suspects = deque()
+        since = time.time()
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending = {}
+
+        try:
+            while queue or pending or suspects:
+                if suspects:
+                    if not pending:
+                        chunk = suspects.popleft()
+                        pending[executor.submit(process_chunk, input_dir, output_dir, chunk, *args,
+                                                since=since)] = chunk
+                else:
+                    while queue and len(pending) < max_pending:
+                        chunk = queue.pop()
+                        pending[executor.submit(process_chunk, input_dir, output_dir, chunk, *args)] = chunk
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                if not any(isinstance(fut.exception(), BrokenProcessPool) for fut in finished):
+                    for fut in finished:
+                        _collect(fut, pending.pop(fut), report)
+                    continue
+
+                # 풀이 깨지면 남은 작업도 곧 전부 끝나므로 다 기다려서 결과가 있는 것은 살림
+                wait(pending)
+                lost = []
+                for fut, chunk in pending.items():
+                    if isinstance(fut.exception(), BrokenProcessPool):
+                        lost.append(chunk)
+                    else:
+                        _collect(fut, chunk, report)
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=workers)
+
+                if len(lost) == 1 and len(lost[0]) == 1:
+                    report(_failed(lost[0], "워커 프로세스 종료"))
+                elif len(lost) == 1:
+                    # 혼자 돌다 죽은 묶음 -> 반으로 나눠서 다시 (범인이 한 파일로 좁혀질 때까지)
+                    half = len(lost[0]) // 2
+                    suspects.extendleft([lost[0][half:], lost[0][:half]])
+                else:
+                    suspects.extend(lost)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - t0
+    total["elapsed_sec"] = elapsed
+    total["images_per_sec"] = total["ok"] / elapsed if elapsed > 0 else 0.0
+    total["mb_per_sec"] = total["bytes_in"] / 2**20 / elapsed if elapsed > 0 else 0.0
+    return total
+
+
+def _print_progress(total, elapsed):
+    done = total["ok"] + total["skipped"] + total["error"]
+    rate = total["ok"] / elapsed if elapsed > 0 else 0.0
+    print(f"[{done}/{total['total']}] 완료 {total['ok']} / 건너뜀 {total['skipped']} "
+          f"/ 실패 {total['error']} ({rate:.1f}장/초)")
+
+
+def _collect(fut, chunk, report):
+    # 끝난 묶음 하나의 결과를 반영 (작업 자체가 예외를 던졌으면 묶음 전체를 실패로)
+    try:
+        report(fut.result())
+    except Exception as e:
+        report(_failed(chunk, f"{type(e).__name__}: {e}"))
+
+
+def _failed(chunk, message):
+    return {"ok": 0, "skipped": 0, "error": len(chunk), "bytes_in": 0, "bytes_out": 0,
+            "errors": [{"file": rel, "error": message} for rel in chunk]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GUI 없이 이미지 여러 장에 같은 작업을 적용")
+    parser.add_argument("source", help="입력 폴더 또는 glob 패턴 (예: 'photos/**/*.jpg')")
+    parser.add_argument("output_dir", help="결과 폴더 (입력 폴더 구조를 그대로 만듦)")
+    parser.add_argument("--ops", nargs="+", default=[],
+                        help=f"차례로 적용할 작업 ({', '.join(sorted(OPS))}), 예: flip_h blur:5 crop:0,0,800,600")
+    parser.add_argument("--format", choices=["same"] + sorted(FORMATS), default="same", help="출력 형식")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG / WEBP 품질 (1~100)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수, 1 이면 순차 처리)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="프로세스에 한 번에 넘길 파일 수")
+    parser.add_argument("--force", action="store_true", help="이미 처리된 파일도 다시 처리")
+    parser.add_argument("--summary", default=None, help="요약 JSON 경로")
+    args = parser.parse_args(argv)
+
+    try:
+        ops = parse_ops(args.ops)
+    except ValueError as e:
+        parser.error(str(e))
+
+    input_dir, rel_paths = find_inputs(args.source)
+    print(f"입력 {len(rel_paths)}개 ({input_dir}) / 작업: {' -> '.join(args.ops) or '(변환만)'}")
+
+    summary = run_batch(input_dir, args.output_dir, rel_paths, ops, args.format, args.quality,
+                        args.force, args.workers, args.chunk_size)
+
+    print(f"완료 {summary['ok']}개 / 건너뜀 {summary['skipped']}개 / 실패 {summary['error']}개 "
+          f"({summary['elapsed_sec']:.1f}초, {summary['images_per_sec']:.1f}장/초, {summary['mb_per_sec']:.1f}MB/초)")
+    for err in summary["errors"][:20]:
+        print(f"  실패: {err['file']} - {err['error']}")
+    if len(summary["errors"]) > 20:
+        print(f"  ... 외 {len(summary['errors']) - 20}개")
+
+    if args.summary:
+        os.makedirs(os.path.dirname(args.summary) or ".", exist_ok=True)
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"요약 저장: {args.summary}")
+
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
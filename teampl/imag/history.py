@@ -0,0 +1,221 @@
+import os
+import uuid
+from PIL import Image
+
+from src.flip_horizontal import flip_horizontal
+from src.flip_vertical import flip_vertical
+
+
+def image_bytes(img):
+    # PIL 이미지가 메모리에서 차지하는 대략적인 크기 (가로 x 세로 x 채널 수)
+    return img.width * img.height * len(img.getbands())
+
+
+# ------------------- 기록 항목 -------------------
+# 항목마다 apply(img) -> (되돌린 이미지, 반대 방향 항목)
+# undo 에서 꺼낸 항목의 반대 항목이 redo 로, redo 에서 꺼낸 항목의 반대 항목이 다시 undo 로 감
+
+class PatchEntry:
+    """
+    이미지 일부(box)만 바뀌는 작업 (드래그 blur 등) : 바뀌기 전 box 영역만 저장
+    """
+
+    def __init__(self, box, patch):
+        self.box = box
+        self.patch = patch
+        self.nbytes = image_bytes(patch)
+
+    def apply(self, img):
+        current = img.crop(self.box)
+        img.paste(self.patch, self.box[:2])
+        return img, PatchEntry(self.box, current)
+
+
+class OpEntry:
+    """
+    픽셀 없이 되돌릴 수 있는 작업 (좌우/상하 반전은 한 번 더 하면 원래대로)
+    """
+
+    INVERSE = {
+        "flip_h": flip_horizontal,
+        "flip_v": flip_vertical,
+    }
+
+    nbytes = 0
+
+    def __init__(self, op):
+        if op not in self.INVERSE:
+            raise ValueError(f"[OpEntry] unknown op {op!r}, choose from {sorted(self.INVERSE)}")
+        self.op = op
+
+    def apply(self, img):
+        return self.INVERSE[self.op](img), self
+
+
+class SnapshotEntry:
+    """
+    크기가 바뀌거나 전체가 바뀌는 작업 (crop, 전체 blur) : 이미지 전체를 저장
+    """
+
+    def __init__(self, img):
+        self.img = img
+        self.nbytes = image_bytes(img)
+
+    def apply(self, img):
+        return self.img, SnapshotEntry(img)
+
+
+class SpilledEntry:
+    """
+    디스크로 내려 보낸 PatchEntry / SnapshotEntry (PNG 로 무손실 압축)
+    메모리 예산에는 들어가지 않고, 되돌릴 때 읽어서 원래 항목으로 복원
+    """
+
+    nbytes = 0
+
+    def __init__(self, entry, folder):
+        self.path = os.path.join(folder, f"undo_{uuid.uuid4().hex}.png")
+        self.box = entry.box if isinstance(entry, PatchEntry) else None
+        image = entry.patch if isinstance(entry, PatchEntry) else entry.img
+        image.save(self.path, compress_level=1)
+        self.disk_bytes = os.path.getsize(self.path)
+
+    def load(self):
+        with Image.open(self.path) as f:
+            image = f.copy()
+        self.discard()
+        return PatchEntry(self.box, image) if self.box is not None else SnapshotEntry(image)
+
+    def apply(self, img):
+        return self.load().apply(img)
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class History:
+    """
+    Undo / Redo 기록
+    - 부분 작업은 바뀐 영역만, 반전은 작업 이름만, 나머지는 전체 이미지를 저장
+    - 메모리에 있는 기록 합이 budget_bytes 를 넘으면 가장 오래된 것부터
+      spill_dir 가 있으면 디스크(PNG) 로 내리고, 없으면 버림
+    - disk_budget_bytes 를 주면 디스크 쪽도 오래된 것부터 버림
+    - 새 작업을 기록하면 redo 기록은 지워짐
+    """
+
+    def __init__(self, budget_bytes=512 * 2**20, spill_dir=None, disk_budget_bytes=None):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.disk_budget_bytes = disk_budget_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    # ------------------- 공개 API -------------------
+
+    def push_patch(self, img, box):
+        """
+        img 의 box 영역을 바꾸기 직전에 호출
+        """
+        self._push(PatchEntry(box, img.crop(box)))
+
+    def push_op(self, op):
+        """
+        되돌릴 때 같은 작업을 한 번 더 하면 되는 작업 ("flip_h", "flip_v")
+        """
+        self._push(OpEntry(op))
+
+    def push_snapshot(self, img, copy=True):
+        """
+        이미지 전체를 기록
+        - 작업이 새 이미지를 돌려주고 img 자체는 더 이상 고치지 않으면 copy=False 로 복사를 아낌
+        """
+        self._push(SnapshotEntry(img.copy() if copy else img))
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self, img):
+        """
+        가장 최근 작업을 되돌린 이미지를 돌려줌 (부분 작업은 img 를 직접 고침)
+        """
+        if not self.undo_stack:
+            raise IndexError("[History.undo] 되돌릴 작업이 없습니다.")
+        img, inverse = self.undo_stack.pop().apply(img)
+        self.redo_stack.append(inverse)
+        self._enforce_budget()
+        return img
+
+    def redo(self, img):
+        if not self.redo_stack:
+            raise IndexError("[History.redo] 다시 할 작업이 없습니다.")
+        img, inverse = self.redo_stack.pop().apply(img)
+        self.undo_stack.append(inverse)
+        self._enforce_budget()
+        return img
+
+    def memory_bytes(self):
+        return sum(e.nbytes for e in self.undo_stack) + sum(e.nbytes for e in self.redo_stack)
+
+    def disk_bytes(self):
+        return sum(e.disk_bytes for e in self.undo_stack + self.redo_stack if isinstance(e, SpilledEntry))
+
+    def clear(self):
+        for entry in self.undo_stack + self.redo_stack:
+            if isinstance(entry, SpilledEntry):
+                entry.discard()
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _push(self, entry):
+        for old in self.redo_stack:
+            if isinstance(old, SpilledEntry):
+                old.discard()
+        self.redo_stack.clear()
+        self.undo_stack.append(entry)
+        self._enforce_budget()
+
+    def _oldest(self):
+        # 지울/내릴 순서: 가장 오래된 undo 부터, 그다음 가장 먼 redo 부터 (목록, 위치)
+        # (양 끝에서부터라서 남은 기록은 항상 현재 상태와 이어짐)
+        order = [(self.undo_stack, i) for i in range(len(self.undo_stack))]
+        order += [(self.redo_stack, i) for i in range(len(self.redo_stack))]
+        return order
+
+    def _enforce_budget(self):
+        used = self.memory_bytes()
+        if used > self.budget_bytes:
+            if self.spill_dir:
+                # 오래된 것부터 디스크로 (기록 순서는 그대로 유지)
+                for stack, i in self._oldest():
+                    if used <= self.budget_bytes:
+                        break
+                    entry = stack[i]
+                    if entry.nbytes:
+                        stack[i] = SpilledEntry(entry, self.spill_dir)
+                        used -= entry.nbytes
+            else:
+                # 가장 오래된 undo 부터, 그래도 넘으면 가장 먼 redo 부터 버림
+                while used > self.budget_bytes and self.undo_stack:
+                    used -= self.undo_stack.pop(0).nbytes
+                while used > self.budget_bytes and self.redo_stack:
+                    used -= self.redo_stack.pop(0).nbytes
+
+        if self.disk_budget_bytes is not None:
+            disk = self.disk_bytes()
+            while disk > self.disk_budget_bytes:
+                stack = self.undo_stack if any(isinstance(e, SpilledEntry) for e in self.undo_stack) \
+                    else self.redo_stack
+                entry = stack.pop(0)
+                if isinstance(entry, SpilledEntry):
+                    entry.discard()
+                    disk -= entry.disk_bytes
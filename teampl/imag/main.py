@@ -1,4 +1,6 @@
 # main.py
+import atexit
+import tempfile
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import ImageTk
@@ -9,6 +11,11 @@ from src.blur import blur
 from src.flip_horizontal import flip_horizontal
 from src.flip_vertical import flip_vertical
 from src.crop import crop_image
+from src.history import History
+from src.preview import Pyramid, ViewTransform, Worker, quick_preview
+
+# 워커 결과를 확인하는 간격 (ms)
+POLL_MS = 30
 
 
 class ImageToolApp:
@@ -17,12 +24,25 @@ class ImageToolApp:
         self.root.title("Image Tool - Blur / Crop / Flip / Undo")
 
         # 현재 이미지
+        # - img, pyramid : 원본 해상도, 워커 스레드에서만 다룸 (열기/편집/저장 모두 워커 작업으로)
+        # - display, view : 화면에 보이는 축소본과 캔버스 <-> 원본 좌표 변환, 메인 스레드에서만 다룸
         self.img = None
+        self.pyramid = None
+        self.img_size = None
+        self.display = None
+        self.view = None
         self.tk_img = None
         self.image_id = None
+        self.resize_job = None
+
+        # 원본 해상도 작업은 백그라운드 스레드 하나에서 순서대로 (화면은 축소본으로 먼저 바뀜)
+        self.worker = Worker(on_error=self.on_worker_error)
 
-        # Undo 히스토리
-        self.history = []
+        # Undo / Redo 히스토리
+        # (드래그 blur 는 바뀐 영역만, 반전은 작업 이름만 저장, 메모리 512MB 를 넘으면 오래된 것부터 임시 폴더로)
+        self.spill_dir = tempfile.TemporaryDirectory(prefix="imagetool_undo_")
+        atexit.register(self.spill_dir.cleanup)
+        self.history = History(budget_bytes=512 * 2**20, spill_dir=self.spill_dir.name)
 
         # 드래그를 위한 코드
         self.start_x = None
@@ -39,6 +59,9 @@ class ImageToolApp:
         tk.Button(top, text="이미지 열기", command=self.open_image).pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(top, text="이미지 저장", command=self.save_current_image).pack(side=tk.LEFT, padx=5, pady=5)
 
+        self.status_label = tk.Label(top, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
         # 상단 버튼들 기능구현 코드
         func = tk.Frame(self.root)
         func.pack(side=tk.TOP, fill=tk.X)
@@ -51,43 +74,149 @@ class ImageToolApp:
         tk.Button(func, text="드래그 자르기 (Crop 모드)", command=self.enable_drag_crop).pack(side=tk.LEFT, padx=5, pady=5)
 
         tk.Button(func, text="되돌리기 (Undo)", command=self.undo).pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(func, text="다시 하기 (Redo)", command=self.redo).pack(side=tk.LEFT, padx=5, pady=5)
 
         self.mode_label = tk.Label(func, text="현재 모드: Blur (드래그 시 해당 영역만 블러)")
         self.mode_label.pack(side=tk.LEFT, padx=10)
 
-        # 이미지 작업할 캔버스
-        self.canvas = tk.Canvas(self.root, bg="gray")
+        # 이미지 작업할 캔버스 (창 크기를 따라가고, 이미지는 캔버스에 맞춰 줄여서 보여줌)
+        self.canvas = tk.Canvas(self.root, bg="gray", width=1000, height=700)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # 마우스 이벤트
         self.canvas.bind("<ButtonPress-1>", self.on_mouse_down)
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
+        self.canvas.bind("<Configure>", self.on_resize)
 
-    # 공통
-    def update_canvas(self):
-        if self.img is None:
-            return
+        # 단축키
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
 
-        self.tk_img = ImageTk.PhotoImage(self.img)
+        self.root.after(POLL_MS, self.poll_worker)
+
+    # 공통
+    def view_size(self):
+        # 아직 창이 안 떴으면 winfo 값이 1 이라 처음 지정한 크기를 씀
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if w <= 1 or h <= 1:
+            w, h = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return w, h
+
+    def show(self, display, img_size):
+        # 축소본만 PhotoImage 로 만듦 (원본 크기와 상관없이 화면 크기만큼의 비용)
+        self.display = display
+        self.img_size = img_size
+        self.view = ViewTransform(img_size, display.width / img_size[0], self.view_size())
+        self.tk_img = ImageTk.PhotoImage(display)
 
         if self.image_id is None:
-            self.image_id = self.canvas.create_image(0, 0, anchor="nw", image=self.tk_img)
+            self.image_id = self.canvas.create_image(self.view.offset_x, self.view.offset_y,
+                                                     anchor="nw", image=self.tk_img)
         else:
             self.canvas.itemconfig(self.image_id, image=self.tk_img)
+            self.canvas.coords(self.image_id, self.view.offset_x, self.view.offset_y)
+
+    def update_canvas(self):
+        # 원본 기준으로 화면을 다시 그림 (축소는 워커에서, 결과 표시는 poll 에서)
+        if self.img_size is None:
+            return
+        self.worker.submit(self._render, self.view_size(), callback=self.on_rendered)
+
+    def run_edit(self, full_fn, preview_fn=None, new_size=None):
+        """
+        편집 하나를 실행
+        - preview_fn(축소본) -> 새 축소본 : 화면에 바로 반영 (입력 축소본은 고치지 말 것)
+        - full_fn(원본) -> 새 원본 : 워커에서 원본 해상도로 실행 (히스토리 기록 포함)
+        - new_size : 작업 뒤 원본 크기가 바뀌면 (crop) 그 크기
+        """
+        if self.img_size is None:
+            return
+        if preview_fn is not None:
+            self.show(preview_fn(self.display), new_size or self.img_size)
+        self.worker.submit(self._apply, full_fn, self.view_size(), callback=self.on_rendered)
+
+    def poll_worker(self):
+        self.worker.poll()
+        pending = self.worker.pending()
+        self.status_label.config(text=f"원본 처리 중... ({pending})" if pending else "")
+        self.root.after(POLL_MS, self.poll_worker)
+
+    def on_rendered(self, result):
+        # 뒤에 다시 그리는 작업이 남아 있으면 마지막 결과만 보여줌 (먼저 바뀐 축소본이 앞 상태로 돌아가지 않도록)
+        # (저장처럼 callback 없는 작업은 다시 그리지 않으므로 세지 않음)
+        if result is None or self.worker.pending(with_callback=True):
+            return
+        img_size, display = result
+        self.show(display, img_size)
 
-        self.canvas.config(width=self.img.width, height=self.img.height)
+    def on_worker_error(self, error):
+        messagebox.showerror("오류", f"작업 실패: {error}")
+        self.update_canvas()
+
+    def on_resize(self, event):
+        # 창 크기를 바꾸는 동안에는 마지막 크기로 한 번만 다시 그림
+        if self.resize_job is not None:
+            self.root.after_cancel(self.resize_job)
+        self.resize_job = self.root.after(150, self._resize_done)
+
+    def _resize_done(self):
+        self.resize_job = None
+        self.update_canvas()
+
+    # 워커 스레드에서 실행되는 작업
+    def _render(self, view_size):
+        if self.img is None:
+            return None
+        if self.pyramid is None:
+            self.pyramid = Pyramid(self.img)
+        display, _ = self.pyramid.fit(*view_size)
+        return self.img.size, display
+
+    def _apply(self, full_fn, view_size):
+        self.img = full_fn(self.img)
+        self.pyramid = None  # 원본이 바뀌었으니 축소본도 다시
+        return self._render(view_size)
+
+    def _load(self, path, view_size):
+        self.img = load_image(path)
+        self.pyramid = None
+        self.history.clear()
+        return self._render(view_size)
+
+    def _history_step(self, step, view_size):
+        # 되돌릴/다시 할 작업이 없으면 None
+        if step == "undo" and not self.history.can_undo():
+            return None
+        if step == "redo" and not self.history.can_redo():
+            return None
+        return self._apply(self.history.undo if step == "undo" else self.history.redo, view_size)
 
     def push_history(self):
+        # 이미지 전체를 기록 (작업이 새 이미지를 돌려주므로 복사하지 않음, 워커 스레드에서 호출)
         if self.img is not None:
-            self.history.append(self.img.copy())
+            self.history.push_snapshot(self.img, copy=False)
 
     def undo(self):
-        if not self.history:
-            messagebox.showinfo("Undo", "되돌릴 작업이 없습니다.")
+        self._step("undo", "Undo", "되돌릴 작업이 없습니다.")
+
+    def redo(self):
+        self._step("redo", "Redo", "다시 할 작업이 없습니다.")
+
+    def _step(self, step, title, empty_message):
+        if self.img_size is None:
+            messagebox.showinfo(title, empty_message)
             return
-        self.img = self.history.pop()
-        self.update_canvas()
+
+        def done(result):
+            if result is None:
+                # 앞 작업의 결과 표시가 이 작업 때문에 건너뛰어졌을 수 있으므로 다시 그림
+                self.update_canvas()
+                messagebox.showinfo(title, empty_message)
+                return
+            self.on_rendered(result)
+
+        self.worker.submit(self._history_step, step, self.view_size(), callback=done)
 
     # 파일 열기, 저장
     def open_image(self):
@@ -101,8 +230,13 @@ class ImageToolApp:
         if not path:
             return
 
-        self.img = load_image(path)
-        self.history.clear()
+        # 화면 크기만큼만 먼저 빨리 읽어서 보여주고, 원본은 워커에서 읽음
+        try:
+            display, size = quick_preview(path, *self.view_size())
+        except Exception as e:
+            messagebox.showerror("오류", f"이미지를 열 수 없습니다: {e}")
+            return
+
         self.mode = "blur"
         self.mode_label.config(text="현재 모드: Blur (드래그 시 해당 영역만 블러)")
 
@@ -110,10 +244,11 @@ class ImageToolApp:
             self.canvas.delete(self.cur_rect)
             self.cur_rect = None
 
-        self.update_canvas()
+        self.show(display, size)
+        self.worker.submit(self._load, path, self.view_size(), callback=self.on_rendered)
 
     def save_current_image(self):
-        if self.img is None:
+        if self.img_size is None:
             messagebox.showwarning("주의", "먼저 이미지를 여세요.")
             return
 
@@ -129,33 +264,36 @@ class ImageToolApp:
         if not path:
             return
 
-        save_image(self.img, path)
+        # 앞에 넣은 편집이 원본에 다 반영된 뒤에 저장됨 (워커는 순서대로 실행)
+        self.worker.submit(lambda: save_image(self.img, path))
 
     # 버튼 기능
     def do_flip_h(self):
-        if self.img is None:
-            return
-        self.push_history()
-        self.img = flip_horizontal(self.img)
-        self.update_canvas()
+        def full(img):
+            self.history.push_op("flip_h")
+            return flip_horizontal(img)
+
+        self.run_edit(full, flip_horizontal)
 
     def do_flip_v(self):
-        if self.img is None:
-            return
-        self.push_history()
-        self.img = flip_vertical(self.img)
-        self.update_canvas()
+        def full(img):
+            self.history.push_op("flip_v")
+            return flip_vertical(img)
+
+        self.run_edit(full, flip_vertical)
 
     def do_blur_all(self):
-        if self.img is None:
-            return
-        self.push_history()
-        self.img = blur(self.img, ksize=5)
-        self.update_canvas()
+        def full(img):
+            self.push_history()
+            return blur(img, ksize=5)
+
+        # 축소본에는 배율만큼 작은 반경으로 (보이는 흐림 정도를 맞춤)
+        scale = self.view.scale if self.view else 1.0
+        self.run_edit(full, lambda d: blur(d, ksize=5 * scale))
 
     def enable_drag_crop(self):
         """드래그로 자르기 모드 활성화"""
-        if self.img is None:
+        if self.img_size is None:
             messagebox.showwarning("주의", "먼저 이미지를 여세요.")
             return
         self.mode = "crop"
@@ -164,7 +302,7 @@ class ImageToolApp:
 
     # 마우스 이벤트
     def on_mouse_down(self, event):
-        if self.img is None:
+        if self.img_size is None:
             return
 
         self.start_x = event.x
@@ -180,45 +318,43 @@ class ImageToolApp:
         )
 
     def on_mouse_drag(self, event):
-        if self.img is None or not self.cur_rect:
+        if self.img_size is None or not self.cur_rect:
             return
 
         self.canvas.coords(self.cur_rect, self.start_x, self.start_y, event.x, event.y)
 
     def on_mouse_up(self, event):
-        if self.img is None or not self.cur_rect:
+        if self.img_size is None or not self.cur_rect:
             return
 
         end_x, end_y = event.x, event.y
 
-        x1 = min(self.start_x, end_x)
-        y1 = min(self.start_y, end_y)
-        x2 = max(self.start_x, end_x)
-        y2 = max(self.start_y, end_y)
-
         # 드래그하고 드래그 박스 삭제코드
         self.canvas.delete(self.cur_rect)
         self.cur_rect = None
 
         # 너무 작은 영역은 무시하도록..
-        if x2 - x1 < 3 or y2 - y1 < 3:
+        if abs(end_x - self.start_x) < 3 or abs(end_y - self.start_y) < 3:
             return
 
-        # 이미지 범위로 클램프
-        img_w, img_h = self.img.size
-        x1 = max(0, min(x1, img_w))
-        x2 = max(0, min(x2, img_w))
-        y1 = max(0, min(y1, img_h))
-        y2 = max(0, min(y2, img_h))
+        # 캔버스 좌표 -> 원본 이미지 좌표 (이미지 범위로 클램프 포함)
+        box = self.view.box_to_image(self.start_x, self.start_y, end_x, end_y)
+        x1, y1, x2, y2 = box
+        if x2 <= x1 or y2 <= y1:
+            return
 
-        box = (x1, y1, x2, y2)
+        # 축소본 위의 같은 영역
+        dbox = self.view.box_to_display(box)
+        scale = self.view.scale
 
         # 동작 나누기
         if self.mode == "crop":
             # 드래그한 크기 그대로 잘라서 새 이미지로
-            self.push_history()
-            self.img = crop_image(self.img, box)
-            self.update_canvas()
+            def full(img):
+                self.push_history()
+                return crop_image(img, box)
+
+            self.run_edit(full, lambda d: d.crop(dbox), new_size=(x2 - x1, y2 - y1))
 
             # 한 번 잘랐으면 다시 Blur 모드로 복귀
             self.mode = "blur"
@@ -226,12 +362,19 @@ class ImageToolApp:
             return
 
         # 기본 모드: 드래그 영역 Blur
-        region = self.img.crop(box)
-        blurred = blur(region, ksize=5)
-
-        self.push_history()
-        self.img.paste(blurred, box)
-        self.update_canvas()
+        def full(img):
+            blurred = blur(img.crop(box), ksize=5)
+            self.history.push_patch(img, box)
+            img.paste(blurred, box)
+            return img
+
+        def preview(d):
+            d = d.copy()
+            if dbox[2] > dbox[0] and dbox[3] > dbox[1]:
+                d.paste(blur(d.crop(dbox), ksize=5 * scale), dbox)
+            return d
+
+        self.run_edit(full, preview)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+import queue
+import threading
+from PIL import Image
+
+
+class Pyramid:
+    """
+    원본을 1/2, 1/4, ... 로 줄인 이미지 묶음 (필요한 단계만 처음 쓸 때 만듦)
+    - 화면에 맞출 때 원본 대신 화면 크기보다 조금 큰 단계에서 줄이므로 큰 사진도 빠름
+    - 단계 k 는 단계 k-1 을 Image.reduce(2) 로 (2x2 평균, 매우 쌈)
+    """
+
+    def __init__(self, img, min_side=64):
+        self.levels = [img]
+        self.min_side = min_side
+
+    @property
+    def size(self):
+        return self.levels[0].size
+
+    def level(self, k):
+        while len(self.levels) <= k:
+            last = self.levels[-1]
+            if min(last.size) // 2 < self.min_side:
+                break
+            self.levels.append(last.reduce(2))
+        return self.levels[min(k, len(self.levels) - 1)]
+
+    def fit(self, max_w, max_h):
+        """
+        max_w x max_h 안에 들어가는 가장 큰 크기로 줄인 이미지 (원본보다 키우지는 않음)
+        반환: (표시용 이미지, 원본 대비 배율)
+        """
+        w, h = self.size
+        scale = min(max_w / w, max_h / h, 1.0)
+        target = (max(1, round(w * scale)), max(1, round(h * scale)))
+        if target == (w, h):
+            # 원본 그대로 보여줄 때도 복사본을 돌려줌 (워커가 원본을 직접 고치는 중에 화면 쪽이 읽지 않도록)
+            return self.levels[0].copy(), 1.0
+
+        # 목표보다 작아지지 않는 가장 작은 단계에서 시작
+        k = 0
+        while (w >> (k + 1)) >= target[0] and (h >> (k + 1)) >= target[1]:
+            k += 1
+        src = self.level(k)
+        if src.size == target:
+            return src, scale
+        return src.resize(target, Image.BILINEAR), scale
+
+
+class ViewTransform:
+    """
+    캔버스 좌표 <-> 원본 이미지 좌표 변환
+    - 표시용 이미지는 원본의 scale 배, 캔버스 (offset_x, offset_y) 위치에 그려짐
+    """
+
+    def __init__(self, img_size, scale, view_size=None):
+        self.img_size = img_size
+        self.scale = scale
+        self.display_size = (max(1, round(img_size[0] * scale)), max(1, round(img_size[1] * scale)))
+        if view_size is None:
+            self.offset_x = self.offset_y = 0
+        else:
+            # 캔버스 가운데에 놓음
+            self.offset_x = max(0, (view_size[0] - self.display_size[0]) // 2)
+            self.offset_y = max(0, (view_size[1] - self.display_size[1]) // 2)
+
+    def to_image(self, x, y):
+        # 캔버스 -> 원본 픽셀 (이미지 밖이면 가장자리로 붙임)
+        w, h = self.img_size
+        ix = round((x - self.offset_x) / self.scale)
+        iy = round((y - self.offset_y) / self.scale)
+        return max(0, min(ix, w)), max(0, min(iy, h))
+
+    def to_canvas(self, x, y):
+        return self.offset_x + x * self.scale, self.offset_y + y * self.scale
+
+    def box_to_image(self, x1, y1, x2, y2):
+        (a, b), (c, d) = self.to_image(x1, y1), self.to_image(x2, y2)
+        return min(a, c), min(b, d), max(a, c), max(b, d)
+
+    def box_to_display(self, box):
+        # 원본 box -> 표시용 이미지 안의 box (미리보기에 같은 작업을 바로 적용할 때)
+        dw, dh = self.display_size
+        x1, y1, x2, y2 = (round(v * self.scale) for v in box)
+        return max(0, min(x1, dw)), max(0, min(y1, dh)), max(0, min(x2, dw)), max(0, min(y2, dh))
+
+
+def quick_preview(path, max_w, max_h):
+    """
+    파일을 화면 크기 정도로만 빨리 읽음 (JPEG 는 draft 로 디코딩 단계에서 1/2~1/8 로 줄여서 읽음)
+    원본은 따로 load_image 로 (Worker 에서) 읽음
+    """
+    with Image.open(path) as f:
+        full_size = f.size
+        f.draft("RGB", (max_w, max_h))
+        img = f.convert("RGB")
+    img.thumbnail((max_w, max_h), Image.BILINEAR)
+    return img, full_size
+
+
+class Worker:
+    """
+    원본 해상도 작업을 차례로 처리하는 백그라운드 스레드 하나
+    - submit(func, *args, callback=...) : 넣은 순서대로 실행 (원본을 고치는 작업끼리 섞이지 않음)
+    - tkinter 는 메인 스레드에서만 다뤄야 하므로 결과는 poll() 을 부른 쪽(메인 스레드)에서 callback 실행
+    - pending(with_callback=True) 는 callback 이 있는 작업만 셈 (저장처럼 결과를 안 받는 작업 제외)
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self._jobs = queue.Queue()
+        self._done = queue.Queue()
+        self._pending = 0
+        self._pending_callbacks = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # ------------------- 공개 API -------------------
+
+    def submit(self, func, *args, callback=None):
+        with self._lock:
+            self._pending += 1
+            if callback:
+                self._pending_callbacks += 1
+        self._jobs.put((func, args, callback))
+
+    def pending(self, with_callback=False):
+        # 아직 결과를 poll 로 받지 않은 작업 수
+        with self._lock:
+            return self._pending_callbacks if with_callback else self._pending
+
+    def poll(self):
+        """
+        끝난 작업들의 callback 을 지금 스레드에서 실행, 처리한 개수를 돌려줌
+        """
+        count = 0
+        while True:
+            try:
+                callback, result, error = self._done.get_nowait()
+            except queue.Empty:
+                return count
+            with self._lock:
+                self._pending -= 1
+                if callback:
+                    self._pending_callbacks -= 1
+            count += 1
+            if error is not None:
+                if self.on_error:
+                    self.on_error(error)
+                else:
+                    print(f"[Worker] 작업 실패: {error}")
+            elif callback:
+                callback(result)
+
+    def wait(self):
+        # 넣은 작업이 전부 실행될 때까지 기다림 (callback 은 poll 에서)
+        self._jobs.join()
+
+    def close(self):
+        self._jobs.put(None)
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            func, args, callback = job
+            try:
+                self._done.put((callback, func(*args), None))
+            except Exception as e:
+                self._done.put((callback, None, e))
+            finally:
+                self._jobs.task_done()
@@ -1,11 +1,13 @@
 from PIL import Image
 import os
 
-def save_image(img, path):
+def save_image(img, path, verbose=True, **options):
+    # options 는 PIL Image.save 에 그대로 전달 (format, quality 등)
 
     directory = os.path.dirname(path)
-    if directory and not os.path.exists(directory):
-        os.makedirs(directory)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
 
-    img.save(path)
-    print(f"[save_image] Image saved to: {path}")
\ No newline at end of file
+    img.save(path, **options)
+    if verbose:
+        print(f"[save_image] Image saved to: {path}")
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import unittest
+from unittest import mock
 from PIL import Image
 
 from src.blur import blur
@@ -9,6 +10,10 @@ from src.flip_vertical import flip_vertical
 from src.load_image import load_image
 from src.save_image import save_image
 from src.crop import crop_image  
+from src.history import History
+from src.preview import Pyramid, ViewTransform, Worker
+from src import batch
+from src.batch import parse_ops, find_inputs, run_batch
 
 
 
@@ -112,5 +117,171 @@ class TestCrop(unittest.TestCase):
             _ = crop_image(self.img, -10, -10, 200, 200)
 
 
+# history tests
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.img = Image.new("RGB", (40, 30))
+        for x in range(40):
+            for y in range(30):
+                self.img.putpixel((x, y), (x * 6, y * 8, 100))
+        self.original = self.img.copy()
+
+    def test_patch_undo_redo(self):
+        """드래그 blur 는 box 영역만 저장하고, undo/redo 로 픽셀이 그대로 돌아와야 함"""
+        history = History()
+        box = (5, 5, 20, 15)
+        history.push_patch(self.img, box)
+        self.img.paste(blur(self.img.crop(box), ksize=5), box)
+        blurred = self.img.copy()
+
+        self.assertEqual(history.memory_bytes(), 15 * 10 * 3)
+        img = history.undo(self.img)
+        self.assertEqual(list(img.getdata()), list(self.original.getdata()))
+        img = history.redo(img)
+        self.assertEqual(list(img.getdata()), list(blurred.getdata()))
+
+    def test_flip_and_crop(self):
+        """반전은 픽셀 없이 기록, crop 은 전체 이미지로 되돌려야 함"""
+        history = History()
+        history.push_op("flip_h")
+        img = flip_horizontal(self.img)
+        history.push_snapshot(img, copy=False)
+        img = img.crop((0, 0, 10, 10))
+        self.assertEqual(history.memory_bytes(), 40 * 30 * 3)
+
+        img = history.undo(history.undo(img))
+        self.assertEqual(list(img.getdata()), list(self.original.getdata()))
+        self.assertFalse(history.can_undo())
+        self.assertEqual(history.redo(history.redo(img)).size, (10, 10))
+
+    def test_budget_evicts_or_spills_oldest(self):
+        """예산을 넘으면 가장 오래된 기록부터 버리거나 디스크로 내려야 함"""
+        history = History(budget_bytes=2 * 40 * 30 * 3)
+        for _ in range(3):
+            history.push_snapshot(self.img)
+        self.assertEqual(len(history.undo_stack), 2)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            history = History(budget_bytes=40 * 30 * 3, spill_dir=tmpdir)
+            img = self.img
+            for i in range(3):
+                history.push_snapshot(img, copy=False)
+                img = Image.new("RGB", (40, 30), (i, i, i))
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            self.assertLessEqual(history.memory_bytes(), 40 * 30 * 3)
+
+            for _ in range(3):
+                img = history.undo(img)
+            self.assertEqual(list(img.getdata()), list(self.original.getdata()))
+            history.clear()
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_new_edit_clears_redo(self):
+        history = History()
+        history.push_op("flip_v")
+        img = history.undo(flip_vertical(self.img))
+        self.assertTrue(history.can_redo())
+        history.push_op("flip_h")
+        self.assertFalse(history.can_redo())
+
+
+# preview tests
+class TestPreview(unittest.TestCase):
+    def test_pyramid_fit(self):
+        """화면 안에 들어가게 줄이고, 원본보다 키우지는 않아야 함"""
+        pyramid = Pyramid(Image.new("RGB", (4000, 3000), (1, 2, 3)))
+        display, scale = pyramid.fit(800, 800)
+        self.assertEqual(display.size, (800, 600))
+        self.assertAlmostEqual(scale, 0.2)
+        self.assertEqual(len(pyramid.levels), 3)  # 1/2, 1/4 까지만 만들어짐
+
+        small, scale = Pyramid(Image.new("RGB", (100, 50))).fit(800, 800)
+        self.assertEqual((small.size, scale), ((100, 50), 1.0))
+
+    def test_view_transform_roundtrip(self):
+        """캔버스 좌표와 원본 좌표가 서로 맞게 바뀌고, 이미지 밖은 가장자리로 붙어야 함"""
+        view = ViewTransform((4000, 3000), 0.2, view_size=(1000, 600))
+        self.assertEqual((view.offset_x, view.offset_y), (100, 0))
+        self.assertEqual(view.to_image(*view.to_canvas(1234, 567)), (1234, 567))
+        self.assertEqual(view.to_image(0, 9999), (0, 3000))
+        self.assertEqual(view.box_to_image(300, 200, 200, 100), (500, 500, 1000, 1000))
+        self.assertEqual(view.box_to_display((500, 500, 1000, 1000)), (100, 100, 200, 200))
+
+    def test_worker_runs_in_order(self):
+        results = []
+        worker = Worker()
+        for i in range(5):
+            worker.submit(lambda i=i: i * i, callback=results.append)
+        worker.submit(lambda: 1 / 0)
+        self.assertEqual((worker.pending(), worker.pending(with_callback=True)), (6, 5))
+        worker.wait()
+        self.assertEqual(worker.poll(), 6)
+        self.assertEqual(results, [0, 1, 4, 9, 16])
+        self.assertEqual(worker.pending(), 0)
+        worker.close()
+
+
+# batch tests
+class TestBatch(unittest.TestCase):
+    def test_parse_ops(self):
+        self.assertEqual(parse_ops(["flip_h", "blur:5", "crop:0,0,10,10"]),
+                         [("flip_h", ()), ("blur", (5,)), ("crop", (0, 0, 10, 10))])
+        for bad in (["rotate"], ["crop:1,2"], ["blur:x"]):
+            with self.assertRaises(ValueError):
+                parse_ops(bad)
+
+    def test_run_batch_and_skip(self):
+        """폴더 구조를 유지해서 저장하고, 다시 돌리면 이미 처리된 파일은 건너뛰어야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src_dir = os.path.join(tmpdir, "in")
+            out_dir = os.path.join(tmpdir, "out")
+            os.makedirs(os.path.join(src_dir, "sub"))
+            for i, name in enumerate(["a.png", "b.jpg", os.path.join("sub", "c.png")]):
+                img = Image.new("RGB", (40, 20), (i * 50, 0, 0))
+                img.putpixel((0, 0), (255, 255, 255))
+                img.save(os.path.join(src_dir, name))
+            with open(os.path.join(src_dir, "broken.png"), "wb") as f:
+                f.write(b"not an image")
+
+            root, paths = find_inputs(src_dir)
+            self.assertEqual(len(paths), 4)
+
+            ops = parse_ops(["flip_h", "crop:0,0,30,20"])
+            first = run_batch(root, out_dir, paths, ops, fmt="png", workers=2, chunk_size=1)
+            self.assertEqual((first["ok"], first["error"]), (3, 1))
+
+            out = Image.open(os.path.join(out_dir, "sub", "c.png"))
+            self.assertEqual(out.size, (30, 20))
+            self.assertTrue(os.path.exists(os.path.join(out_dir, "b.png")))
+
+            again = run_batch(root, out_dir, paths, ops, fmt="png", workers=1)
+            self.assertEqual((again["ok"], again["skipped"]), (0, 3))
+
+    def test_worker_crash_only_fails_bad_file(self):
+        """워커가 죽어도 같이 돌던 묶음은 다시 처리하고, 죽게 만든 파일 하나만 실패로 남아야 함"""
+        real_load = batch.load_image
+
+        def crashing_load(path):
+            if os.path.basename(path) == "crash.png":
+                os._exit(1)  # segfault / OOM 흉내
+            return real_load(path)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src_dir = os.path.join(tmpdir, "in")
+            out_dir = os.path.join(tmpdir, "out")
+            os.makedirs(src_dir)
+            names = [f"{i:02d}.png" for i in range(23)] + ["crash.png"]
+            for name in names:
+                Image.new("RGB", (8, 8)).save(os.path.join(src_dir, name))
+
+            root, paths = find_inputs(src_dir)
+            # 워커는 fork 로 뜨므로 바꿔 둔 함수를 그대로 씀
+            with mock.patch.object(batch, "load_image", crashing_load):
+                summary = run_batch(root, out_dir, paths, [], fmt="png", workers=2, chunk_size=4)
+
+        self.assertEqual((summary["ok"], summary["error"], summary["skipped"]), (23, 1, 0))
+        self.assertEqual([e["file"] for e in summary["errors"]], ["crash.png"])
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
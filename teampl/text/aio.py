@@ -0,0 +1,201 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .main import ProfanityFilter
+
+# 배처에게 "그만 받고 종료" 를 알리는 표시
+_STOP = object()
+
+
+class AsyncProfanityFilter:
+    """
+    asyncio 채팅 서버용 ProfanityFilter 래퍼
+
+    - 실제 필터링은 크기가 제한된 스레드 풀에서 돌려서 이벤트 루프를 막지 않음
+    - batch_window 초 안에 몰려 들어온 요청은 최대 max_batch 개씩 묶어서
+      executor 호출 1번 + 스캔 1번으로 처리 (ProfanityFilter.analyze_many)
+      batch_window 기본값 0 : 혼자 온 요청은 기다리지 않고, 스레드가 바쁜 동안 쌓인 요청만 묶임
+      한 메시지가 실패하면 그 요청만 예외를 받음 (그 묶음은 메시지마다 다시 처리)
+    - close() 뒤에 들어온 요청은 RuntimeError
+    - 대기열이 max_queue 를 넘으면 block=True 는 자리가 날 때까지 기다리고,
+      block=False 는 asyncio.QueueFull 을 던짐 (backpressure)
+    - 최근 요청들의 지연 시간 백분위수는 latency_percentiles() 로 확인
+
+    사용 예)
+        async with AsyncProfanityFilter() as af:
+            cleaned = await af.clean(message)
+    """
+
+    def __init__(self, filter_instance=None, max_workers=2, batch_window=0.0,
+                 max_batch=256, max_queue=10000, latency_window=10000):
+        self.filter = filter_instance if filter_instance is not None else ProfanityFilter()
+        self.max_workers = max_workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+
+        self._latencies = deque(maxlen=latency_window)
+        self._queue = None
+        self._runner = None
+        self._executor = None
+        self._slots = None
+        self._batches = set()
+        self._waiting = set()
+        self._closed = False
+
+    # ------------------- 공개 API -------------------
+
+    async def analyze(self, text: str, block=True):
+        """
+        ProfanityFilter.analyze 와 같은 결과(FilterResult)를 비동기로 돌려줌
+        """
+        if self._closed:
+            raise RuntimeError("[AsyncProfanityFilter.analyze] 이미 close 된 필터입니다.")
+
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        item = (text, fut, loop.time())
+
+        if block:
+            await self._queue.put(item)
+        else:
+            self._queue.put_nowait(item)
+
+        # 대기열에 들어간 뒤에만 등록 (QueueFull / 취소로 못 들어간 future 를 close 가 건드리지 않도록)
+        self._waiting.add(fut)
+        fut.add_done_callback(self._waiting.discard)
+
+        return await fut
+
+    async def clean(self, text: str, block=True) -> str:
+        return (await self.analyze(text, block)).cleaned
+
+    async def has_profanity(self, text: str, block=True) -> bool:
+        return (await self.analyze(text, block)).has_profanity
+
+    def latency_percentiles(self, percentiles=(50, 95, 99)) -> dict:
+        """
+        최근 요청 지연 시간(초)의 백분위수, 예: {"p50": 0.001, "p95": ..., "p99": ...}
+        """
+        samples = sorted(self._latencies)
+        if not samples:
+            return {}
+
+        result = {}
+        for p in percentiles:
+            idx = min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))
+            result[f"p{p}"] = samples[idx]
+        return result
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def close(self):
+        """
+        대기 중인 요청을 모두 처리한 뒤 배처와 스레드 풀을 정리
+        (종료 표시 뒤에 들어와서 처리되지 못한 요청은 RuntimeError 로 끝냄)
+        """
+        self._closed = True
+        if self._runner is None:
+            return
+
+        await self._queue.put((_STOP, None, None))
+        await self._runner
+
+        if self._batches:
+            await asyncio.gather(*self._batches)
+
+        # 대기열에 남은 요청을 비워서 put 에서 기다리던 쪽도 풀어 줌
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        for fut in list(self._waiting):
+            if not fut.done():
+                fut.set_exception(RuntimeError("[AsyncProfanityFilter.close] 처리되기 전에 close 되었습니다."))
+
+        self._executor.shutdown(wait=True)
+        self._runner = None
+
+    async def __aenter__(self):
+        self._ensure_started()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _ensure_started(self):
+        if self._runner is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        queue = self._queue
+        stopping = False
+
+        while not stopping:
+            first = await queue.get()
+            if first[0] is _STOP:
+                break
+
+            # 잠깐 기다렸다가 그 사이에 쌓인 요청을 한 번에 가져감
+            if self.batch_window > 0 and queue.qsize() < self.max_batch:
+                await asyncio.sleep(self.batch_window)
+
+            batch = [first]
+            while len(batch) < self.max_batch and not queue.empty():
+                item = queue.get_nowait()
+                if item[0] is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # 동시에 도는 배치 수 = 스레드 수 (그 이상은 대기열에서 기다림)
+            await self._slots.acquire()
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _, _ in batch]
+
+        try:
+            results = await loop.run_in_executor(self._executor, self._analyze_batch, texts)
+        except Exception as e:
+            # 스레드 풀 자체가 실패한 경우 (메시지별 예외는 _analyze_batch 에서 따로 받음)
+            results = [(None, e)] * len(batch)
+        finally:
+            self._slots.release()
+
+        now = loop.time()
+        for (_, fut, started), (result, error) in zip(batch, results):
+            self._latencies.append(now - started)
+            if fut.done():
+                continue
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+    def _analyze_batch(self, texts):
+        # 반환: 메시지마다 (결과, 예외) (한 메시지의 예외가 같은 묶음의 다른 요청으로 번지지 않게)
+        try:
+            return [(result, None) for result in self.filter.analyze_many(texts)]
+        except Exception:
+            pass
+
+        results = []
+        analyze = self.filter.analyze
+        for text in texts:
+            try:
+                results.append((analyze(text), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
@@ -0,0 +1,59 @@
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# 워커 프로세스마다 한 번만 만들어 두는 필터 (패턴 컴파일은 워커 시작 시 1회)
+_worker_filter = None
+
+
+def _init_worker(filter_cls, kwargs):
+    global _worker_filter
+    _worker_filter = filter_cls(**kwargs)
+
+
+def _run_chunk(method, chunk):
+    func = getattr(_worker_filter, method)
+    return [func(text) for text in chunk]
+
+
+def iter_chunks(iterable, size):
+    """
+    iterable 을 size 개씩 리스트로 잘라서 돌려줌 (마지막 조각은 더 짧을 수 있음)
+    """
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_map(filter_instance, method, texts, workers=None, chunksize=256):
+    """
+    texts 의 각 원소에 filter_instance.<method> 를 적용한 결과를 순서대로 돌려주는 제너레이터
+
+    - workers 가 없거나 1 이하면 현재 프로세스에서 그대로 처리
+    - workers 가 2 이상이면 chunksize 단위로 묶어서 프로세스 풀에 분배
+      (각 워커는 같은 설정으로 만든 필터를 미리 컴파일해 두고 재사용)
+    - 동시에 떠 있는 조각 수를 workers * 2 로 제한하므로
+      texts 가 아주 큰 제너레이터여도 메모리가 일정하게 유지됩니다.
+    """
+    if not workers or workers <= 1:
+        func = getattr(filter_instance, method)
+        for text in texts:
+            yield func(text)
+        return
+
+    initargs = (type(filter_instance), filter_instance._init_kwargs())
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+
+        for chunk in iter_chunks(texts, chunksize):
+            pending.append(pool.submit(_run_chunk, method, chunk))
+
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from .bundle import compile_bundle
+from .main import ProfanityFilter
+
+
+def make_wordlist(size, seed=0, min_len=2, max_len=4):
+    """
+    완성형 한글 음절을 무작위로 이어 붙인 가짜 욕설 목록 (중복 없음)
+    """
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        n = rng.randint(min_len, max_len)
+        words.add("".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(n)))
+    return sorted(words)
+
+
+# 합성 채팅 말뭉치에 쓰는 평범한 문장 조각
+FILLER = [
+    "안녕하세요", "오늘", "진짜", "너무", "재밌다", "ㅋㅋ", "아니", "그래서", "근데",
+    "게임", "한판", "더", "하자", "배고파", "점심", "뭐", "먹지", "잘한다", "수박",
+    "박수", "헛수고", "ㅎㅎ", "대박", "와", "아까", "그거", "봤어?", "응", "굿",
+]
+
+# 욕설 글자 사이에 끼워 넣는 잡음
+NOISE_CHARS = [" ", ".", "*", "_", "!", "1", "~"]
+
+
+def _noisy(word, rng, noise):
+    # 글자 사이마다 noise 확률로 잡음 1~2개 끼워 넣기 (ㅆ.발, 씨 ~발 ...)
+    out = [word[0]]
+    for ch in word[1:]:
+        if rng.random() < noise:
+            out.append("".join(rng.choice(NOISE_CHARS) for _ in range(rng.randint(1, 2))))
+        out.append(ch)
+    return "".join(out)
+
+
+def make_corpus(count, badwords, seed=0, length=40, density=0.1, noise=0.3):
+    """
+    합성 한국어 채팅 메시지 목록
+    - length : 메시지 평균 글자 수 (대략)
+    - density : 단어 하나가 욕설로 바뀔 확률
+    - noise : 욕설 글자 사이에 잡음을 끼워 넣을 확률
+    """
+    rng = random.Random(seed)
+    badwords = list(badwords)
+    messages = []
+
+    for _ in range(count):
+        target = max(1, int(rng.gauss(length, length / 4)))
+        parts = []
+        size = 0
+        while size < target:
+            if badwords and rng.random() < density:
+                w = _noisy(rng.choice(badwords), rng, noise)
+            else:
+                w = rng.choice(FILLER)
+            parts.append(w)
+            size += len(w) + 1
+        messages.append(" ".join(parts))
+
+    return messages
+
+
+# 처리량 결과를 비교할 때 같아야 하는 말뭉치 조건
+CORPUS_KEYS = ("messages", "length", "density", "noise", "seed")
+
+
+def _percentile(samples, p):
+    # 정렬된 samples 에서 p 백분위수 (aio.latency_percentiles 와 같은 방식)
+    idx = min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))
+    return samples[idx]
+
+
+def _measure(func, messages):
+    """
+    메시지마다 func 를 부르며 처리량/지연 시간/최대 메모리를 측정
+    (지연 시간은 tracemalloc 없이 따로 재서 추적 비용이 섞이지 않게 함)
+    """
+    latencies = []
+    perf = time.perf_counter
+    t0 = perf()
+    for msg in messages:
+        s = perf()
+        func(msg)
+        latencies.append(perf() - s)
+    total = perf() - t0
+
+    tracemalloc.start()
+    for msg in messages:
+        func(msg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "msgs_per_sec": len(messages) / total if total > 0 else 0.0,
+        "p50_us": _percentile(latencies, 50) * 1e6,
+        "p99_us": _percentile(latencies, 99) * 1e6,
+        "peak_bytes": peak,
+    }
+
+
+def bench_throughput(sizes=(100, 1000, 10000), messages=5000, seed=0, length=40,
+                     density=0.1, noise=0.3, mode="regex"):
+    """
+    단어 수별로 clean / has_profanity / _normalize 의 처리량과 지연 시간을 측정
+    - 말뭉치의 욕설은 실제 단어 목록에서 뽑아서 매칭 경로도 같이 측정됨
+    - 캐시는 끄고 측정 (매 메시지를 실제로 계산)
+    """
+    results = []
+
+    for size in sizes:
+        words = make_wordlist(size, seed=seed)
+        corpus = make_corpus(messages, words, seed=seed, length=length,
+                             density=density, noise=noise)
+
+        tracemalloc.start()
+        f = ProfanityFilter(badwords=words, number_patterns=[], mode=mode)
+        _, build_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # 지연 컴파일되는 분기를 미리 데워 둠
+        for msg in corpus[:200]:
+            f.clean(msg)
+
+        row = {
+            "size": size,
+            "mode": mode,
+            "messages": messages,
+            "length": length,
+            "density": density,
+            "noise": noise,
+            "seed": seed,
+            "build_peak_bytes": build_peak,
+            "hit_rate": sum(map(f.has_profanity, corpus)) / len(corpus) if corpus else 0.0,
+        }
+        for name, func in (("clean", f.clean), ("has_profanity", f.has_profanity),
+                           ("normalize", f._normalize)):
+            row[name] = _measure(func, corpus)
+
+        results.append(row)
+
+    return results
+
+
+def compare_throughput(baseline, current, tolerance=0.2) -> list:
+    """
+    이전 처리량 결과(baseline)와 비교해서 msgs/sec 가 tolerance 비율 넘게 떨어진 항목 목록
+    - 같은 단어 수 / 모드라도 말뭉치 조건(메시지 수, 길이, 밀도, 잡음, seed)이 다르면 ValueError
+      (조건이 다른 숫자끼리 비교하면 회귀를 놓치거나 없는 회귀를 보고함)
+    반환: [(size, op, 이전 msgs/sec, 지금 msgs/sec), ...]
+    """
+    before = {(r["size"], r["mode"]): r for r in baseline}
+    regressions = []
+
+    for r in current:
+        old = before.get((r["size"], r["mode"]))
+        if old is None:
+            continue
+        diff = [k for k in CORPUS_KEYS if old.get(k) != r.get(k)]
+        if diff:
+            changes = ", ".join(f"{k}={old.get(k)}->{r.get(k)}" for k in diff)
+            raise ValueError(f"[compare_throughput] 기준과 말뭉치 조건이 다릅니다 "
+                             f"(words={r['size']}, {changes})")
+        for name in ("clean", "has_profanity", "normalize"):
+            was = old[name]["msgs_per_sec"]
+            now = r[name]["msgs_per_sec"]
+            if now < was * (1 - tolerance):
+                regressions.append((r["size"], name, was, now))
+
+    return regressions
+
+
+def _best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_coldstart(sizes=(100, 1000, 10000, 50000), repeat=3, seed=0):
+    """
+    단어 수별로 필터 생성 시간을 측정
+    - build : ProfanityFilter(badwords=...) 로 매번 컴파일
+    - bundle_load : 미리 만든 번들에서 ProfanityFilter.from_bundle
+    - first_clean : 번들 로드 직후 첫 clean 호출 (지연 컴파일 포함)
+    """
+    sample = "이런 씨발 진짜 병신같은 ㅋㅋ 아 개같네 " * 4
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            words = make_wordlist(size, seed=seed)
+            path = os.path.join(tmpdir, f"bundle_{size}.json")
+            compile_bundle(path, words)
+
+            build = _best_of(lambda: ProfanityFilter(badwords=words), repeat)
+            load = _best_of(lambda: ProfanityFilter.from_bundle(path), repeat)
+
+            def load_and_clean():
+                ProfanityFilter.from_bundle(path).clean(sample)
+
+            first_clean = _best_of(load_and_clean, repeat)
+
+            results.append({
+                "size": size,
+                "build_sec": build,
+                "bundle_load_sec": load,
+                "first_clean_sec": first_clean,
+                "bundle_bytes": os.path.getsize(path),
+            })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ProfanityFilter 벤치마크 (콜드 스타트 / 처리량)")
+    parser.add_argument("--suite", choices=["coldstart", "throughput", "all"], default="coldstart")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--messages", type=int, default=5000, help="처리량 측정용 메시지 수")
+    parser.add_argument("--length", type=int, default=40, help="메시지 평균 글자 수")
+    parser.add_argument("--density", type=float, default=0.1, help="단어가 욕설일 확률")
+    parser.add_argument("--noise", type=float, default=0.3, help="욕설 글자 사이 잡음 확률")
+    parser.add_argument("--mode", choices=["regex", "jamo"], default="regex")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None,
+                        help="비교할 이전 결과 JSON (처리량이 떨어지면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 처리량 감소 비율")
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    if args.suite in ("coldstart", "all"):
+        results["coldstart"] = bench_coldstart(args.sizes, args.repeat, args.seed)
+
+        print(f"{'words':>8} {'build(ms)':>10} {'bundle(ms)':>11} {'1st clean(ms)':>14}")
+        for r in results["coldstart"]:
+            print(f"{r['size']:>8} {r['build_sec'] * 1000:>10.1f} "
+                  f"{r['bundle_load_sec'] * 1000:>11.1f} {r['first_clean_sec'] * 1000:>14.1f}")
+
+    if args.suite in ("throughput", "all"):
+        results["throughput"] = bench_throughput(
+            args.sizes, args.messages, args.seed, args.length,
+            args.density, args.noise, args.mode,
+        )
+
+        print(f"{'words':>8} {'op':>14} {'msgs/s':>10} {'p50(us)':>9} {'p99(us)':>9} {'peak(KB)':>9}")
+        for r in results["throughput"]:
+            for name in ("clean", "has_profanity", "normalize"):
+                m = r[name]
+                print(f"{r['size']:>8} {name:>14} {m['msgs_per_sec']:>10.0f} "
+                      f"{m['p50_us']:>9.1f} {m['p99_us']:>9.1f} {m['peak_bytes'] / 1024:>9.1f}")
+
+    if args.suite == "coldstart":
+        # 예전 형식(목록) 그대로 저장
+        results = results["coldstart"]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"저장 완료: {args.output}")
+
+    if args.baseline and "throughput" in results:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("throughput", [])
+
+        try:
+            regressions = compare_throughput(baseline, results["throughput"], args.tolerance)
+        except ValueError as e:
+            print(e)
+            return 1
+        for size, name, was, now in regressions:
+            print(f"[regression] words={size} {name}: {was:.0f} -> {now:.0f} msgs/s")
+        if regressions:
+            return 1
+        print("기준 대비 처리량 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
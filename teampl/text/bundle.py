@@ -0,0 +1,91 @@
+import argparse
+import hashlib
+import json
+import os
+
+from .badwords import base_badwords, number_like_patterns
+from .matcher import PatternMatcher
+from .wordlist import load_wordlist
+
+BUNDLE_FORMAT = "teampl-profanity-bundle"
+BUNDLE_VERSION = 2
+
+
+def _checksum(badwords, patterns) -> str:
+    h = hashlib.sha256()
+    for item in list(badwords) + ["\0"] + list(patterns):
+        h.update(item.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def compile_bundle(path, badwords, number_patterns=()):
+    """
+    단어 목록을 미리 컴파일해서 path 에 번들(JSON)로 저장하고 매처를 반환
+    - 트라이 생성과 정규식 조립을 여기서 끝내 두므로
+      load_bundle 쪽에서는 파일을 읽기만 하면 됩니다.
+    """
+    matcher = PatternMatcher(badwords, number_patterns)
+
+    data = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "checksum": _checksum(matcher.badwords, matcher.regex_patterns),
+        "matcher": matcher.to_dict(),
+    }
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    # 쓰는 도중에 다른 프로세스가 읽어도 깨진 파일을 보지 않도록 임시 파일 -> 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    return matcher
+
+
+def load_bundle(path) -> PatternMatcher:
+    """
+    compile_bundle 로 만든 번들 파일을 읽어서 매처로 복원
+    형식/버전이 다르거나 내용이 손상되었으면 ValueError
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if data.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"[load_bundle] not a profanity bundle: {path}")
+
+    if data.get("version") != BUNDLE_VERSION:
+        raise ValueError(
+            f"[load_bundle] bundle version {data.get('version')} is not supported "
+            f"(expected {BUNDLE_VERSION}), recompile: {path}"
+        )
+
+    state = data["matcher"]
+    if data.get("checksum") != _checksum(state["badwords"], state["regex_patterns"]):
+        raise ValueError(f"[load_bundle] checksum mismatch, bundle is corrupted: {path}")
+
+    return PatternMatcher.from_dict(state)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="욕설 단어 목록을 미리 컴파일한 번들 파일 생성")
+    parser.add_argument("wordlist", nargs="?", default=None,
+                        help="단어 목록 파일 (생략하면 badwords.py 의 기본 목록)")
+    parser.add_argument("-o", "--output", default="badwords.bundle.json", help="저장할 번들 경로")
+    args = parser.parse_args(argv)
+
+    if args.wordlist:
+        badwords, patterns = load_wordlist(args.wordlist)
+    else:
+        badwords, patterns = base_badwords, number_like_patterns
+
+    matcher = compile_bundle(args.output, badwords, patterns)
+    print(f"번들 저장 완료: {args.output} (단어 {len(matcher.badwords)}개, 패턴 {len(matcher.regex_patterns)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,10 +24,11 @@ def save_filtered_results(filter_instance, text_list, output_folder="filtered_re
 
             f.write(f"[Example {idx}]\n")
             
-            # 전체 텍스트를 한 번에 처리
-            # 주의: 현재 _normalize 로직에 의해 줄바꿈이 공백으로 바뀔 수 있습니다.
-            cleaned_text = filter_instance.clean(text)
-            is_bad = filter_instance.has_profanity(text)
+            # 전체 텍스트를 한 번에 처리 (정규화/스캔은 analyze 안에서 1번만)
+            # masked 는 원문 줄바꿈을 그대로 유지한 채 욕설만 가린 결과
+            result = filter_instance.analyze(text)
+            cleaned_text = result.masked
+            is_bad = result.has_profanity
             
             # 파일에 기록할 포맷
             f.write(f"원문:\n{text}\n\n")
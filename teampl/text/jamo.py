@@ -0,0 +1,261 @@
+import copy
+from array import array
+from functools import lru_cache
+
+from .matcher import PatternMatcher, apply_mask, cow_path, find_path, prune_path
+
+# 한글 음절 (가 ~ 힣) 분해용 표 (호환 자모로 통일해서 "ㅅㅂ" 같은 입력과 바로 비교 가능)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_COUNT = 11172
+
+# 모음 ㅣ 대신 자주 쓰이는 글자 (ㅅ1발, ㅅl발 ...)
+# 잡음(특수문자)은 건너뛰기 규칙이 따로 있으므로 여기엔 숫자/영문만 둡니다.
+LOOKALIKES = {"1": "ㅣ", "l": "ㅣ"}
+
+# 최대 몇 글자까지 잡음을 건너뛸지 (matcher.NOISE 의 {0,3} 과 동일)
+MAX_NOISE = 3
+
+# 트라이 특수 키 (실제 자모와 겹치지 않음)
+_END = ""
+_GAP = None
+
+
+def is_syllable(ch: str) -> bool:
+    return 0 <= ord(ch) - SYLLABLE_BASE < SYLLABLE_COUNT
+
+
+@lru_cache(maxsize=None)
+def decompose_char(ch: str) -> str:
+    """
+    완성형 음절 하나를 호환 자모 문자열로 분해 (예: '발' -> 'ㅂㅏㄹ')
+    음절이 아니면 닮은꼴 치환만 해서 그대로 돌려줌
+    (글자 종류가 한정적이라 결과를 캐시해 둠)
+    """
+    code = ord(ch) - SYLLABLE_BASE
+    if not 0 <= code < SYLLABLE_COUNT:
+        return LOOKALIKES.get(ch, ch)
+
+    cho, rest = divmod(code, 21 * 28)
+    jung, jong = divmod(rest, 28)
+    return CHOSEONG[cho] + JUNGSEONG[jung] + JONGSEONG[jong]
+
+
+def decompose(text: str):
+    """
+    텍스트 전체를 자모 단위로 한 번에 분해
+    - jamo : 자모 1개 = 1글자인 문자열
+    - owner : jamo[i] 가 text 의 몇 번째 글자에서 나왔는지 (array('I'))
+    """
+    parts = []
+    owner = array("I")
+
+    for i, ch in enumerate(text):
+        d = decompose_char(ch)
+        parts.append(d)
+        if len(d) == 1:
+            owner.append(i)
+        else:
+            owner.extend([i] * len(d))
+
+    return "".join(parts), owner
+
+
+def _is_noise(ch: str) -> bool:
+    # 정규식 (?:\s|[\W_]) 와 같은 판정
+    return ch.isspace() or ch == "_" or not ch.isalnum()
+
+
+class JamoMatcher:
+    """
+    음절을 초성/중성/종성으로 쪼갠 자모 트라이로 욕설을 찾는 매처
+    (PatternMatcher 와 같은 finditer / search / sub 인터페이스)
+
+    단어 하나로 아래 형태를 모두 잡습니다. (예: '시발')
+    - 음절 그대로 : 시발, 시 발
+    - 자모 분리 : ㅅㅣㅂㅏㄹ, ㅅ1발
+    - 초성만 : ㅅㅂ, ㅅ.ㅂ
+
+    - 잡음(공백/특수문자)은 원래 단어의 음절 경계에서만 건너뜁니다.
+      ('개같' 이 '개가 틀렸다' 에 걸리지 않도록)
+    - 매칭은 입력 글자 경계에서 시작하고 끝나야 합니다.
+      ('시발' 이 '시바라' 의 ㄹ 초성까지만 먹고 끝나는 경우 제외)
+    - 숫자/기호 정규식 패턴은 PatternMatcher 로 따로 찾아서 합칩니다.
+    """
+
+    def __init__(self, badwords=(), regex_patterns=()):
+        self.trie = {}
+        # 순서를 유지하는 집합으로 사용 (단어 -> None)
+        self._words = {}
+
+        for w in badwords:
+            self._insert(w)
+
+        self.regex_patterns = list(regex_patterns)
+        self._regex = PatternMatcher((), self.regex_patterns) if self.regex_patterns else None
+
+    @property
+    def badwords(self):
+        return list(self._words)
+
+    # ------------------- 공개 API -------------------
+
+    def finditer(self, text: str):
+        """
+        (start, end, 원본 단어/패턴) 튜플을 왼쪽부터 차례로 돌려줌
+        """
+        spans = self._scan(text)
+
+        if self._regex is None:
+            yield from spans
+            return
+
+        # 두 결과를 시작 위치 순으로 합치고 겹치는 구간은 먼저 시작한 쪽을 남김
+        merged = sorted(spans + list(self._regex.finditer(text)), key=lambda s: (s[0], -s[1]))
+        last_end = 0
+        for span in merged:
+            if span[0] >= last_end:
+                yield span
+                last_end = span[1]
+
+    def search(self, text: str) -> bool:
+        for _ in self.finditer(text):
+            return True
+        return False
+
+    def sub(self, repl: str, text: str) -> str:
+        return apply_mask(text, self.finditer(text), repl)
+
+    def with_words(self, add=(), remove=(), regex_patterns=None) -> "JamoMatcher":
+        """
+        단어를 추가/삭제한 새 매처를 돌려줌 (self 는 바뀌지 않음)
+        트라이는 바뀐 키 경로의 노드만 복사합니다. (PatternMatcher.with_words 와 같은 방식)
+        """
+        new = copy.copy(self)
+        new.trie = dict(self.trie)
+        new._words = dict(self._words)
+
+        for w in add:
+            w = w.lower()
+            if not w or w in new._words:
+                continue
+            for key in self._keys(w):
+                nodes = cow_path(new.trie, key)
+                nodes[-1][_END] = nodes[-1].get(_END, ()) + (w,)
+            new._words[w] = None
+
+        for w in remove:
+            w = w.lower()
+            if w not in new._words:
+                continue
+            for key in self._keys(w):
+                node = find_path(new.trie, key)
+                if node is None or w not in node.get(_END, ()):
+                    continue
+                nodes = cow_path(new.trie, key)
+                rest = tuple(x for x in nodes[-1][_END] if x != w)
+                if rest:
+                    nodes[-1][_END] = rest
+                else:
+                    del nodes[-1][_END]
+                    prune_path(nodes, key)
+            del new._words[w]
+
+        if regex_patterns is not None and list(regex_patterns) != self.regex_patterns:
+            new.regex_patterns = list(regex_patterns)
+            new._regex = PatternMatcher((), new.regex_patterns) if new.regex_patterns else None
+
+        return new
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _insert(self, word: str):
+        word = word.lower()
+        if not word or word in self._words:
+            return
+
+        for key in self._keys(word):
+            node = self.trie
+            for sym in key:
+                node = node.setdefault(sym, {})
+            # 초성 키는 여러 단어가 같이 쓸 수 있음 (시발/시바 -> ㅅㅂ), 먼저 넣은 단어가 대표
+            node[_END] = node.get(_END, ()) + (word,)
+
+        self._words[word] = None
+
+    @staticmethod
+    def _keys(word: str) -> list:
+        """
+        단어 하나를 트라이에 넣을 키 목록으로 변환 (음절 경계마다 _GAP)
+        1) 전체 자모 키: 음절 사이에만 잡음 허용
+        2) 초성만 쓴 키: 2음절 이상이고 전부 완성형 음절일 때만
+        """
+        units = [[decompose_char(ch) for ch in word]]
+        if len(word) >= 2 and all(is_syllable(ch) for ch in word):
+            units.append([decompose_char(ch)[0] for ch in word])
+
+        keys = []
+        for unit_list in units:
+            key = []
+            for idx, unit in enumerate(unit_list):
+                if idx > 0:
+                    key.append(_GAP)
+                key.extend(unit)
+            keys.append(key)
+        return keys
+
+    def _scan(self, text: str) -> list:
+        jamo, owner = decompose(text)
+        n = len(jamo)
+        root = self.trie
+        spans = []
+
+        j = 0
+        while j < n:
+            # 글자의 첫 자모에서만 시작
+            if (j == 0 or owner[j] != owner[j - 1]) and jamo[j] in root:
+                hit = self._longest(jamo, owner, j)
+                if hit is not None:
+                    end, word = hit
+                    spans.append((owner[j], owner[end - 1] + 1, word))
+                    j = end
+                    continue
+            j += 1
+
+        return spans
+
+    def _longest(self, jamo, owner, start):
+        """
+        start 에서 시작하는 가장 긴 매칭의 (끝 위치, 단어), 없으면 None
+        (트라이를 따라가며 잡음 건너뛰기는 되돌아가기로 전부 시도)
+        """
+        n = len(jamo)
+        best = None
+        stack = [(self.trie, start)]
+
+        while stack:
+            node, j = stack.pop()
+
+            words = node.get(_END)
+            if words is not None and (j == n or owner[j] != owner[j - 1]):
+                if best is None or j > best[0]:
+                    best = (j, words[0])
+
+            gap = node.get(_GAP)
+            if gap is not None:
+                # 잡음 0 ~ MAX_NOISE 개를 건너뛴 위치들
+                stack.append((gap, j))
+                k = j
+                while k < n and k - j < MAX_NOISE and _is_noise(jamo[k]):
+                    k += 1
+                    stack.append((gap, k))
+
+            if j < n:
+                child = node.get(jamo[j])
+                if child is not None:
+                    stack.append((child, j + 1))
+
+        return best
@@ -1,98 +1,303 @@
-import re
-import unicodedata
+import threading
 import os
+from dataclasses import dataclass, field
+
+from .badwords import base_badwords, number_like_patterns
+from .batch import iter_map
+from .bundle import load_bundle
+from .cache import LRUCache
+from .jamo import JamoMatcher
+from .matcher import PatternMatcher, apply_mask
+from .utils import normalize_text, normalize_with_offsets
+from .wordlist import WordListWatcher, load_wordlist
+
+# analyze_many 에서 메시지를 이어 붙일 때 쓰는 구분자
+# (잡음 허용 개수(3)보다 길고 공백이 아니라서 두 메시지에 걸친 매칭이 생기지 않음)
+_BATCH_SEP = "\x00" * 4
+
+
+@dataclass
+class FilterResult:
+    """
+    analyze() 한 번으로 얻는 결과 묶음
+    - normalized : _normalize 를 거친 텍스트
+    - cleaned : normalized 에서 욕설 구간을 mask_token 으로 바꾼 텍스트
+    - has_profanity : 욕설이 하나라도 있으면 True
+    - spans : normalized 기준 (start, end, 걸린 단어/패턴) 목록
+    - masked : 원문(NFC)에서 욕설 구간만 mask_token 으로 바꾼 텍스트 (줄바꿈/대소문자 유지)
+    - original_spans : 원문(NFC) 기준 (start, end, 걸린 단어/패턴) 목록
+    """
+    text: str
+    normalized: str
+    cleaned: str
+    has_profanity: bool
+    spans: list = field(default_factory=list)
+    masked: str = ""
+    original_spans: list = field(default_factory=list)
+
 
 class ProfanityFilter:
-    def __init__(self, mask_token="***"):
+    def __init__(self, mask_token="***", badwords=None, number_patterns=None,
+                 cache_size=0, cache_ttl=None, cache_key="raw", matcher=None, mode="regex"):
         self.mask_token = mask_token
 
-        # 1) 기본 욕설/비속어 리스트 (예시 - 직접 확장해서 쓰셔야 합니다)
+        # 1) 기본 욕설/비속어 리스트 (badwords.py, 직접 확장해서 쓰셔야 합니다)
         #   너무 노골적인 건 줄였고, 실제에선 훨씬 더 많은 패턴이 필요합니다.
-        base_badwords = [
-            "씨발", "시발", "씹팔", "좆같", "존나", "존내", "병신", "병신같",
-            "개새끼", "개색기", "개같", "쓰레기", "닥쳐",
-            "ㅅㅂ", "ㅆㅂ", "ㅄ",'ㅈㄴ','^^ㅣ발',
-        ]
+        if badwords is None:
+            badwords = base_badwords
 
-        # 2) 각 단어를 '노이즈 허용 정규식'으로 변환
-        #   예: 씨발 -> ㅆ*ㅣ*발 / ㅆ+ㅣ+발+ 이런 식으로 변형 허용
-        self.patterns = [self._build_fuzzy_pattern(w) for w in base_badwords]
-
-        # 3) 숫자/영문으로 대체되는 욕 표현도 일부 패턴으로 포함 (예시)
+        # 2) 숫자/영문으로 대체되는 욕 표현도 일부 패턴으로 포함 (badwords.py)
         #   18 -> ㅆㅂ / 십팔 욕으로 쓰이는 경우
         #   10발 -> 시발 변형으로 쓰이는 경우 등
-        number_like_patterns = [
-            r"1\s*8",         # 18
-            r"10\s*발",       # 10발, 10발아...
-        ]
-        self.patterns.extend([re.compile(p, re.IGNORECASE) for p in number_like_patterns])
+        if number_patterns is None:
+            number_patterns = number_like_patterns
+
+        # 3) 모든 단어를 '노이즈 허용' 트라이 정규식 하나로 합쳐서 컴파일
+        #   예: 씨발 -> 씨(잡음)발 / 단어 수가 늘어나도 텍스트는 한 번만 스캔
+        #   (미리 컴파일된 matcher 를 받으면 컴파일을 건너뜀 -> from_bundle)
+        #   mode="jamo" 면 자모 트라이 매처 사용 (씨발 하나로 ㅆㅂ, ㅆㅣㅂㅏㄹ 까지 처리)
+        if matcher is None:
+            if mode == "regex":
+                matcher = PatternMatcher(badwords, number_patterns)
+            elif mode == "jamo":
+                matcher = JamoMatcher(badwords, number_patterns)
+            else:
+                raise ValueError(f"mode must be 'regex' or 'jamo', got {mode!r}")
+
+        self.badwords = list(matcher.badwords)
+        self.number_patterns = list(matcher.regex_patterns)
+
+        # (매처, 세대 번호) 를 한 덩어리로 교체해야 읽는 쪽이 짝이 안 맞는 값을 보지 않음
+        self._state = (matcher, 0)
+        self._update_lock = threading.Lock()
+
+        # 4) (선택) 반복 메시지용 결과 캐시
+        #   cache_size > 0 일 때만 켜짐, cache_key 는 "raw"(원문) 또는 "normalized"
+        if cache_key not in ("raw", "normalized"):
+            raise ValueError(f"cache_key must be 'raw' or 'normalized', got {cache_key!r}")
+        self.cache_key = cache_key
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size > 0 else None
+
+    @classmethod
+    def from_bundle(cls, path, **kwargs) -> "ProfanityFilter":
+        """
+        bundle.compile_bundle 로 미리 만들어 둔 번들 파일에서 바로 필터 생성
+        (단어 목록 컴파일을 건너뛰므로 워커/서버리스 콜드 스타트가 빨라짐)
+        """
+        return cls(matcher=load_bundle(path), **kwargs)
+
+    @property
+    def matcher(self):
+        return self._state[0]
+
+    @matcher.setter
+    def matcher(self, new_matcher):
+        # 단어 목록이 바뀌면 이전 결과는 더 이상 유효하지 않음
+        # (세대 번호가 캐시 키에 들어가므로, 교체 도중 들어온 결과도 섞이지 않음)
+        self._state = (new_matcher, self._state[1] + 1)
+        self.badwords = list(new_matcher.badwords)
+        self.number_patterns = list(new_matcher.regex_patterns)
+        if self.cache is not None:
+            self.cache.clear()
 
     # ------------------- 공개 API -------------------
 
+    def analyze(self, text: str) -> FilterResult:
+        """
+        정규화 1번 + 스캔 1번으로 치환 결과, 욕설 여부, 매칭 구간을 한꺼번에 계산
+        (캐시가 켜져 있으면 같은 메시지는 다시 계산하지 않음)
+        """
+        matcher, generation = self._state
+
+        cache = self.cache
+        if cache is None:
+            return self._analyze(text, matcher)
+
+        if self.cache_key == "raw":
+            key = (generation, text)
+            result = cache.get(key)
+            if result is None:
+                result = self._analyze(text, matcher)
+                cache.put(key, result)
+            return result
+
+        norm, offsets, source = normalize_with_offsets(text)
+        key = (generation, norm)
+        result = cache.get(key)
+        if result is None:
+            result = self._build_result(text, norm, offsets, source, list(matcher.finditer(norm)))
+            cache.put(key, result)
+        elif result.text != text:
+            # 정규화 결과가 같아도 원문은 다를 수 있으므로 원문 기준 값만 다시 계산
+            result = self._build_result(text, norm, offsets, source, result.spans)
+        return result
+
+    def analyze_many(self, texts) -> list:
+        """
+        여러 메시지를 analyze (입력 순서 유지)
+        정규화는 메시지마다 하고, 스캔은 구분자로 이어 붙인 텍스트에 한 번만 돌림
+        - 캐시가 켜져 있으면 메시지마다 analyze (캐시 적중이 더 쌈)
+        - 매칭이 구분자에 걸치면 (특이한 정규식 패턴 등) 메시지마다 다시 스캔
+        """
+        texts = list(texts)
+        matcher = self._state[0]
+        if self.cache is not None or len(texts) < 2:
+            return [self.analyze(text) for text in texts]
+
+        normed = [normalize_with_offsets(text) for text in texts]
+        starts = []
+        pos = 0
+        for norm, _, _ in normed:
+            starts.append(pos)
+            pos += len(norm) + len(_BATCH_SEP)
+
+        per_text = [[] for _ in texts]
+        i = 0
+        for s, e, w in matcher.finditer(_BATCH_SEP.join(norm for norm, _, _ in normed)):
+            while i + 1 < len(starts) and s >= starts[i + 1]:
+                i += 1
+            base = starts[i]
+            if e > base + len(normed[i][0]):
+                return [self._analyze(text, matcher) for text in texts]
+            per_text[i].append((s - base, e - base, w))
+
+        return [self._build_result(text, norm, offsets, source, spans)
+                for text, (norm, offsets, source), spans in zip(texts, normed, per_text)]
+
     def clean(self, text: str) -> str:
         """
         욕설을 탐지하여 mask_token으로 치환한 텍스트를 반환
         """
-        norm = self._normalize(text)
-        cleaned = norm
-
-        for pat in self.patterns:
-            cleaned = pat.sub(self.mask_token, cleaned)
+        return self.analyze(text).cleaned
 
-        return cleaned
+    def mask(self, text: str) -> str:
+        """
+        원문 형태(줄바꿈, 대소문자, 전각 문자 등)는 그대로 두고 욕설 구간만 mask_token 으로 치환
+        """
+        return self.analyze(text).masked
 
     def has_profanity(self, text: str) -> bool:
         """
         욕설이 하나라도 포함되어 있으면 True
         """
-        norm = self._normalize(text)
-        return any(p.search(norm) for p in self.patterns)
-
-    # ------------------- 내부 유틸 -------------------
+        return self.analyze(text).has_profanity
 
-    def _normalize(self, text: str) -> str:
+    def clean_many(self, texts, workers=None, chunksize=256) -> list:
         """
-        - 유니코드 정규화
-        - 전각/반각 통일
-        - 영어 소문자화
-        - 한글 자모가 띄어져 있는 경우 약간 정리 (아주 완벽하진 않음)
-        - 불필요한 반복 문자 줄이기 (ㅋㅋㅋㅋ -> ㅋㅋ 정도)
+        여러 문장을 한 번에 clean (입력 순서 유지)
+        workers=N 이면 N개의 프로세스로 나눠서 처리
         """
-        # 유니코드 정규화
-        text = unicodedata.normalize("NFC", text)
+        return list(iter_map(self, "clean", texts, workers, chunksize))
 
-        # 영어 소문자
-        text = text.lower()
+    def has_profanity_many(self, texts, workers=None, chunksize=256) -> list:
+        """
+        여러 문장을 한 번에 has_profanity (입력 순서 유지)
+        workers=N 이면 N개의 프로세스로 나눠서 처리
+        """
+        return list(iter_map(self, "has_profanity", texts, workers, chunksize))
 
-        # 반복 문자 줄이기 (3번 이상 반복 -> 2번으로)
-        text = re.sub(r"(.)\1{2,}", r"\1\1", text)
+    def add_words(self, words):
+        """
+        실행 중에 단어 추가 (바뀐 부분만 다시 컴파일해서 매처를 통째로 교체)
+        """
+        self._update(add=words)
 
-        # 흔한 웃음/방언/이모티콘은 관심 없으면 미리 정리 가능 (선택)
-        # text = re.sub(r"[ㅋㅎ]+", "ㅋ", text)
+    def remove_words(self, words):
+        """
+        실행 중에 단어 삭제
+        """
+        self._update(remove=words)
 
-        # 양쪽 공백 정리
-        text = re.sub(r"\s+", " ", text).strip()
+    def set_words(self, badwords, number_patterns=None):
+        """
+        단어 목록을 badwords 로 맞춤 (기존 목록과의 차이만 반영)
+        number_patterns 를 주면 숫자/기호 패턴도 교체
+        """
+        target = [w.lower() for w in badwords]
+        target_set = set(target)
+
+        # 차이 계산도 같은 lock 안에서 (그 사이에 add_words 등이 끼면 그 변경이 사라짐)
+        with self._update_lock:
+            current = set(self.matcher.badwords)
+            self.matcher = self.matcher.with_words(
+                add=[w for w in target if w not in current],
+                remove=[w for w in current if w not in target_set],
+                regex_patterns=number_patterns,
+            )
+
+    def reload(self, path):
+        """
+        단어 목록 파일(wordlist.load_wordlist 형식)을 다시 읽어서 반영
+        """
+        badwords, patterns = load_wordlist(path)
+        self.set_words(badwords, patterns)
 
-        return text
+    def watch(self, path, interval=1.0) -> WordListWatcher:
+        """
+        단어 목록 파일이 바뀔 때마다 자동으로 reload 하는 감시 스레드를 시작
+        (멈출 때는 반환된 watcher.stop())
+        """
+        watcher = WordListWatcher(path, self.set_words, interval)
+        watcher.start()
+        return watcher
 
-    def _build_fuzzy_pattern(self, badword: str) -> re.Pattern:
+    def cache_info(self) -> dict:
         """
-        기본 욕 단어를 받아서, 중간에 노이즈(공백, 특수문자 등)가 끼어도
-        인식할 수 있게 정규식 패턴으로 바꿉니다.
-        예: '씨발' -> 'ㅆ\s*[\W_]*ㅣ\s*[\W_]*발' 느낌
+        캐시 적중/실패 횟수와 크기 (캐시가 꺼져 있으면 빈 dict)
         """
-        # 자주 쓰이는 한글 욕의 경우 초성/중성 분리까지 할 수 있지만
-        # 여기선 간단히: 글자 사이에 특수문자/공백 몇 개 허용 정도로 처리
-        escaped = [re.escape(ch) for ch in badword]
+        return self.cache.info() if self.cache is not None else {}
 
-        # 글자 하나마다 "중간에 잡음 허용" 패턴 끼워 넣기
-        # \s* : 공백
-        # [\W_]* : 영문/숫자 제외 특수문자들
-        noise = r"(?:\s|[\W_]){0,3}"
-        fuzzy = noise.join(escaped)
+    def clear_cache(self):
+        if self.cache is not None:
+            self.cache.clear()
 
-        pattern = re.compile(fuzzy, re.IGNORECASE)
-        return pattern
+    # ------------------- 내부 유틸 -------------------
+
+    def _update(self, add=(), remove=(), regex_patterns=None):
+        # 쓰는 쪽끼리만 lock, 읽는 쪽(clean 등)은 교체 전/후 매처 중 하나를 온전히 봄
+        with self._update_lock:
+            self.matcher = self.matcher.with_words(add, remove, regex_patterns)
+
+    def _analyze(self, text: str, matcher) -> FilterResult:
+        norm, offsets, source = normalize_with_offsets(text)
+        return self._build_result(text, norm, offsets, source, list(matcher.finditer(norm)))
+
+    def _build_result(self, text, norm, offsets, source, spans) -> FilterResult:
+        # normalized 기준 구간을 offsets 로 원문 위치에 되돌려서 원문에도 마스킹
+        original_spans = [(offsets[s], offsets[e - 1] + 1, w) for s, e, w in spans if e > s]
+
+        return FilterResult(
+            text=text,
+            normalized=norm,
+            cleaned=apply_mask(norm, spans, self.mask_token),
+            has_profanity=bool(spans),
+            spans=spans,
+            masked=apply_mask(source, original_spans, self.mask_token),
+            original_spans=original_spans,
+        )
+
+    def _init_kwargs(self) -> dict:
+        """
+        워커 프로세스에서 같은 필터를 다시 만들 때 쓰는 생성자 인자
+        (매처는 컴파일된 정규식 소스 형태로 넘어가므로 워커에서 다시 조립하지 않음)
+        """
+        return {
+            "mask_token": self.mask_token,
+            "matcher": self.matcher,
+            "cache_size": self.cache.maxsize if self.cache is not None else 0,
+            "cache_ttl": self.cache.ttl if self.cache is not None else None,
+            "cache_key": self.cache_key,
+        }
+
+    def _normalize(self, text: str) -> str:
+        """
+        - 유니코드 정규화
+        - 전각/반각 통일
+        - 영어 소문자화
+        - 불필요한 반복 문자 줄이기 (ㅋㅋㅋㅋ -> ㅋㅋ 정도)
+        (실제 구현은 utils.normalize_text, 치환표 + 정규식 한 번으로 처리)
+        """
+        return normalize_text(text)
 
 # ----------------- 실행 및 파일 저장 로직 -----------------
 
@@ -120,10 +325,11 @@ def save_filtered_results(filter_instance, text_list, output_folder="filtered_re
 
             f.write(f"[Example {idx}]\n")
             
-            # 전체 텍스트를 한 번에 처리
-            # 주의: 현재 _normalize 로직에 의해 줄바꿈이 공백으로 바뀔 수 있습니다.
-            cleaned_text = filter_instance.clean(text)
-            is_bad = filter_instance.has_profanity(text)
+            # 전체 텍스트를 한 번에 처리 (정규화/스캔은 analyze 안에서 1번만)
+            # masked 는 원문 줄바꿈을 그대로 유지한 채 욕설만 가린 결과
+            result = filter_instance.analyze(text)
+            cleaned_text = result.masked
+            is_bad = result.has_profanity
             
             # 파일에 기록할 포맷
             f.write(f"원문:\n{text}\n\n")
@@ -0,0 +1,351 @@
+import copy
+import re
+
+# 글자 사이에 끼어드는 잡음 (공백, 특수문자 최대 3개)
+NOISE = r"(?:\s|[\W_]){0,3}"
+
+# 트라이 노드에서 "여기서 단어가 끝난다"를 표시하는 키 (실제 글자와 겹치지 않음)
+_END = ""
+
+
+def apply_mask(text: str, spans, repl: str) -> str:
+    """
+    (start, end, ...) 구간들을 repl 로 바꾼 문자열을 돌려줌
+    (spans 는 왼쪽부터 정렬되어 있고 서로 겹치지 않아야 함)
+    """
+    pieces = []
+    last = 0
+    for start, end, *_ in spans:
+        pieces.append(text[last:start])
+        pieces.append(repl)
+        last = end
+
+    if not pieces:
+        return text
+
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def find_path(root, path):
+    """
+    path 를 따라 내려간 노드 (없으면 None), 트라이는 건드리지 않음
+    """
+    node = root
+    for key in path:
+        node = node.get(key)
+        if node is None:
+            return None
+    return node
+
+
+def cow_path(root, path):
+    """
+    root 에서 path 를 따라 내려가면서 지나가는 노드를 복사해서 바꿔 끼움 (없으면 새로 만듦)
+    root 는 호출하는 쪽에서 이미 복사해 둔 dict 여야 합니다.
+    -> 기존 트라이를 읽고 있는 스레드는 예전 노드를 그대로 보게 됨 (copy-on-write)
+    반환값은 root 부터 path 끝까지의 (복사된) 노드 목록
+    """
+    nodes = [root]
+    node = root
+    for key in path:
+        child = node.get(key)
+        child = {} if child is None else dict(child)
+        node[key] = child
+        node = child
+        nodes.append(child)
+    return nodes
+
+
+def prune_path(nodes, path):
+    """
+    cow_path 로 얻은 노드 목록에서 비어버린 노드를 아래서부터 지움
+    """
+    for i in range(len(path), 0, -1):
+        if nodes[i]:
+            break
+        del nodes[i - 1][path[i - 1]]
+
+
+class PatternMatcher:
+    """
+    욕설 단어 목록 전체를 한 번에 컴파일해서
+    텍스트를 한 번만 훑고 모든 매칭을 찾아내는 매처
+
+    - 단어들은 글자 단위 트라이로 묶인 뒤 "첫 글자별" 정규식으로 변환됩니다.
+    - 스캔 정규식은 단어의 첫 글자 집합만 보고 후보 위치를 찾고,
+      후보 위치에서는 그 글자로 시작하는 정규식 하나만 시도합니다.
+      (단어가 수천 개여도 위치당 비용은 거의 늘지 않음)
+    - 첫 글자별 정규식은 처음 쓰일 때 컴파일합니다. (시작 시간 단축)
+    - 글자 사이에는 NOISE 를 허용 (공백/특수문자 최대 3개, 예: '씨 발', '씨.*발')
+    - 같은 위치에서는 더 긴 단어가 우선 매칭됩니다. (병신같 > 병신)
+    - 어떤 단어에 걸렸는지는 종료 지점의 이름 그룹으로 알아냅니다.
+    - with_words() 로 단어를 추가/삭제하면 바뀐 첫 글자의 정규식만 다시 만든
+      새 매처를 돌려줍니다. (기존 매처는 그대로라 교체 전까지 안전하게 사용 가능)
+    """
+
+    def __init__(self, badwords=(), regex_patterns=()):
+        self.trie = {}
+        self.badwords = []
+
+        for w in badwords:
+            self._insert(w)
+
+        # 숫자/기호 기반 패턴은 정규식 그대로 사용
+        self.regex_patterns = list(regex_patterns)
+
+        self._sources = {}
+        self._labels = {}
+        self._branches = {}
+        for ch in self.trie:
+            self._build_branch(ch)
+
+        self._build_extra()
+        self._build_scan()
+
+    # ------------------- 공개 API -------------------
+
+    def finditer(self, text: str):
+        """
+        (start, end, 원본 단어/패턴) 튜플을 왼쪽부터 차례로 돌려줌
+        (겹치는 매칭은 먼저 시작한 쪽이 가져감)
+        """
+        scan = self._scan
+        if scan is None:
+            return
+
+        branches = self._branches
+        labels = self._labels
+        extra = self._extra
+        extra_labels = self._extra_labels
+
+        pos = 0
+        while True:
+            m = scan.search(text, pos)
+            if m is None:
+                return
+
+            i = m.start()
+            if m.lastgroup is not None:
+                # 숫자/기호 패턴
+                end = m.end()
+                yield i, end, extra_labels[m.lastgroup]
+                pos = end if end > i else i + 1
+                continue
+
+            # 단어 첫 글자 후보 -> 그 글자로 시작하는 정규식만 시도
+            ch = text[i]
+            branch = branches.get(ch)
+            if branch is None:
+                branch = self._compile_branch(ch)
+
+            hit = branch.match(text, i)
+            if hit is not None:
+                label = labels[ch][hit.lastgroup]
+            elif extra is not None:
+                hit = extra.match(text, i)
+                if hit is not None:
+                    label = extra_labels[hit.lastgroup]
+
+            if hit is None:
+                pos = i + 1
+                continue
+
+            end = hit.end()
+            yield i, end, label
+            pos = end if end > i else i + 1
+
+    def search(self, text: str) -> bool:
+        for _ in self.finditer(text):
+            return True
+        return False
+
+    def sub(self, repl: str, text: str) -> str:
+        return apply_mask(text, self.finditer(text), repl)
+
+    def with_words(self, add=(), remove=(), regex_patterns=None) -> "PatternMatcher":
+        """
+        단어를 추가/삭제한 새 매처를 돌려줌 (self 는 바뀌지 않음)
+        - 트라이는 바뀐 경로의 노드만 복사하고
+        - 정규식은 바뀐 첫 글자의 분기만 다시 만듭니다.
+        - regex_patterns 를 주면 숫자/기호 패턴 목록도 교체
+        """
+        new = copy.copy(self)
+        new.trie = dict(self._get_trie())
+        new.badwords = list(self.badwords)
+        new._sources = dict(self._sources)
+        new._labels = dict(self._labels)
+        new._branches = dict(self._branches)
+
+        touched = set()
+        for w in add:
+            w = w.lower()
+            node = find_path(new.trie, w)
+            if not w or (node is not None and _END in node):
+                continue
+            nodes = cow_path(new.trie, w)
+            nodes[-1][_END] = w
+            new.badwords.append(w)
+            touched.add(w[0])
+
+        for w in remove:
+            w = w.lower()
+            node = find_path(new.trie, w)
+            if not w or node is None or _END not in node:
+                continue
+            nodes = cow_path(new.trie, w)
+            del nodes[-1][_END]
+            prune_path(nodes, w)
+            new.badwords.remove(w)
+            touched.add(w[0])
+
+        first_chars = set(self._sources)
+        for ch in touched:
+            new._build_branch(ch)
+
+        if regex_patterns is not None and list(regex_patterns) != self.regex_patterns:
+            new.regex_patterns = list(regex_patterns)
+            new._build_extra()
+            new._build_scan()
+        elif set(new._sources) != first_chars:
+            new._build_scan()
+
+        return new
+
+    def to_dict(self) -> dict:
+        """
+        컴파일 결과(정규식 소스)를 JSON 으로 저장할 수 있는 dict 로 변환
+        """
+        return {
+            "badwords": self.badwords,
+            "regex_patterns": self.regex_patterns,
+            "sources": self._sources,
+            "labels": self._labels,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "PatternMatcher":
+        """
+        to_dict() 결과로부터 트라이 생성/정규식 조립 없이 바로 매처를 만듦
+        """
+        self = cls.__new__(cls)
+        self.__setstate__(state)
+        return self
+
+    # pickle (프로세스 풀로 보낼 때) 도 같은 형식을 사용
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.badwords = list(state["badwords"])
+        self.regex_patterns = list(state["regex_patterns"])
+        self._sources = dict(state["sources"])
+        self._labels = {ch: dict(names) for ch, names in state["labels"].items()}
+        self._branches = {}
+
+        # 트라이는 저장하지 않음 (단어 추가/삭제가 필요할 때만 다시 만듦)
+        self.trie = None
+
+        self._build_extra()
+        self._build_scan()
+
+    # ------------------- 내부 유틸 -------------------
+
+    def _insert(self, word: str):
+        word = word.lower()
+        if not word:
+            return
+
+        node = self.trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+
+        if _END not in node:
+            self.badwords.append(word)
+        node[_END] = word
+
+    def _get_trie(self):
+        # from_dict 로 만든 매처는 처음 수정할 때 한 번만 트라이를 복원
+        if self.trie is None:
+            trie = {}
+            for w in self.badwords:
+                node = trie
+                for ch in w:
+                    node = node.setdefault(ch, {})
+                node[_END] = w
+            self.trie = trie
+        return self.trie
+
+    def _build_branch(self, ch: str):
+        """
+        첫 글자 ch 로 시작하는 단어들의 정규식 소스를 다시 만듦
+        (텍스트는 이미 소문자라 IGNORECASE 불필요)
+        """
+        self._branches.pop(ch, None)
+
+        child = self.trie.get(ch)
+        if child is None:
+            self._sources.pop(ch, None)
+            self._labels.pop(ch, None)
+            return
+
+        names = {}
+        self._sources[ch] = re.escape(ch) + self._emit_after(child, names)
+        self._labels[ch] = names
+
+    def _build_extra(self):
+        extras = []
+        names = {}
+        for i, p in enumerate(self.regex_patterns):
+            name = f"p{i}"
+            names[name] = p
+            extras.append(f"(?P<{name}>{p})")
+
+        self._extra_labels = names
+        self._extra_sources = extras
+        self._extra = re.compile("|".join(extras), re.IGNORECASE) if extras else None
+
+    def _build_scan(self):
+        # 후보 위치 찾기용: 첫 글자 집합 | 숫자/기호 패턴
+        # 단어 분기는 소문자 그대로 대소문자를 구분하므로 첫 글자 집합만 (?-i:...) 로 IGNORECASE 를 끔
+        # (대문자 후보가 걸리면 그 글자의 분기가 없음)
+        scan = []
+        if self._sources:
+            scan.append("(?-i:[" + "".join(re.escape(ch) for ch in self._sources) + "])")
+        scan.extend(self._extra_sources)
+        self._scan = re.compile("|".join(scan), re.IGNORECASE) if scan else None
+
+    def _compile_branch(self, ch: str) -> re.Pattern:
+        # 여러 스레드가 동시에 컴파일해도 결과가 같으므로 lock 은 필요 없음
+        pattern = re.compile(self._sources[ch])
+        self._branches[ch] = pattern
+        return pattern
+
+    def _emit_children(self, node, names) -> str:
+        alts = [
+            re.escape(ch) + self._emit_after(child, names)
+            for ch, child in node.items()
+            if ch != _END
+        ]
+        if len(alts) == 1:
+            return alts[0]
+        return "(?:" + "|".join(alts) + ")"
+
+    def _emit_after(self, node, names) -> str:
+        """
+        한 글자를 소비한 직후의 정규식 조각
+        (다음 글자로 이어지는 분기가 먼저, 단어 종료가 나중 -> 긴 단어 우선)
+        """
+        parts = []
+
+        if len(node) > 1 or _END not in node:
+            parts.append(NOISE + self._emit_children(node, names))
+
+        if _END in node:
+            name = f"w{len(names)}"
+            names[name] = node[_END]
+            parts.append(f"(?P<{name}>)")
+
+        if len(parts) == 1:
+            return parts[0]
+        return "(?:" + "|".join(parts) + ")"
@@ -0,0 +1,142 @@
+import argparse
+import json
+import sys
+from collections import deque
+
+from .batch import iter_map
+from .main import ProfanityFilter
+
+
+def filter_lines(lines, filter_instance, fmt="text", field="text", chunk_size=1000, workers=None,
+                 method="mask", stats=None):
+    """
+    줄 단위 입력을 하나씩 읽어서 욕설을 가린 줄을 순서대로 돌려주는 제너레이터
+    (입력 전체를 메모리에 올리지 않음)
+
+    - fmt="text" : 한 줄 = 메시지 하나
+    - fmt="jsonl" : 한 줄 = JSON 객체 하나, field 에 든 문자열만 정제해서 다시 JSON 으로
+    - method="mask" 면 원문 형태(대소문자, 공백, 전각 문자 등)는 그대로 두고 욕설만 가림
+      method="clean" 이면 정규화된 텍스트로 바꿔서 씀
+    - JSON 으로 읽을 수 없는 줄은 건너뛰고 stats["skipped"] 에 개수를 셈 (나머지 줄은 계속 처리)
+    - workers=N 이면 chunk_size 줄씩 묶어 프로세스 풀로 보냄
+    """
+    if method not in ("mask", "clean"):
+        raise ValueError(f"[filter_lines] method must be 'mask' or 'clean', got {method!r}")
+    if stats is None:
+        stats = {}
+    stats.setdefault("skipped", 0)
+
+    # 풀로 보낸 텍스트에 대응하는 레코드 (결과가 돌아오는 순서와 같음)
+    pending = deque()
+
+    def texts():
+        for line in lines:
+            line = line.rstrip("\r\n")
+
+            if fmt == "jsonl":
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 깨진 줄 하나 때문에 전체 실행이 멈추지 않도록 (원문이 그대로 나가지 않게 버림)
+                    stats["skipped"] += 1
+                    continue
+                text = record.get(field) if isinstance(record, dict) else None
+                pending.append((record, isinstance(text, str)))
+                yield text if isinstance(text, str) else ""
+            else:
+                pending.append((None, True))
+                yield line
+
+    for cleaned in iter_map(filter_instance, method, texts(), workers, chunk_size):
+        record, has_text = pending.popleft()
+
+        if fmt != "jsonl":
+            yield cleaned
+            continue
+
+        if has_text:
+            record[field] = cleaned
+        yield json.dumps(record, ensure_ascii=False)
+
+
+def filter_stream(infile, outfile, filter_instance, fmt="text", field="text", chunk_size=1000, workers=None,
+                  method="mask", stats=None):
+    """
+    infile 에서 읽어 outfile 로 chunk_size 줄씩 바로바로 써 줌
+    처리한 줄 수를 반환 (건너뛴 줄 수는 stats["skipped"])
+    """
+    count = 0
+    buf = []
+
+    for line in filter_lines(infile, filter_instance, fmt, field, chunk_size, workers, method, stats):
+        buf.append(line + "\n")
+        count += 1
+
+        if len(buf) >= chunk_size:
+            outfile.writelines(buf)
+            outfile.flush()
+            buf.clear()
+
+    if buf:
+        outfile.writelines(buf)
+        outfile.flush()
+
+    return count
+
+
+def _open_input(path):
+    if path == "-":
+        sys.stdin.reconfigure(encoding="utf-8", errors="replace")
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _open_output(path):
+    if path == "-":
+        sys.stdout.reconfigure(encoding="utf-8")
+        return sys.stdout
+    return open(path, "w", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="채팅 로그를 줄 단위로 읽어 욕설을 가려서 저장")
+    parser.add_argument("input", nargs="?", default="-", help="입력 파일 (생략하거나 - 면 stdin)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (생략하거나 - 면 stdout)")
+    parser.add_argument("--format", choices=["auto", "text", "jsonl"], default="auto",
+                        help="입력 형식 (auto 면 확장자가 .jsonl 일 때만 jsonl)")
+    parser.add_argument("--field", default="text", help="jsonl 에서 정제할 키 이름")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="한 번에 처리/기록할 줄 수")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: 단일 프로세스)")
+    parser.add_argument("--mask", default="***", help="욕설 대신 넣을 문자열")
+    parser.add_argument("--clean", action="store_true",
+                        help="원문 대신 정규화된 텍스트(소문자화, 반복/공백 줄임 등)로 저장")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt == "auto":
+        fmt = "jsonl" if args.input.endswith(".jsonl") else "text"
+
+    f = ProfanityFilter(mask_token=args.mask)
+
+    method = "clean" if args.clean else "mask"
+    stats = {"skipped": 0}
+
+    infile = _open_input(args.input)
+    outfile = _open_output(args.output)
+    try:
+        count = filter_stream(infile, outfile, f, fmt, args.field, args.chunk_size, args.workers, method, stats)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    print(f"처리 완료: {count}줄", file=sys.stderr)
+    if stats["skipped"]:
+        print(f"JSON 으로 읽을 수 없어 건너뛴 줄: {stats['skipped']}줄", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
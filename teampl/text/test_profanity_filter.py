@@ -0,0 +1,390 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from teampl.text.aio import AsyncProfanityFilter
+from teampl.text.bench import compare_throughput, make_corpus
+from teampl.text.bundle import compile_bundle, load_bundle
+from teampl.text.cache import LRUCache
+from teampl.text.jamo import decompose
+from teampl.text.main import ProfanityFilter
+from teampl.text.matcher import PatternMatcher
+from teampl.text.stream import filter_stream
+
+
+#   Matcher Tests
+
+class TestPatternMatcher(unittest.TestCase):
+    def test_noise_between_letters(self):
+        """글자 사이에 공백/특수문자가 끼어도 매칭되는지 확인하기 위해"""
+        m = PatternMatcher(["씨발"])
+        self.assertEqual(list(m.finditer("씨 . 발 놈아")), [(0, 5, "씨발")])
+
+    def test_longest_word_wins(self):
+        """같은 위치에서 시작하면 더 긴 단어가 우선이어야 함"""
+        m = PatternMatcher(["병신", "병신같"])
+        self.assertEqual(list(m.finditer("이런 병신같은")), [(3, 6, "병신같")])
+
+    def test_regex_patterns_reported(self):
+        """숫자 패턴도 어떤 패턴에 걸렸는지 알려줘야 함"""
+        m = PatternMatcher(["씨발"], [r"1\s*8"])
+        self.assertEqual(list(m.finditer("1 8 씨발")), [(0, 3, r"1\s*8"), (4, 6, "씨발")])
+
+    def test_empty_matcher(self):
+        """단어가 하나도 없으면 아무것도 매칭하지 않아야 함"""
+        m = PatternMatcher()
+        self.assertFalse(m.search("씨발"))
+        self.assertEqual(m.sub("***", "씨발"), "씨발")
+
+    def test_mixed_case_input(self):
+        """정규화 안 된 대문자가 들어와도 죽지 않고 소문자 단어만 매칭해야 함"""
+        m = PatternMatcher(["fuck"], [r"f\s*u"])
+        self.assertEqual(list(m.finditer("FUCK fuck")), [(0, 2, r"f\s*u"), (5, 9, "fuck")])
+        self.assertFalse(PatternMatcher(["fuck"]).search("FUCK"))
+
+
+#   Jamo Matcher Tests
+
+class TestJamo(unittest.TestCase):
+    def setUp(self):
+        self.f = ProfanityFilter(mode="jamo", badwords=["시발", "개같"], number_patterns=[])
+
+    def test_decompose_keeps_owner(self):
+        """자모마다 원래 글자 위치를 기억해야 함"""
+        jamo, owner = decompose("발ㅋ")
+        self.assertEqual(jamo, "ㅂㅏㄹㅋ")
+        self.assertEqual(list(owner), [0, 0, 0, 1])
+
+    def test_one_entry_covers_variants(self):
+        """단어 하나로 음절/자모 분리/초성/닮은꼴 표기를 모두 잡아야 함"""
+        for text in ["시발", "시 발", "ㅅㅣㅂㅏㄹ", "ㅅㅂ", "ㅅ.ㅂ", "ㅅ1발"]:
+            self.assertEqual(self.f.clean(text), "***", text)
+
+    def test_no_false_positive_across_syllables(self):
+        """음절 중간에 잡음이 끼거나 글자 중간에서 끝나면 걸리면 안 됨"""
+        for text in ["수박", "시바라", "개가 틀렸다", "았ㅂ"]:
+            self.assertFalse(self.f.has_profanity(text), text)
+
+
+#   ProfanityFilter Tests
+
+class TestProfanityFilter(unittest.TestCase):
+    def setUp(self):
+        self.f = ProfanityFilter()
+
+    def test_clean_masks_every_hit(self):
+        """한 문장에 욕이 여러 개 있어도 모두 치환되는지 확인하기 위해"""
+        self.assertEqual(self.f.clean("개새끼야 개같네"), "***야 ***네")
+
+    def test_has_profanity(self):
+        self.assertTrue(self.f.has_profanity("와~~! ^^ㅣ발"))
+        self.assertFalse(self.f.has_profanity("헛개수? 헛수고 박수"))
+
+    def test_analyze_collects_everything(self):
+        """analyze 한 번에 정규화/치환/여부/구간이 모두 채워지는지 확인하기 위해"""
+        r = self.f.analyze("  이런   씨발  ")
+        self.assertEqual(r.normalized, "이런 씨발")
+        self.assertEqual(r.cleaned, "이런 ***")
+        self.assertTrue(r.has_profanity)
+        self.assertEqual(r.spans, [(3, 5, "씨발")])
+
+    def test_custom_word_list(self):
+        """생성자에 넘긴 단어 목록만 사용해야 함"""
+        f = ProfanityFilter(mask_token="#", badwords=["바보"], number_patterns=[])
+        self.assertEqual(f.clean("바 보 씨발"), "# 씨발")
+
+    def test_fullwidth_and_whitespace_folding(self):
+        """전각 문자/특수 공백/반복 문자가 한 번에 정리되는지 확인"""
+        self.assertEqual(self.f._normalize("ＡＢＣ　ㅋㅋㅋㅋ\t\n 끝"), "abc ㅋㅋ 끝")
+
+    def test_mask_keeps_original_layout(self):
+        """mask 는 줄바꿈과 대소문자를 그대로 두고 욕설만 가려야 함"""
+        r = self.f.analyze("Hi\n이런\n씨  발\n")
+        self.assertEqual(r.masked, "Hi\n이런\n***\n")
+        self.assertEqual(r.original_spans, [(6, 10, "씨발")])
+        self.assertEqual(self.f.mask("정상 문장\n"), "정상 문장\n")
+
+
+#   Batch API Tests
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.f = ProfanityFilter()
+        self.texts = ["이런 씨발", "안녕하세요", "ㅈㄴ 잘하는데", ""] * 5
+
+    def test_clean_many_keeps_order(self):
+        """clean_many 결과가 clean 을 하나씩 부른 것과 같은 순서/값이어야 함"""
+        expected = [self.f.clean(t) for t in self.texts]
+        self.assertEqual(self.f.clean_many(self.texts), expected)
+
+    def test_process_pool_matches_serial(self):
+        """workers 를 써도 결과가 단일 프로세스와 같아야 함"""
+        expected = self.f.has_profanity_many(self.texts)
+        got = self.f.has_profanity_many(iter(self.texts), workers=2, chunksize=3)
+        self.assertEqual(got, expected)
+
+    def test_analyze_many_matches_analyze(self):
+        """이어 붙여서 한 번에 스캔해도 메시지마다 analyze 한 것과 같아야 함"""
+        texts = self.texts + ["씨", "발 안녕", "ㅅ!ㅂ", "fuck", "ｓｈｉｔ 18"]
+        self.assertEqual(self.f.analyze_many(texts), [self.f.analyze(t) for t in texts])
+
+
+#   Bundle Tests
+
+class TestBundle(unittest.TestCase):
+    def test_roundtrip(self):
+        """번들로 저장했다 읽은 필터가 원래 필터와 같은 결과를 내야 함"""
+        words = ["씨발", "병신", "병신같"]
+        text = "이런 병신같은 씨 발"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bundle.json")
+            compile_bundle(path, words, [r"1\s*8"])
+            f = ProfanityFilter.from_bundle(path)
+
+        expected = ProfanityFilter(badwords=words, number_patterns=[r"1\s*8"])
+        self.assertEqual(f.analyze(text).spans, expected.analyze(text).spans)
+        self.assertEqual(f.badwords, expected.badwords)
+
+    def test_corrupted_bundle_raises(self):
+        """단어 목록이 바뀐 번들은 체크섬 오류로 거부해야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bundle.json")
+            compile_bundle(path, ["씨발"])
+
+            with open(path, encoding="utf-8") as fp:
+                data = json.load(fp)
+            data["matcher"]["badwords"].append("바보")
+            with open(path, "w", encoding="utf-8") as fp:
+                json.dump(data, fp)
+
+            with self.assertRaises(ValueError):
+                load_bundle(path)
+
+
+#   Hot Reload Tests
+
+class TestHotReload(unittest.TestCase):
+    def test_add_and_remove_words(self):
+        """실행 중에 단어를 추가/삭제하면 바로 반영되어야 함"""
+        f = ProfanityFilter(badwords=["씨발"], number_patterns=[])
+        old = f.matcher
+
+        f.add_words(["바보", "바보같"])
+        self.assertEqual(f.clean("바보같은 씨발"), "***은 ***")
+
+        f.remove_words(["바보같"])
+        self.assertEqual(f.clean("바보같은"), "***같은")
+        self.assertEqual(f.badwords, ["씨발", "바보"])
+
+        # 교체 전 매처는 그대로 남아 있어야 함 (copy-on-write)
+        self.assertEqual(old.sub("*", "바보 씨발"), "바보 *")
+
+    def test_jamo_mode_updates(self):
+        f = ProfanityFilter(mode="jamo", badwords=["시발"], number_patterns=[])
+        f.add_words(["병신"])
+        self.assertTrue(f.has_profanity("ㅂㅅ"))
+        f.remove_words(["시발"])
+        self.assertFalse(f.has_profanity("ㅅㅂ"))
+
+    def test_bundle_matcher_can_be_updated(self):
+        """번들에서 읽은 매처(트라이 없음)도 단어를 추가할 수 있어야 함"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bundle.json")
+            compile_bundle(path, ["씨발"])
+            f = ProfanityFilter.from_bundle(path)
+
+        f.add_words(["씨팔"])
+        self.assertEqual(f.clean("씨발 씨팔"), "*** ***")
+
+    def test_reload_from_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "words.txt")
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write("# 주석\n바보\nre:1\\s*8\n")
+
+            f = ProfanityFilter()
+            f.reload(path)
+
+        self.assertEqual(f.badwords, ["바보"])
+        self.assertEqual(f.clean("씨발 바보 18"), "씨발 *** ***")
+
+
+#   Cache Tests
+
+class TestCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """가득 차면 가장 오래 안 쓴 항목부터 버려야 함"""
+        c = LRUCache(maxsize=2)
+        c.put("a", 1)
+        c.put("b", 2)
+        c.get("a")
+        c.put("c", 3)
+        self.assertIsNone(c.get("b"))
+        self.assertEqual(c.get("a"), 1)
+
+    def test_ttl_expiry(self):
+        c = LRUCache(maxsize=2, ttl=0.01)
+        c.put("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(c.get("a"))
+
+    def test_filter_counts_hits(self):
+        """같은 메시지를 반복하면 캐시 적중으로 잡혀야 함"""
+        f = ProfanityFilter(cache_size=16)
+        for _ in range(3):
+            self.assertEqual(f.clean("ㅋㅋ 씨발"), "ㅋㅋ ***")
+        info = f.cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (2, 1))
+
+    def test_normalized_key_shares_entries(self):
+        """normalized 키면 공백만 다른 메시지도 같은 항목을 써야 함"""
+        f = ProfanityFilter(cache_size=16, cache_key="normalized")
+        f.analyze("이런  씨발")
+        r = f.analyze("이런 씨발 ")
+        self.assertEqual(r.text, "이런 씨발 ")
+        self.assertEqual(f.cache_info()["hits"], 1)
+
+    def test_matcher_swap_invalidates(self):
+        """단어 목록(매처)이 바뀌면 예전 결과를 쓰면 안 됨"""
+        f = ProfanityFilter(cache_size=16)
+        self.assertEqual(f.clean("바보"), "바보")
+        f.matcher = PatternMatcher(["바보"])
+        self.assertEqual(f.clean("바보"), "***")
+
+
+#   Async Tests
+
+class TestAsync(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self):
+        """동시에 들어온 요청들이 순서에 맞는 결과를 받고 지연 통계가 남아야 함"""
+        texts = ["이런 씨발", "안녕", "ㅈㄴ 좋아"] * 20
+
+        async def run():
+            async with AsyncProfanityFilter(max_workers=2, max_batch=8) as af:
+                results = await asyncio.gather(*(af.clean(t) for t in texts))
+                return results, af.latency_percentiles()
+
+        results, stats = asyncio.run(run())
+        f = ProfanityFilter()
+        self.assertEqual(results, [f.clean(t) for t in texts])
+        self.assertEqual(set(stats), {"p50", "p95", "p99"})
+
+    def test_queue_full_without_blocking(self):
+        """대기열이 가득 찼을 때 block=False 면 QueueFull 이어야 함"""
+        async def run():
+            af = AsyncProfanityFilter(max_queue=1, batch_window=0.05)
+            first = asyncio.ensure_future(af.clean("a"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(af.clean("b"))
+            await asyncio.sleep(0)
+            with self.assertRaises(asyncio.QueueFull):
+                await af.clean("c", block=False)
+            self.assertEqual(len(af._waiting), 2)  # 못 들어간 요청은 등록되지 않아야 함
+            await asyncio.gather(first, second)
+            await af.close()
+
+        asyncio.run(run())
+
+    def test_error_only_fails_its_own_request(self):
+        """묶음 안의 한 메시지가 실패해도 나머지 요청은 결과를 받아야 함"""
+        async def run():
+            async with AsyncProfanityFilter(batch_window=0.01) as af:
+                return await asyncio.gather(af.clean("씨발"), af.clean(None), af.clean("안녕"),
+                                            return_exceptions=True)
+
+        ok, bad, other = asyncio.run(run())
+        self.assertEqual((ok, other), ("***", "안녕"))
+        self.assertIsInstance(bad, Exception)
+
+    def test_requests_after_close_are_rejected(self):
+        """close 뒤에 들어온 요청은 멈춰 있지 않고 바로 RuntimeError"""
+        async def run():
+            af = AsyncProfanityFilter()
+            await af.clean("a")
+            await af.close()
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(af.clean("b"), timeout=1)
+
+        asyncio.run(run())
+
+
+#   Streaming Tests
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.f = ProfanityFilter()
+
+    def test_text_lines(self):
+        """줄 수와 순서를 유지한 채 한 줄씩 정제되어야 함"""
+        src = io.StringIO("이런 씨발\n\n안녕\n")
+        out = io.StringIO()
+        count = filter_stream(src, out, self.f, chunk_size=2)
+        self.assertEqual(count, 3)
+        self.assertEqual(out.getvalue(), "이런 ***\n\n안녕\n")
+
+    def test_jsonl_only_touches_field(self):
+        """jsonl 은 지정한 키만 바꾸고 나머지 키는 그대로 둬야 함"""
+        src = io.StringIO('{"user": "병신", "text": "병신아"}\n{"user": "a"}\n')
+        out = io.StringIO()
+        filter_stream(src, out, self.f, fmt="jsonl")
+        self.assertEqual(
+            out.getvalue(),
+            '{"user": "병신", "text": "***아"}\n{"user": "a"}\n',
+        )
+
+    def test_keeps_original_text(self):
+        """기본은 원문 형태 유지, method="clean" 일 때만 정규화된 텍스트"""
+        out = io.StringIO()
+        filter_stream(io.StringIO("Hello  ＡＢＣ 씨발\n"), out, self.f)
+        self.assertEqual(out.getvalue(), "Hello  ＡＢＣ ***\n")
+
+        out = io.StringIO()
+        filter_stream(io.StringIO("Hello  ＡＢＣ 씨발\n"), out, self.f, method="clean")
+        self.assertEqual(out.getvalue(), "hello abc ***\n")
+
+    def test_malformed_jsonl_is_skipped(self):
+        """깨진 줄은 건너뛰고 개수만 세고, 나머지 줄은 계속 처리해야 함"""
+        src = io.StringIO('{"text": "씨발 ABC"}\nnot json\n{"text": "안녕"}\n')
+        out = io.StringIO()
+        stats = {}
+        count = filter_stream(src, out, self.f, fmt="jsonl", stats=stats)
+        self.assertEqual(count, 2)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(out.getvalue(), '{"text": "*** ABC"}\n{"text": "안녕"}\n')
+
+
+#   Benchmark Harness Tests
+
+class TestBench(unittest.TestCase):
+    def test_corpus_is_reproducible(self):
+        """같은 seed 면 같은 말뭉치, density=0 이면 욕설이 없어야 함"""
+        words = ["씨발", "병신"]
+        a = make_corpus(50, words, seed=1, density=0.5)
+        self.assertEqual(a, make_corpus(50, words, seed=1, density=0.5))
+        self.assertTrue(any(ProfanityFilter().has_profanity(m) for m in a))
+
+        clean = make_corpus(50, words, seed=1, density=0.0)
+        self.assertFalse(any(ProfanityFilter(badwords=words).has_profanity(m) for m in clean))
+
+    def test_compare_throughput(self):
+        """처리량이 허용치보다 떨어진 항목만 보고해야 함"""
+        def row(rate):
+            ops = {"msgs_per_sec": rate}
+            return {"size": 10, "mode": "regex", "clean": ops, "has_profanity": ops, "normalize": ops}
+
+        self.assertEqual(compare_throughput([row(100)], [row(90)], tolerance=0.2), [])
+        self.assertEqual(len(compare_throughput([row(100)], [row(50)], tolerance=0.2)), 3)
+
+        # 말뭉치 조건이 다르면 비교하지 않고 거부
+        longer = dict(row(50), length=200)
+        with self.assertRaises(ValueError):
+            compare_throughput([row(100)], [longer])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
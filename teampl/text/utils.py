@@ -1,21 +1,118 @@
 import re
 import unicodedata
+from array import array
 
-def _normalize(self, text: str) -> str:
-        
-        # 유니코드 정규화
+
+def _build_fold_table():
+    """
+    1:1 치환표 (글자 수가 바뀌지 않으므로 위치 대응이 그대로 유지됨)
+    - 전각 문자(！ ~ ～) -> 반각 (영문은 소문자로), 줄바꿈/전각 공백 등 모든 공백 문자 -> ' '
+    - 자주 쓰이는 닮은꼴 숫자/기호 (①, ¹, 각종 대시, 가운뎃점)
+    """
+    table = {}
+
+    for code in range(0xFF01, 0xFF5F):
+        table[code] = chr(code - 0xFEE0).lower()
+
+    for ch in map(chr, range(0x3001)):
+        if ch.isspace() and ch != " ":
+            table[ord(ch)] = " "
+    table[0x3000] = " "
+
+    for i, code in enumerate(range(0x2460, 0x2469), 1):  # ① ~ ⑨
+        table[code] = str(i)
+    table.update({0x00B9: "1", 0x00B2: "2", 0x00B3: "3"})  # ¹ ² ³
+
+    for code in (0x2010, 0x2011, 0x2012, 0x2013, 0x2014, 0x2015, 0x2212):  # ‐ ‑ ‒ – — ― −
+        table[code] = "-"
+    for code in (0x00B7, 0x318D, 0x2027, 0x30FB):  # · ㆍ ‧ ・
+        table[code] = "."
+
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+# 치환할 글자만 골라서 바꾸기 위한 정규식
+# (채팅 메시지에는 치환 대상이 거의 없어서 전체 translate 보다 훨씬 빠름)
+_FOLD_CHARS = re.compile("[" + "".join(re.escape(chr(code)) for code in _FOLD_TABLE) + "]")
+_FOLD_MAP = {chr(code): repl for code, repl in _FOLD_TABLE.items()}
+
+
+def _fold_char(m):
+    return _FOLD_MAP[m.group()]
+
+# 공백은 이미 ' ' 하나로 통일되어 있으므로
+# - 공백 2개 이상 -> 공백 1개
+# - 같은 글자 3번 이상 반복 -> 2번 (ㅋㅋㅋㅋ -> ㅋㅋ)
+# 을 정규식 한 번으로 처리 (안 맞은 그룹은 빈 문자열로 치환됨)
+_COLLAPSE = re.compile(r"( ){2,}|(.)\2{2,}")
+_COLLAPSE_REPL = r"\1\2\2"
+
+
+def _nfc(text: str) -> str:
+    # 유니코드 정규화 (이미 NFC 면 건너뜀)
+    if not unicodedata.is_normalized("NFC", text):
         text = unicodedata.normalize("NFC", text)
+    return text
+
+
+def _fold(text: str) -> str:
+    # 소문자화 (글자 수가 바뀌는 드문 경우는 해당 글자만 그대로 둠)
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    return _FOLD_CHARS.sub(_fold_char, lowered)
+
+
+def normalize_text(text: str) -> str:
+    """
+    - 유니코드 정규화
+    - 전각/반각 통일, 닮은꼴 숫자/기호 정리
+    - 영어 소문자화
+    - 불필요한 반복 문자 줄이기 (ㅋㅋㅋㅋ -> ㅋㅋ 정도) + 공백 정리를 한 번에
+    """
+    return _COLLAPSE.sub(_COLLAPSE_REPL, _fold(_nfc(text))).strip(" ")
+
+
+def normalize_with_offsets(text: str):
+    """
+    normalize_text 와 같은 결과에 더해, 정규화된 글자마다 원문 위치를 알려줌
+    반환: (normalized, offsets, source)
+    - offsets[i] : normalized[i] 가 source 의 몇 번째 글자에서 왔는지 (array('I'))
+    - source : 위치 기준이 되는 원문 (입력이 NFC 가 아니었으면 NFC 로 바꾼 원문)
+    """
+    text = _nfc(text)
+    folded = _fold(text)
+    n = len(folded)
+
+    # 양쪽 공백 제거 범위
+    start = 0
+    while start < n and folded[start] == " ":
+        start += 1
+    end = n
+    while end > start and folded[end - 1] == " ":
+        end -= 1
 
-        # 영어 소문자
-        text = text.lower()
+    pieces = []
+    offsets = array("I")
+    last = start
 
-        # 반복 문자 줄이기 (3번 이상 반복 -> 2번으로)
-        text = re.sub(r"(.)\1{2,}", r"\1\1", text)
+    for m in _COLLAPSE.finditer(folded, start, end):
+        s, e = m.span()
+        pieces.append(folded[last:s])
+        offsets.extend(range(last, s))
 
-        # 흔한 웃음/방언/이모티콘은 관심 없으면 미리 정리 가능 (선택)
-        # text = re.sub(r"[ㅋㅎ]+", "ㅋ", text)
+        if m.group(1) is not None:
+            pieces.append(" ")
+            offsets.append(s)
+        else:
+            pieces.append(folded[s:s + 2])
+            offsets.extend((s, s + 1))
+        last = e
 
-        # 양쪽 공백 정리
-        text = re.sub(r"\s+", " ", text).strip()
+    pieces.append(folded[last:end])
+    offsets.extend(range(last, end))
 
-        return text
\ No newline at end of file
+    return "".join(pieces), offsets, text
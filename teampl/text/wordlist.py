@@ -0,0 +1,72 @@
+import os
+import threading
+
+# 정규식으로 바로 쓰는 패턴 줄은 이 접두사로 구분
+REGEX_PREFIX = "re:"
+
+
+def load_wordlist(path):
+    """
+    외부 단어 목록 파일을 읽어서 (badwords, number_patterns) 로 돌려줌
+
+    파일 형식 (UTF-8, 한 줄에 하나)
+    - 빈 줄, '#' 으로 시작하는 줄은 무시
+    - 're:' 로 시작하는 줄은 정규식 패턴 (예: re:1\\s*8)
+    - 나머지는 노이즈 허용 매칭에 쓰는 일반 단어
+    """
+    badwords = []
+    patterns = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith(REGEX_PREFIX):
+                patterns.append(line[len(REGEX_PREFIX):])
+            else:
+                badwords.append(line)
+
+    return badwords, patterns
+
+
+class WordListWatcher(threading.Thread):
+    """
+    단어 목록 파일을 interval 초마다 확인해서
+    수정 시각/크기가 바뀌면 on_change(badwords, number_patterns) 를 호출하는 스레드
+    (외부 라이브러리 없이 os.stat 폴링으로 동작)
+    """
+
+    def __init__(self, path, on_change, interval=1.0):
+        super().__init__(daemon=True)
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = self._signature()
+
+        while not self._stop_event.wait(self.interval):
+            sig = self._signature()
+            if sig == last or sig is None:
+                continue
+            last = sig
+
+            try:
+                self.on_change(*load_wordlist(self.path))
+            except Exception as e:
+                # 잘못 저장된 파일 때문에 감시가 죽지 않도록 기존 목록을 유지
+                print(f"[WordListWatcher] reload failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size